@@ -0,0 +1,168 @@
+"""Content-addressed cache of rendered chart PNGs."""
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+MAX_CACHE_BYTES = 100 * 1024 * 1024
+MAX_CACHE_AGE = 30 * 24 * 3600  # Seconds since an entry was last used
+EVICT_TO = 0.8  # Fraction of MAX_CACHE_BYTES kept after a size eviction
+
+
+class ChartCache:
+    """Rendered charts stored as ``<sha256>.png``, keyed by their inputs.
+    
+    The key hashes the chart name with every input that affects the image,
+    so an entry never needs invalidating: changed data gets a new key and
+    the old entry ages out. Entries are evicted least recently used first
+    once the directory exceeds max_bytes, and when unused for max_age:
+    on lookup, and for the whole directory on the first store of a process.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int = MAX_CACHE_BYTES, max_age: float = MAX_CACHE_AGE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.render_seconds = 0.0
+        self._bytes: Optional[int] = None  # Scanned by the eviction on first store
+        os.makedirs(directory, exist_ok=True)
+    
+    @staticmethod
+    def key(chart: str, **inputs) -> str:
+        """Hash a chart name and its inputs into a cache key."""
+        payload = json.dumps({"chart": chart, **inputs}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get the path of a cached chart, or None on a miss."""
+        path = self.path(key)
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        if age > self.max_age:
+            self._remove(path)
+            self.misses += 1
+            return None
+        
+        os.utime(path)  # Mark as recently used for eviction
+        self.hits += 1
+        return path
+    
+    def put(self, key: str, rendered_path: str, seconds: float = 0.0) -> str:
+        """Move a freshly rendered PNG into the cache and return its cached path."""
+        path = self.path(key)
+        try:
+            replaced = os.path.getsize(path)  # An expired entry rendered again
+        except OSError:
+            replaced = 0
+        os.replace(rendered_path, path)
+        self.render_seconds += seconds
+        
+        if self._bytes is None:
+            self.evict()  # Sweeps expired entries and counts the rest
+        else:
+            self._bytes += os.path.getsize(path) - replaced
+            if self._bytes > self.max_bytes:
+                self.evict()
+        return path
+    
+    def _remove(self, path: str):
+        """Delete an entry, keeping the tracked size in step."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return  # Evicted by another process
+        if self._bytes is not None:
+            self._bytes -= size
+        self.evictions += 1
+    
+    def temp_path(self, key: str) -> str:
+        """Path to render into before put; unique per process."""
+        return os.path.join(self.directory, f"{key}.{os.getpid()}.tmp.png")
+    
+    def _entries(self) -> list[tuple[str, float, int]]:
+        """List (path, last used, bytes) of every entry."""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(".png") and not entry.name.endswith(".tmp.png"):
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+    
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones beyond the size limit.
+        
+        Returns the number of entries removed.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        cutoff = time.time() - self.max_age
+        total = sum(size for _, _, size in entries)
+        # Shrink well below the limit so the next stores don't evict again
+        target = self.max_bytes * EVICT_TO if total > self.max_bytes else self.max_bytes
+        removed = 0
+        for path, used, size in entries:
+            if used >= cutoff and total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Evicted by another process
+            total -= size
+            removed += 1
+        
+        self._bytes = total
+        self.evictions += removed
+        return removed
+    
+    def info(self) -> dict:
+        """Get hit/miss counters and the size of the cache directory."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        average_render = self.render_seconds / self.misses if self.misses else 0.0
+        oldest = min((used for _, used, _ in entries), default=None)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, _, size in entries),
+            "oldest_seconds": time.time() - oldest if oldest else 0.0,
+            "saved_seconds": self.hits * average_render
+        }
+
+
+def main():
+    """Command line entry point for the chart cache."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Report on or evict the chart render cache.")
+    parser.add_argument("--dir", default=os.path.join("charts", ".cache"), help="Cache directory")
+    parser.add_argument("--evict", action="store_true", help="Apply the size and age limits now")
+    parser.add_argument("--max-mb", type=float, default=MAX_CACHE_BYTES / 1024 / 1024)
+    parser.add_argument("--max-days", type=float, default=MAX_CACHE_AGE / 86400)
+    args = parser.parse_args()
+    
+    cache = ChartCache(args.dir, int(args.max_mb * 1024 * 1024), args.max_days * 86400)
+    if args.evict:
+        print(f"✅ Evicted {cache.evict()} chart(s)")
+    info = cache.info()
+    print(
+        f"Chart cache {args.dir}: {info['entries']} chart(s), {info['bytes'] / 1024 / 1024:.1f} MiB, "
+        f"oldest used {info['oldest_seconds'] / 86400:.1f} days ago"
+    )
+
+
+if __name__ == "__main__":
+    main()
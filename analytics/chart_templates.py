@@ -0,0 +1,213 @@
+"""Reusable figures for rendering the same chart for many users.
+
+A template builds its figure, axes, ticks, grid and layout once and renders
+that static part into a background image. Drawing a chart then restores
+the background, draws only the data artists (marked animated, so the
+background leaves them out) and writes the canvas buffer to a PNG, with
+no layout pass and no second render for ``bbox_inches='tight'``.
+
+Templates draw into a fixed-size figure laid out once, so their PNGs keep
+the same margins for every user instead of being cropped to fit. Their
+figures sit on their own Agg canvas rather than in pyplot, so a long-lived
+renderer with many templates neither trips pyplot's open-figure warning
+nor keeps figures alive after close().
+"""
+import matplotlib.image as mimage
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from typing import Dict, List
+
+DPI = 150
+BAR_COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8']
+PLACEHOLDER_NAME = "Palace name abc..."  # Longest label after truncation, for the layout
+PLACEHOLDER_USER = "Phantom Thief"  # Titles are only laid out once
+
+
+class ChartTemplate:
+    """A figure whose static artists are rendered once into a background."""
+    
+    def __init__(self, figsize: tuple):
+        self.fig = Figure(figsize=figsize, dpi=DPI, facecolor='black')
+        FigureCanvasAgg(self.fig)
+        self.dynamic = []
+        self.background = None
+    
+    def animate(self, *artists):
+        """Exclude artists from the background; they are drawn per chart."""
+        for artist in artists:
+            artist.set_animated(True)
+            self.dynamic.append(artist)
+        return artists[0] if len(artists) == 1 else artists
+    
+    def finish(self):
+        """Lay out and render the static part of the figure."""
+        self.fig.tight_layout()
+        self.fig.canvas.draw()
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+    
+    def save(self, save_path: str):
+        """Draw the data artists over the background and write the PNG."""
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        for artist in self.dynamic:
+            self.fig.draw_artist(artist)
+        mimage.imsave(save_path, np.asarray(canvas.buffer_rgba()))
+    
+    def close(self):
+        self.fig.clear()
+        self.dynamic = []
+        self.background = None
+
+
+class RadarTemplate(ChartTemplate):
+    """Stats radar: the polygon, its fill and the title change per user."""
+    
+    def __init__(self, stat_names: List[str]):
+        super().__init__((10, 10))
+        self.stat_names = stat_names
+        count = len(stat_names)
+        self.angles = [n / float(count) * 2 * np.pi for n in range(count)]
+        self.angles += self.angles[:1]
+        
+        ax = self.fig.add_subplot(projection='polar')
+        zeros = [0] * len(self.angles)
+        self.line = self.animate(*ax.plot(self.angles, zeros, 'o-', linewidth=2, color='#FF6B6B', label='Stats'))
+        self.fill = self.animate(*ax.fill(self.angles, zeros, alpha=0.25, color='#FF6B6B'))
+        ax.set_xticks(self.angles[:-1])
+        ax.set_xticklabels(stat_names, fontsize=12)
+        ax.set_ylim(0, 100)
+        ax.set_yticks([20, 40, 60, 80, 100])
+        ax.set_yticklabels(['20', '40', '60', '80', '100'], fontsize=10)
+        ax.grid(True)
+        self.title = self.animate(ax.set_title(f'{PLACEHOLDER_USER}\'s Stats Profile', size=16, fontweight='bold', pad=20, color='white'))
+        self.finish()
+    
+    def draw(self, save_path: str, stats: Dict[str, int], username: str):
+        values = [stats[name] for name in self.stat_names]
+        values += values[:1]
+        self.line.set_data(self.angles, values)
+        self.fill.set_xy(np.column_stack([self.angles, values]))
+        self.title.set_text(f'{username}\'s Stats Profile')
+        self.save(save_path)
+
+
+class BarTemplate(ChartTemplate):
+    """Stats bars: bar heights, value labels and the title change per user."""
+    
+    def __init__(self, stat_names: List[str]):
+        super().__init__((12, 6))
+        self.stat_names = stat_names
+        ax = self.fig.add_subplot()
+        self.bars = ax.bar(stat_names, [0] * len(stat_names), color=BAR_COLORS, edgecolor='white', linewidth=2)
+        self.animate(*self.bars)
+        self.labels = [
+            self.animate(ax.text(bar.get_x() + bar.get_width() / 2., 0, '', ha='center', va='bottom',
+                                 fontsize=12, fontweight='bold', color='white'))
+            for bar in self.bars
+        ]
+        
+        ax.set_ylim(0, 100)
+        ax.set_ylabel('Value', fontsize=12, color='white')
+        self.title = self.animate(ax.set_title(f'{PLACEHOLDER_USER}\'s Statistics', fontsize=16, fontweight='bold', color='white', pad=20))
+        ax.set_facecolor('black')
+        ax.tick_params(colors='white')
+        ax.grid(True, alpha=0.3, axis='y')
+        for label in ax.get_xticklabels():
+            label.set(rotation=45, ha='right')
+        self.finish()
+    
+    def draw(self, save_path: str, stats: Dict[str, int], username: str):
+        for bar, label, name in zip(self.bars, self.labels, self.stat_names):
+            bar.set_height(stats[name])
+            label.set_y(stats[name])
+            label.set_text(f'{stats[name]}')
+        self.title.set_text(f'{username}\'s Statistics')
+        self.save(save_path)
+
+
+class PalaceTemplate(ChartTemplate):
+    """Palace bars for a fixed number of palaces.
+    
+    Widths, colors, percentage labels, palace names and the title change
+    per user; names are drawn as text next to the y axis so they stay out
+    of the background.
+    """
+    
+    def __init__(self, count: int):
+        super().__init__((12, 6))
+        ax = self.fig.add_subplot()
+        positions = list(range(count))
+        self.bars = ax.barh(positions, [0] * count, edgecolor='white', linewidth=2)
+        self.animate(*self.bars)
+        self.labels = [
+            self.animate(ax.text(0, position, '', va='center', fontsize=11, fontweight='bold', color='white'))
+            for position in positions
+        ]
+        
+        ax.set_xlim(0, 100)
+        ax.set_xlabel('Infiltration %', fontsize=12, color='white')
+        self.title = self.animate(ax.set_title(f'{PLACEHOLDER_USER}\'s Palace Progress', fontsize=16, fontweight='bold', color='white', pad=20))
+        ax.set_facecolor('black')
+        ax.tick_params(colors='white')
+        ax.grid(True, alpha=0.3, axis='x')
+        
+        # Lay out around the widest possible name, then draw names per user
+        ax.set_yticks(positions)
+        ax.set_yticklabels([PLACEHOLDER_NAME] * count)
+        self.fig.tight_layout()
+        tick_labels = ax.get_yticklabels()
+        ax.set_yticklabels([''] * count)
+        self.names = [
+            self.animate(ax.text(*tick.get_position(), '', transform=tick.get_transform(),
+                                 ha='right', va='center', color='white', fontsize=tick.get_fontsize()))
+            for tick in tick_labels
+        ]
+        self.fig.canvas.draw()
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+    
+    def draw(self, save_path: str, palaces: List[Dict], username: str):
+        for bar, label, name, palace in zip(self.bars, self.labels, self.names, palaces):
+            percentage = palace['infiltration']
+            bar.set_width(percentage)
+            bar.set_color('#FF6B6B' if percentage < 50 else '#4ECDC4' if percentage < 100 else '#45B7D1')
+            bar.set_edgecolor('white')
+            label.set_x(percentage)
+            label.set_text(f'{percentage:.1f}%')
+            label.set_horizontalalignment('left' if percentage < 50 else 'right')
+            name.set_text(palace['name'][:15] + "..." if len(palace['name']) > 15 else palace['name'])
+        self.title.set_text(f'{username}\'s Palace Progress')
+        self.save(save_path)
+
+
+class ChartTemplates:
+    """Lazily built templates, one per chart (and per palace count)."""
+    
+    def __init__(self, stat_names: List[str]):
+        self.stat_names = stat_names
+        self._radar = None
+        self._bar = None
+        self._palaces: Dict[int, PalaceTemplate] = {}
+    
+    def stats_radar(self, save_path: str, stats: Dict[str, int], username: str):
+        if self._radar is None:
+            self._radar = RadarTemplate(self.stat_names)
+        self._radar.draw(save_path, stats, username)
+    
+    def stats_bar(self, save_path: str, stats: Dict[str, int], username: str):
+        if self._bar is None:
+            self._bar = BarTemplate(self.stat_names)
+        self._bar.draw(save_path, stats, username)
+    
+    def palace_progress(self, save_path: str, palaces: List[Dict], username: str):
+        template = self._palaces.get(len(palaces))
+        if template is None:
+            template = self._palaces[len(palaces)] = PalaceTemplate(len(palaces))
+        template.draw(save_path, palaces, username)
+    
+    def close(self):
+        """Close every template figure."""
+        for template in [self._radar, self._bar, *self._palaces.values()]:
+            if template is not None:
+                template.close()
+        self._radar, self._bar, self._palaces = None, None, {}
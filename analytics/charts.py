@@ -1,25 +1,108 @@
 """Chart generation with matplotlib."""
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, date
-from typing import List, Dict, Optional
+from typing import Any, Iterable, Iterator, List, Dict, NamedTuple, Optional
 import os
+import shutil
+import time
+from analytics.chart_cache import ChartCache
+from analytics.exp_history import EXP_MAX_POINTS, daily_exp_by_user, downsample_history, to_history
+
+STAT_NAMES = ["Knowledge", "Guts", "Proficiency", "Kindness", "Charm"]
+RENDER_VERSION = 2  # Bump when chart styling changes, so cached renders are redrawn
+
+# ChartJob.kind -> ChartGenerator method
+CHART_KINDS = {
+    "radar": "plot_stats_radar",
+    "bar": "plot_stats_bar",
+    "palaces": "plot_palace_progress",
+    "exp": "plot_exp_progress",
+}
+
+# Process-local generator of pool workers
+_worker_generator = None
+
+
+class ChartJob(NamedTuple):
+    """One chart to render: kind is a CHART_KINDS key, data the plot method's first argument."""
+    kind: str
+    username: str
+    data: Any
+    save_path: Optional[str] = None
 
 
 class ChartGenerator:
     """Generate charts for analytics."""
     
-    def __init__(self, output_dir: str = "charts"):
+    def __init__(self, output_dir: str = "charts", cache: bool = True, templates: bool = False):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
+        self.cache = ChartCache(os.path.join(output_dir, ".cache")) if cache else None
         plt.style.use('dark_background')
+        # Prebuilt radar, bar and palace figures, for rendering many users
+        self.templates = None
+        if templates:
+            from analytics.chart_templates import ChartTemplates
+            self.templates = ChartTemplates(STAT_NAMES)
+    
+    def _render(self, chart: str, draw, save_path: str, **inputs) -> str:
+        """Draw a chart into save_path, reusing a cached render of the same inputs."""
+        if self.cache is None:
+            draw(save_path, **inputs)
+            return save_path
+        
+        key = ChartCache.key(
+            chart,
+            version=RENDER_VERSION,
+            matplotlib=matplotlib.__version__,
+            template=self.templates is not None,
+            **inputs
+        )
+        cached = self.cache.get(key)
+        if cached is None:
+            temp_path = self.cache.temp_path(key)
+            start = time.perf_counter()
+            draw(temp_path, **inputs)
+            cached = self.cache.put(key, temp_path, time.perf_counter() - start)
+        shutil.copyfile(cached, save_path)
+        return save_path
+    
+    def render_batch(self, jobs: Iterable[ChartJob], workers: Optional[int] = None) -> Iterator[tuple[ChartJob, Optional[str]]]:
+        """Render chart jobs in a process pool, yielding (job, path) as each one finishes.
+        
+        Workers use the Agg backend and their own generator with this one's
+        output directory, cache and template settings. Paths are None for charts
+        without data, as with the plot methods.
+        """
+        jobs = list(jobs)
+        for job in jobs:
+            if job.kind not in CHART_KINDS:
+                raise ValueError(f"Unknown chart kind '{job.kind}'. Choose from: {', '.join(CHART_KINDS)}")
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.output_dir, self.cache is not None, self.templates is not None)
+        ) as pool:
+            futures = {pool.submit(_render_worker, job): job for job in jobs}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
     
     def plot_stats_radar(self, stats: Dict[str, int], username: str, save_path: Optional[str] = None):
         """Create a radar chart for stats."""
+        save_path = save_path or os.path.join(self.output_dir, f"{username}_stats_radar.png")
+        values = {name: stats.get(name, 0) for name in STAT_NAMES}
+        draw = self.templates.stats_radar if self.templates else self._draw_stats_radar
+        return self._render("stats_radar", draw, save_path, stats=values, username=username)
+    
+    def _draw_stats_radar(self, save_path: str, stats: Dict[str, int], username: str):
         import numpy as np
         
-        stat_names = ["Knowledge", "Guts", "Proficiency", "Kindness", "Charm"]
-        values = [stats.get(name, 0) for name in stat_names]
+        stat_names = STAT_NAMES
+        values = [stats[name] for name in stat_names]
         
         # Number of variables
         N = len(stat_names)
@@ -45,19 +128,19 @@ class ChartGenerator:
         
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
-        else:
-            save_path = os.path.join(self.output_dir, f"{username}_stats_radar.png")
-            plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
-        
+        plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
         plt.close()
-        return save_path
     
     def plot_stats_bar(self, stats: Dict[str, int], username: str, save_path: Optional[str] = None):
         """Create a bar chart for stats."""
-        stat_names = ["Knowledge", "Guts", "Proficiency", "Kindness", "Charm"]
-        values = [stats.get(name, 0) for name in stat_names]
+        save_path = save_path or os.path.join(self.output_dir, f"{username}_stats_bar.png")
+        values = {name: stats.get(name, 0) for name in STAT_NAMES}
+        draw = self.templates.stats_bar if self.templates else self._draw_stats_bar
+        return self._render("stats_bar", draw, save_path, stats=values, username=username)
+    
+    def _draw_stats_bar(self, save_path: str, stats: Dict[str, int], username: str):
+        stat_names = STAT_NAMES
+        values = [stats[name] for name in stat_names]
         colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8']
         
         fig, ax = plt.subplots(figsize=(12, 6))
@@ -80,25 +163,28 @@ class ChartGenerator:
         plt.xticks(rotation=45, ha='right')
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
-        else:
-            save_path = os.path.join(self.output_dir, f"{username}_stats_bar.png")
-            plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
-        
+        plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
         plt.close()
-        return save_path
     
     def plot_exp_progress(self, exp_history: List[Dict], username: str, save_path: Optional[str] = None):
         """Plot EXP progress over time."""
         if not exp_history:
             return None
         
+        save_path = save_path or os.path.join(self.output_dir, f"{username}_exp_progress.png")
+        history = [{"date": item['date'], "exp": item['exp']} for item in exp_history]
+        if len(history) > EXP_MAX_POINTS:
+            history = downsample_history(history)
+        return self._render("exp_progress", self._draw_exp_progress, save_path, exp_history=history, username=username)
+    
+    def _draw_exp_progress(self, save_path: str, exp_history: List[Dict], username: str):
         dates = [datetime.fromisoformat(item['date']) for item in exp_history]
         exp_values = [item['exp'] for item in exp_history]
         
         fig, ax = plt.subplots(figsize=(12, 6))
-        ax.plot(dates, exp_values, marker='o', linewidth=2, color='#FF6B6B', markersize=8)
+        # Markers only help while points are far apart
+        marker = 'o' if len(dates) <= 60 else None
+        ax.plot(dates, exp_values, marker=marker, linewidth=2, color='#FF6B6B', markersize=8)
         ax.fill_between(dates, exp_values, alpha=0.3, color='#FF6B6B')
         
         ax.set_xlabel('Date', fontsize=12, color='white')
@@ -108,27 +194,27 @@ class ChartGenerator:
         ax.tick_params(colors='white')
         ax.grid(True, alpha=0.3)
         
-        # Format x-axis dates
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-        ax.xaxis.set_major_locator(mdates.DayLocator(interval=1))
-        plt.xticks(rotation=45, ha='right')
+        # Format x-axis dates: tick spacing adapts from days to years
+        locator = mdates.AutoDateLocator(minticks=4, maxticks=10)
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
         
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
-        else:
-            save_path = os.path.join(self.output_dir, f"{username}_exp_progress.png")
-            plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
-        
+        plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
         plt.close()
-        return save_path
     
     def plot_palace_progress(self, palaces: List[Dict], username: str, save_path: Optional[str] = None):
         """Plot palace infiltration progress."""
         if not palaces:
             return None
         
+        save_path = save_path or os.path.join(self.output_dir, f"{username}_palaces.png")
+        palaces = [{"name": p['name'], "infiltration": p['infiltration']} for p in palaces]
+        draw = self.templates.palace_progress if self.templates else self._draw_palace_progress
+        return self._render("palaces", draw, save_path, palaces=palaces, username=username)
+    
+    def _draw_palace_progress(self, save_path: str, palaces: List[Dict], username: str):
         names = [p['name'][:15] + "..." if len(p['name']) > 15 else p['name'] for p in palaces]
         percentages = [p['infiltration'] for p in palaces]
         
@@ -153,12 +239,165 @@ class ChartGenerator:
         
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
-        else:
-            save_path = os.path.join(self.output_dir, f"{username}_palaces.png")
-            plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
+        plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
+        plt.close()
+    
+    def plot_stat_distributions(self, distributions: Dict[str, List[int]], save_path: Optional[str] = None):
+        """Plot how many users fall in each value range of every stat."""
+        save_path = save_path or os.path.join(self.output_dir, "population_stats.png")
+        return self._render("stat_distributions", self._draw_stat_distributions, save_path, distributions=distributions)
+    
+    def _draw_stat_distributions(self, save_path: str, distributions: Dict[str, List[int]]):
+        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8']
+        bins = len(next(iter(distributions.values())))
+        width = 0.8 / len(distributions)
+        positions = list(range(bins))
+        
+        fig, ax = plt.subplots(figsize=(12, 6))
+        for offset, (name, counts) in enumerate(distributions.items()):
+            ax.bar([position + offset * width for position in positions], counts, width, label=name.capitalize(), color=colors[offset % len(colors)])
         
+        # First value of each bin, as binned by PopulationStats over 0..100
+        starts = [-(-i * 101 // bins) for i in range(bins + 1)]
+        ax.set_xticks([position + width * (len(distributions) - 1) / 2 for position in positions])
+        ax.set_xticklabels([f'{starts[i]}-{starts[i + 1] - 1}' for i in range(bins)])
+        ax.set_xlabel('Stat value', fontsize=12, color='white')
+        ax.set_ylabel('Users', fontsize=12, color='white')
+        ax.set_title('Stat Distribution Across Phantom Thieves', fontsize=16, fontweight='bold', color='white', pad=20)
+        ax.set_facecolor('black')
+        ax.tick_params(colors='white')
+        ax.grid(True, alpha=0.3, axis='y')
+        ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.12), ncol=len(distributions))
+        
+        plt.tight_layout()
+        
+        plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
         plt.close()
-        return save_path
+    
+    def plot_level_histogram(self, histogram: Dict[int, int], save_path: Optional[str] = None):
+        """Plot how many users reached each level."""
+        if not histogram:
+            return None
+        
+        save_path = save_path or os.path.join(self.output_dir, "population_levels.png")
+        return self._render("level_histogram", self._draw_level_histogram, save_path, histogram=histogram)
+    
+    def _draw_level_histogram(self, save_path: str, histogram: Dict[int, int]):
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.bar(list(histogram.keys()), list(histogram.values()), width=1.0, color='#45B7D1', edgecolor='black')
+        
+        ax.set_xlabel('Level', fontsize=12, color='white')
+        ax.set_ylabel('Users', fontsize=12, color='white')
+        ax.set_title('Level Distribution', fontsize=16, fontweight='bold', color='white', pad=20)
+        ax.set_facecolor('black')
+        ax.tick_params(colors='white')
+        ax.grid(True, alpha=0.3, axis='y')
+        
+        plt.tight_layout()
+        
+        plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
+        plt.close()
+    
+    def plot_category_mix(self, shares: Dict[str, Dict[str, float]], save_path: Optional[str] = None):
+        """Plot the category mix of completed tasks for each difficulty."""
+        save_path = save_path or os.path.join(self.output_dir, "population_category_mix.png")
+        return self._render("category_mix", self._draw_category_mix, save_path, shares=shares)
+    
+    def _draw_category_mix(self, save_path: str, shares: Dict[str, Dict[str, float]]):
+        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8']
+        difficulties = list(shares.keys())
+        categories = list(next(iter(shares.values())).keys())
+        
+        fig, ax = plt.subplots(figsize=(12, 6))
+        left = [0.0] * len(difficulties)
+        for color, category in zip(colors, categories):
+            widths = [shares[difficulty][category] * 100 for difficulty in difficulties]
+            ax.barh(difficulties, widths, left=left, color=color, edgecolor='black', label=category)
+            left = [start + width for start, width in zip(left, widths)]
+        
+        ax.set_xlim(0, 100)
+        ax.set_xlabel('Completed tasks %', fontsize=12, color='white')
+        ax.set_title('Category Mix per Difficulty', fontsize=16, fontweight='bold', color='white', pad=20)
+        ax.set_facecolor('black')
+        ax.tick_params(colors='white')
+        ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.12), ncol=len(categories))
+        
+        plt.tight_layout()
+        
+        plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
+        plt.close()
+
+
+def _init_worker(output_dir: str, cache: bool, templates: bool):
+    """Load the Agg backend and warm up fonts once per pool worker."""
+    global _worker_generator
+    matplotlib.use("Agg")
+    _worker_generator = ChartGenerator(output_dir, cache, templates)
+    fig = plt.figure()
+    fig.text(0.5, 0.5, "Phantom Thieves", fontweight='bold')
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def _render_worker(job: ChartJob) -> Optional[str]:
+    plot = getattr(_worker_generator, CHART_KINDS[job.kind])
+    return plot(job.data, job.username, job.save_path)
+
+
+def load_chart_jobs(db) -> list[ChartJob]:
+    """Build the radar, bar, palace and EXP chart jobs of every user with three queries."""
+    from collections import defaultdict
+    from models.user import User
+    from models.stats import Stats
+    from models.palace import Palace, PalaceStatus
+    
+    palaces = defaultdict(list)
+    for user_id, name, infiltration in db.query(Palace.user_id, Palace.name, Palace.infiltration_percentage).filter(
+        Palace.status == PalaceStatus.ACTIVE
+    ).order_by(Palace.user_id, Palace.id):
+        palaces[user_id].append({"name": name, "infiltration": infiltration})
+    
+    exp_series = daily_exp_by_user(db)
+    
+    jobs = []
+    stat_columns = [getattr(Stats, name) for name in Stats.STAT_NAMES]
+    for user_id, username, *values in db.query(User.id, User.username, *stat_columns).outerjoin(
+        Stats, Stats.user_id == User.id
+    ).order_by(User.id):
+        stats = {name.capitalize(): value or 0 for name, value in zip(Stats.STAT_NAMES, values)}
+        jobs.append(ChartJob("radar", username, stats))
+        jobs.append(ChartJob("bar", username, stats))
+        if palaces[user_id]:
+            jobs.append(ChartJob("palaces", username, palaces[user_id]))
+        if user_id in exp_series:
+            jobs.append(ChartJob("exp", username, to_history(*exp_series[user_id])))
+    return jobs
+
+
+def main():
+    """Command line entry point for rendering every user's charts."""
+    import argparse
+    from db.database import SessionLocal, init_db
+    
+    parser = argparse.ArgumentParser(description="Render analytics charts for every user.")
+    parser.add_argument("--output-dir", default="charts")
+    parser.add_argument("--workers", type=int, help="Pool size (defaults to the CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-render")
+    parser.add_argument("--no-templates", action="store_true", help="Build every figure from scratch")
+    args = parser.parse_args()
+    
+    init_db()
+    db = SessionLocal()
+    try:
+        jobs = load_chart_jobs(db)
+    finally:
+        db.close()
+    
+    start = time.perf_counter()
+    chart_gen = ChartGenerator(args.output_dir, cache=not args.no_cache, templates=not args.no_templates)
+    rendered = sum(1 for _, path in chart_gen.render_batch(jobs, args.workers) if path)
+    print(f"✅ Rendered {rendered} chart(s) into {args.output_dir} in {time.perf_counter() - start:.2f}s")
+
 
+if __name__ == "__main__":
+    main()
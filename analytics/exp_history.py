@@ -0,0 +1,98 @@
+"""Cumulative EXP time series built from completed tasks."""
+from collections import defaultdict
+from typing import Optional
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from models.task import Task, TaskStatus
+
+EXP_MAX_POINTS = 300  # Points plotted at most; more would not show on a 12" chart
+
+
+def _daily_exp_query(user_id: Optional[int] = None):
+    day = func.date(Task.completed_at).label("day")
+    stmt = select(Task.user_id, day, func.coalesce(func.sum(Task.exp_reward), 0)).where(
+        Task.status == TaskStatus.COMPLETED.value,
+        Task.completed_at.is_not(None)
+    )
+    if user_id is not None:
+        stmt = stmt.where(Task.user_id == user_id)
+    return stmt.group_by(Task.user_id, day).order_by(Task.user_id, day)
+
+
+def _cumulate(days: list[str], exp: list[int]) -> tuple[np.ndarray, np.ndarray]:
+    return np.array(days, dtype="datetime64[D]"), np.cumsum(np.array(exp, dtype=np.int64))
+
+
+def daily_exp(db: Session, user_id: int) -> tuple[np.ndarray, np.ndarray]:
+    """Get a user's days with completed tasks and the total EXP at the end of each.
+    
+    Tasks are summed per day by SQL, so the result has one row per active
+    day however many tasks were completed.
+    """
+    rows = db.execute(_daily_exp_query(user_id)).all()
+    return _cumulate([row[1] for row in rows], [row[2] for row in rows])
+
+
+def daily_exp_by_user(db: Session) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+    """daily_exp for every user with completed tasks, in one query."""
+    grouped = defaultdict(lambda: ([], []))
+    for user_id, day, exp in db.execute(_daily_exp_query()):
+        days, values = grouped[user_id]
+        days.append(day)
+        values.append(exp)
+    return {user_id: _cumulate(days, values) for user_id, (days, values) in grouped.items()}
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+    
+    Keeps the first and last points plus, from each of threshold - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket. Peaks and
+    steps survive, unlike with plain striding.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # Mean of each bucket, and of the last point as the bucket after the last
+    sums_x = np.add.reduceat(x[:n - 1], edges[:-1])
+    sums_y = np.add.reduceat(y[:n - 1], edges[:-1])
+    sizes = np.diff(edges)
+    next_x = np.append((sums_x / sizes)[1:], x[-1])
+    next_y = np.append((sums_y / sizes)[1:], y[-1])
+    
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        area = np.abs(
+            (x[a] - next_x[bucket]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y[bucket] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[bucket + 1] = a
+    return selected
+
+
+def to_history(days: np.ndarray, exp: np.ndarray, max_points: int = EXP_MAX_POINTS) -> list[dict]:
+    """Downsample a series and shape it for ChartGenerator.plot_exp_progress."""
+    keep = lttb(days.astype(np.int64), exp, max_points)
+    return [{"date": str(day), "exp": int(value)} for day, value in zip(days[keep], exp[keep])]
+
+
+def downsample_history(history: list[dict], max_points: int = EXP_MAX_POINTS) -> list[dict]:
+    """Downsample a {"date", "exp"} history passed to ChartGenerator.plot_exp_progress."""
+    x = np.array([item["date"] for item in history], dtype="datetime64[s]").astype(np.int64)
+    y = np.array([item["exp"] for item in history], dtype=np.float64)
+    return [history[index] for index in lttb(x, y, max_points)]
+
+
+def get_exp_history(db: Session, user_id: int, max_points: int = EXP_MAX_POINTS) -> list[dict]:
+    """Get a user's cumulative EXP per day, downsampled to at most max_points."""
+    return to_history(*daily_exp(db, user_id), max_points)
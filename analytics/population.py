@@ -0,0 +1,185 @@
+"""Cross-user analytics computed with NumPy.
+
+PopulationStats loads one row per user (level, EXP, completed tasks and the
+five stats) into NumPy arrays with a single query, plus the completed task
+counts per (difficulty, category) with one GROUP BY. Distributions,
+percentiles and histograms are then vectorized operations over whole
+columns, with no per-user Python objects.
+"""
+from typing import Optional
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+from models.user import User
+from models.stats import Stats
+from models.task import Task, TaskCategory, TaskDifficulty, TaskStatus
+
+PERCENTILES = [10, 25, 50, 75, 90, 99]
+STAT_BINS = 10  # Histogram bins over 0..MAX_STAT
+CATEGORIES = [category.value for category in TaskCategory]
+DIFFICULTIES = [difficulty.value for difficulty in TaskDifficulty]
+
+
+class PopulationStats:
+    """Per-user columns of every user, and population-wide aggregates over them."""
+    
+    def __init__(
+        self,
+        user_ids: np.ndarray,
+        levels: np.ndarray,
+        total_exp: np.ndarray,
+        completed_tasks: np.ndarray,
+        stats: np.ndarray,
+        category_mix: np.ndarray
+    ):
+        self.user_ids = user_ids
+        self.levels = levels
+        self.total_exp = total_exp
+        self.completed_tasks = completed_tasks
+        self.stats = stats  # (users, len(Stats.STAT_NAMES))
+        self.category_mix = category_mix  # (len(DIFFICULTIES), len(CATEGORIES)) completed tasks
+        self._sorted_stats: Optional[np.ndarray] = None
+    
+    def __len__(self):
+        return len(self.user_ids)
+    
+    def __repr__(self):
+        return f"<PopulationStats(users={len(self)}, tasks={int(self.category_mix.sum())})>"
+    
+    @classmethod
+    def load(cls, conn: Connection, chunk_size: int = 50_000) -> "PopulationStats":
+        """Load every user with two queries. Users without a Stats row count as all zeros."""
+        columns = [
+            User.id,
+            func.coalesce(User.level, 1),
+            func.coalesce(User.total_exp, 0),
+            func.coalesce(User.completed_tasks, 0)
+        ]
+        stat_columns = [func.coalesce(getattr(Stats, name), 0) for name in Stats.STAT_NAMES]
+        result = conn.execute(
+            select(*columns, *stat_columns)
+            .outerjoin(Stats, Stats.user_id == User.id)
+            .order_by(User.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        # Plain tuples: NumPy reads Row objects through the slow sequence protocol
+        chunks = [np.array([tuple(row) for row in chunk], dtype=np.int64) for chunk in result.partitions()]
+        width = len(columns) + len(stat_columns)
+        rows = np.concatenate(chunks) if chunks else np.empty((0, width), dtype=np.int64)
+        
+        category_mix = np.zeros((len(DIFFICULTIES), len(CATEGORIES)), dtype=np.int64)
+        for difficulty, category, count in conn.execute(
+            select(Task.difficulty, Task.category, func.count())
+            .where(Task.status == TaskStatus.COMPLETED.value)
+            .group_by(Task.difficulty, Task.category)
+        ):
+            if difficulty in DIFFICULTIES and category in CATEGORIES:
+                category_mix[DIFFICULTIES.index(difficulty), CATEGORIES.index(category)] = count
+        
+        return cls(
+            user_ids=rows[:, 0],
+            levels=rows[:, 1],
+            total_exp=rows[:, 2],
+            completed_tasks=rows[:, 3],
+            stats=rows[:, 4:],
+            category_mix=category_mix
+        )
+    
+    def stat_percentiles(self, percentiles: list[int] = PERCENTILES) -> dict:
+        """Get {stat: {percentile: value}} across users."""
+        if not len(self):
+            return {}
+        values = np.percentile(self.stats, percentiles, axis=0)
+        return {
+            name: {p: float(value) for p, value in zip(percentiles, values[:, column])}
+            for column, name in enumerate(Stats.STAT_NAMES)
+        }
+    
+    def stat_distributions(self, bins: int = STAT_BINS) -> dict:
+        """Get {stat: counts per bin}, bins splitting 0..MAX_STAT evenly."""
+        width = len(Stats.STAT_NAMES)
+        bin_index = np.clip(self.stats * bins // (Stats.MAX_STAT + 1), 0, bins - 1)
+        # Offset each stat's bins so one bincount covers every column
+        counts = np.bincount(
+            (bin_index + np.arange(width) * bins).ravel(), minlength=width * bins
+        ).reshape(width, bins)
+        return {name: counts[column].tolist() for column, name in enumerate(Stats.STAT_NAMES)}
+    
+    def level_histogram(self) -> dict:
+        """Get {level: users} for every level reached by at least one user."""
+        counts = np.bincount(self.levels)
+        levels = np.flatnonzero(counts)
+        return dict(zip(levels.tolist(), counts[levels].tolist()))
+    
+    def category_shares(self) -> dict:
+        """Get {difficulty: {category: share of its completed tasks}}."""
+        totals = self.category_mix.sum(axis=1, keepdims=True)
+        shares = np.divide(self.category_mix, totals, out=np.zeros(self.category_mix.shape), where=totals > 0)
+        return {
+            difficulty: dict(zip(CATEGORIES, shares[row].tolist()))
+            for row, difficulty in enumerate(DIFFICULTIES)
+        }
+    
+    def user_percentiles(self, user_id: int) -> Optional[dict]:
+        """Get the share of users (0-100) each of a user's stats is above."""
+        position = np.searchsorted(self.user_ids, user_id)
+        if position >= len(self) or self.user_ids[position] != user_id:
+            return None
+        if self._sorted_stats is None:
+            self._sorted_stats = np.sort(self.stats, axis=0)
+        below = [
+            int(np.searchsorted(self._sorted_stats[:, column], self.stats[position, column]))
+            for column in range(len(Stats.STAT_NAMES))
+        ]
+        return {name: 100.0 * count / len(self) for name, count in zip(Stats.STAT_NAMES, below)}
+    
+    def summary(self) -> dict:
+        """Get headline numbers of the population."""
+        if not len(self):
+            return {"users": 0}
+        return {
+            "users": len(self),
+            "mean_level": float(self.levels.mean()),
+            "max_level": int(self.levels.max()),
+            "median_exp": float(np.median(self.total_exp)),
+            "completed_tasks": int(self.category_mix.sum()),
+            "mean_stats": dict(zip(Stats.STAT_NAMES, self.stats.mean(axis=0).tolist()))
+        }
+
+
+def main():
+    """Command line entry point for population analytics."""
+    import argparse
+    from db.database import engine, init_db
+    
+    parser = argparse.ArgumentParser(description="Stat distributions and level histogram across all users.")
+    parser.add_argument("--charts", action="store_true", help="Also render the population charts")
+    parser.add_argument("--output-dir", default="charts")
+    args = parser.parse_args()
+    
+    init_db()
+    with engine.connect() as conn:
+        population = PopulationStats.load(conn)
+    summary = population.summary()
+    print(f"Users: {summary['users']}")
+    if not len(population):
+        return
+    
+    print(f"Mean level: {summary['mean_level']:.1f} (max {summary['max_level']}), median EXP: {summary['median_exp']:.0f}")
+    print("Stat percentiles: " + ", ".join(f"p{p}" for p in PERCENTILES))
+    for name, values in population.stat_percentiles().items():
+        print(f"   {name:<12} " + " ".join(f"{value:6.1f}" for value in values.values()))
+    
+    if args.charts:
+        from analytics.charts import ChartGenerator
+        chart_gen = ChartGenerator(args.output_dir)
+        paths = [
+            chart_gen.plot_stat_distributions(population.stat_distributions()),
+            chart_gen.plot_level_histogram(population.level_histogram()),
+            chart_gen.plot_category_mix(population.category_shares()),
+        ]
+        print(f"✅ Charts saved: {', '.join(paths)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Columnar snapshots of the database for offline analysis.
+
+A snapshot is a directory with a ``manifest.json`` and one set of files per
+column, all readable back zero-copy through memory mapping:
+
+- numbers: ``<column>.npy`` (int64 / float64), plus ``<column>.valid.npy``
+  when the column contains NULLs
+- dates and timestamps: ``<column>.npy`` as datetime64, NULL as NaT
+- low-cardinality strings: ``<column>.codes.npy`` (int32, -1 for NULL) with
+  the dictionary stored in the manifest
+- free text: ``<column>.offsets.npy`` (int64) and ``<column>.data.bin``
+  (UTF-8 bytes), Arrow style
+"""
+import json
+import os
+from datetime import datetime
+from typing import Optional
+import numpy as np
+from sqlalchemy import Date, DateTime, Float, Integer, MetaData, Table, func, inspect, select
+from sqlalchemy.engine import Engine
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_TABLES = ["tasks", "palaces", "stats", "progress_history"]
+DICTIONARY_COLUMNS = {"category", "difficulty", "status", "stat_boost", "stat_name", "change_reason"}
+
+
+def _column_kind(column) -> str:
+    """Map a SQL column type to its on-disk encoding."""
+    if isinstance(column.type, DateTime):
+        return "datetime64[s]"
+    if isinstance(column.type, Date):
+        return "datetime64[D]"
+    if isinstance(column.type, Integer):
+        return "int64"
+    if isinstance(column.type, Float):
+        return "float64"
+    if column.name in DICTIONARY_COLUMNS:
+        return "dictionary"
+    return "string"
+
+
+class _ColumnWriter:
+    """Write one column chunk by chunk into preallocated files."""
+    
+    def __init__(self, directory: str, name: str, kind: str, rows: int):
+        self.directory = directory
+        self.name = name
+        self.kind = kind
+        self.rows = rows
+        self.position = 0
+        self.files = []
+        
+        if kind == "dictionary":
+            self.dictionary = {}
+            self.codes = self._open(f"{name}.codes.npy", np.int32, rows)
+        elif kind == "string":
+            self.offsets = self._open(f"{name}.offsets.npy", np.int64, rows + 1)
+            self.offsets[0] = 0
+            self.data_path = os.path.join(directory, f"{name}.data.bin")
+            self.data = open(self.data_path, "wb")
+            self.files.append(f"{name}.data.bin")
+            self.byte_count = 0
+        else:
+            self.values = self._open(f"{name}.npy", np.dtype(kind), rows)
+            if kind in ("int64", "float64"):
+                self.valid = self._open(f"{name}.valid.npy", np.bool_, rows)
+                self.has_nulls = False
+    
+    def _open(self, filename: str, dtype, rows: int):
+        self.files.append(filename)
+        return np.lib.format.open_memmap(
+            os.path.join(self.directory, filename), mode="w+", dtype=dtype, shape=(rows,)
+        )
+    
+    def write(self, values: list):
+        start, end = self.position, self.position + len(values)
+        if self.kind == "dictionary":
+            dictionary = self.dictionary
+            self.codes[start:end] = [
+                -1 if value is None else dictionary.setdefault(value, len(dictionary))
+                for value in values
+            ]
+        elif self.kind == "string":
+            encoded = [(value or "").encode("utf-8") for value in values]
+            lengths = np.fromiter((len(item) for item in encoded), dtype=np.int64, count=len(encoded))
+            self.offsets[start + 1:end + 1] = self.byte_count + np.cumsum(lengths)
+            self.byte_count += int(lengths.sum())
+            self.data.write(b"".join(encoded))
+        elif self.kind.startswith("datetime64"):
+            self.values[start:end] = np.array(values, dtype=self.kind)
+        else:
+            valid = np.fromiter((value is not None for value in values), dtype=np.bool_, count=len(values))
+            self.valid[start:end] = valid
+            if not valid.all():
+                self.has_nulls = True
+                values = [0 if value is None else value for value in values]
+            self.values[start:end] = values
+        self.position = end
+    
+    def close(self) -> dict:
+        """Flush files and return the manifest entry."""
+        entry = {"kind": self.kind}
+        if self.kind == "dictionary":
+            self.codes.flush()
+            del self.codes
+            entry["dictionary"] = list(self.dictionary)
+        elif self.kind == "string":
+            self.offsets.flush()
+            del self.offsets
+            self.data.close()
+        else:
+            self.values.flush()
+            del self.values
+            if self.kind in ("int64", "float64"):
+                del self.valid
+                if not self.has_nulls:
+                    os.remove(os.path.join(self.directory, f"{self.name}.valid.npy"))
+                    self.files.remove(f"{self.name}.valid.npy")
+                entry["nullable"] = self.has_nulls
+        if self.position < self.rows:
+            self._truncate()
+        entry["files"] = self.files
+        return entry
+    
+    def _truncate(self):
+        """Cut the arrays to the rows actually written, dropping zeroed tails."""
+        for filename in self.files:
+            if not filename.endswith(".npy"):
+                continue
+            path = os.path.join(self.directory, filename)
+            length = self.position + 1 if filename.endswith(".offsets.npy") else self.position
+            np.save(path, np.load(path)[:length])
+
+
+def write_snapshot(
+    engine: Engine,
+    directory: str,
+    tables: Optional[list[str]] = None,
+    chunk_size: int = 50_000
+) -> dict:
+    """Write a columnar snapshot of the given tables and return its manifest.
+    
+    Rows are streamed in chunks, so memory stays bounded by chunk_size.
+    Tables missing from the database are skipped.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"version": SNAPSHOT_VERSION, "created_at": datetime.now().isoformat(), "tables": {}}
+    existing = set(inspect(engine).get_table_names())
+    metadata = MetaData()
+    
+    with engine.connect() as conn:
+        for table_name in tables or SNAPSHOT_TABLES:
+            if table_name not in existing:
+                continue
+            table = Table(table_name, metadata, autoload_with=conn)
+            rows = conn.execute(select(func.count()).select_from(table)).scalar()
+            table_dir = os.path.join(directory, table_name)
+            os.makedirs(table_dir, exist_ok=True)
+            
+            writers = [_ColumnWriter(table_dir, column.name, _column_kind(column), rows) for column in table.columns]
+            result = conn.execute(
+                select(*table.columns)
+                .order_by(*table.primary_key.columns)
+                .execution_options(yield_per=chunk_size)
+            )
+            written = 0
+            for chunk in result.partitions():
+                # Stop at the counted rows in case of concurrent inserts
+                chunk = chunk[:rows - written]
+                for writer, values in zip(writers, zip(*chunk)):
+                    writer.write(list(values))
+                written += len(chunk)
+                if written >= rows:
+                    break
+            result.close()
+            
+            # Rows deleted after the count leave fewer rows than allocated
+            manifest["tables"][table_name] = {
+                "rows": written,
+                "columns": {writer.name: writer.close() for writer in writers}
+            }
+    
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2)
+    return manifest
+
+
+class DictionaryColumn:
+    """Dictionary-encoded strings: int32 codes plus their dictionary."""
+    
+    def __init__(self, codes: np.ndarray, dictionary: list[str]):
+        self.codes = codes
+        self.dictionary = dictionary
+    
+    def __len__(self):
+        return len(self.codes)
+    
+    def __getitem__(self, index: int) -> Optional[str]:
+        code = self.codes[index]
+        return None if code < 0 else self.dictionary[code]
+    
+    def code_of(self, value: str) -> int:
+        """Get the code of a value, or -1 if it never occurs."""
+        return self.dictionary.index(value) if value in self.dictionary else -1
+    
+    def decode(self) -> np.ndarray:
+        """Materialize the column as an object array."""
+        lookup = np.array(self.dictionary + [None], dtype=object)
+        return lookup[self.codes]
+
+
+class StringColumn:
+    """Variable-length UTF-8 strings stored as offsets into a byte buffer."""
+    
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, index: int) -> str:
+        return bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode("utf-8")
+
+
+class ColumnarSnapshot:
+    """Read a snapshot back through memory mapping."""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as handle:
+            self.manifest = json.load(handle)
+        if self.manifest["version"] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {self.manifest['version']}")
+    
+    @property
+    def tables(self) -> list[str]:
+        return list(self.manifest["tables"])
+    
+    def rows(self, table: str) -> int:
+        return self.manifest["tables"][table]["rows"]
+    
+    def _load(self, table: str, filename: str) -> np.ndarray:
+        return np.load(os.path.join(self.directory, table, filename), mmap_mode="r")
+    
+    def column(self, table: str, name: str):
+        """Get one column without copying it into memory."""
+        entry = self.manifest["tables"][table]["columns"][name]
+        kind = entry["kind"]
+        if kind == "dictionary":
+            return DictionaryColumn(self._load(table, f"{name}.codes.npy"), entry["dictionary"])
+        if kind == "string":
+            path = os.path.join(self.directory, table, f"{name}.data.bin")
+            data = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) else np.empty(0, np.uint8)
+            return StringColumn(self._load(table, f"{name}.offsets.npy"), data)
+        
+        values = self._load(table, f"{name}.npy")
+        if entry.get("nullable"):
+            valid = self._load(table, f"{name}.valid.npy")
+            return np.ma.MaskedArray(values, mask=~valid)
+        return values
+    
+    def read_table(self, table: str) -> dict:
+        """Get every column of a table by name."""
+        return {name: self.column(table, name) for name in self.manifest["tables"][table]["columns"]}
+
+
+def main():
+    """Command line entry point for snapshots."""
+    import argparse
+    from db.database import engine, init_db
+    
+    parser = argparse.ArgumentParser(description="Write a columnar analytics snapshot.")
+    parser.add_argument("output", help="Snapshot directory")
+    parser.add_argument("--tables", nargs="+", choices=SNAPSHOT_TABLES, help="Defaults to all")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+    
+    init_db()
+    manifest = write_snapshot(engine, args.output, args.tables, args.chunk_size)
+    rows = ", ".join(f"{info['rows']} {table}" for table, info in manifest["tables"].items())
+    print(f"✅ Snapshot written to {args.output}: {rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,16 @@
 import sys
 from rich.console import Console
 from rich.panel import Panel
-from db.database import init_db, SessionLocal
+from db.database import init_db, SessionLocal, engine
+from db.backup import start_scheduler
 from core.game_loop import GameState
 from ui.dashboard import Dashboard
 from ui.menus import MenuSystem
-from analytics.charts import ChartGenerator
 from sqlalchemy.orm import Session
 
+OVERDUE_PAGE_SIZE = 50
+TASK_PAGE_SIZE = 20
+
 
 class PhantomThievesApp:
     """Main application class."""
@@ -17,15 +20,25 @@ class PhantomThievesApp:
         self.console = Console()
         self.dashboard = Dashboard()
         self.menu = MenuSystem()
-        self.chart_gen = ChartGenerator()
+        self._chart_gen = None
         self.db: Session = SessionLocal()
         self.game_state = GameState(self.db)
+        self.backup_scheduler = None
         self.running = True
     
+    @property
+    def chart_gen(self):
+        """Chart generator, created on first use so matplotlib only loads for analytics."""
+        if self._chart_gen is None:
+            from analytics.charts import ChartGenerator
+            self._chart_gen = ChartGenerator()
+        return self._chart_gen
+    
     def initialize(self):
         """Initialize database and display welcome."""
         try:
             init_db()
+            self.backup_scheduler = start_scheduler(engine)
             self.dashboard.display_welcome()
         except Exception as e:
             self.console.print(f"[bold red]Error initializing: {e}[/bold red]")
@@ -52,27 +65,22 @@ class PhantomThievesApp:
         """Display main dashboard."""
         self.console.clear()
         
-        user = self.game_state.current_user
-        stats = self.game_state.get_user_stats()
-        
-        self.dashboard.display_user_profile(user, stats)
+        # Cached until the next task, palace or stat write
+        snapshot = self.game_state.get_dashboard()
+        self.dashboard.display_user_profile(snapshot, snapshot.stats, snapshot.overdue_count)
         self.console.print()
         
-        if stats:
-            self.dashboard.display_stats(stats)
-            self.console.print()
+        self.dashboard.display_stats(snapshot.stats)
+        self.console.print()
         
         # Show pending tasks
-        pending_tasks = self.game_state.get_pending_tasks()
-        if pending_tasks:
-            self.dashboard.display_tasks(pending_tasks[:5], "📋 Recent Pending Tasks")
+        if snapshot.recent_pending:
+            self.dashboard.display_tasks(snapshot.recent_pending, "📋 Recent Pending Tasks")
             self.console.print()
         
         # Show active palaces
-        from core.palace_engine import PalaceEngine
-        active_palaces = PalaceEngine.get_active_palaces(self.db, user.id)
-        if active_palaces:
-            self.dashboard.display_palaces(active_palaces, "🏯 Active Palaces")
+        if snapshot.active_palaces:
+            self.dashboard.display_palaces(snapshot.active_palaces, "🏯 Active Palaces")
     
     def handle_tasks(self):
         """Handle task management."""
@@ -110,7 +118,7 @@ class PhantomThievesApp:
     
     def complete_task(self):
         """Complete a task."""
-        pending_tasks = self.game_state.get_pending_tasks()
+        pending_tasks = self.game_state.get_pending_tasks(projection=True)
         if not pending_tasks:
             self.dashboard.display_info("No pending tasks available.")
             self.menu.console.input("\n[dim]Press Enter to continue...[/dim]")
@@ -129,20 +137,36 @@ class PhantomThievesApp:
                 self.menu.console.input("\n[dim]Press Enter to continue...[/dim]")
     
     def view_all_tasks(self):
-        """View all tasks."""
-        from models.task import Task, TaskStatus
-        all_tasks = self.db.query(Task).filter(
-            Task.user_id == self.game_state.current_user.id
-        ).order_by(Task.created_at.desc()).all()
+        """View all tasks one page at a time."""
+        page = self.game_state.list_tasks(limit=TASK_PAGE_SIZE, projection=True)
+        page_number = 1
         
-        self.dashboard.display_tasks(all_tasks, "📋 All Tasks")
-        self.menu.console.input("\n[dim]Press Enter to continue...[/dim]")
+        while True:
+            self.console.clear()
+            self.dashboard.display_tasks(page["tasks"], f"📋 All Tasks (page {page_number})")
+            if not page["has_next"] and not page["has_prev"]:
+                self.menu.console.input("\n[dim]Press Enter to continue...[/dim]")
+                break
+            
+            choice = self.menu.page_navigation(page["has_prev"], page["has_next"])
+            if choice == "n":
+                page = self.game_state.list_tasks(limit=TASK_PAGE_SIZE, after=page["next_cursor"], projection=True)
+                page_number += 1
+            elif choice == "p":
+                page = self.game_state.list_tasks(limit=TASK_PAGE_SIZE, before=page["prev_cursor"], projection=True)
+                page_number -= 1
+            else:
+                break
     
     def view_overdue_tasks(self):
         """View overdue tasks."""
-        overdue_tasks = self.game_state.get_overdue_tasks()
+        overdue_tasks = self.game_state.get_overdue_tasks(limit=OVERDUE_PAGE_SIZE, projection=True)
         if overdue_tasks:
             self.dashboard.display_tasks(overdue_tasks, "⚠️ Overdue Tasks")
+            if len(overdue_tasks) == OVERDUE_PAGE_SIZE:
+                total = self.game_state.count_overdue_tasks()
+                if total > OVERDUE_PAGE_SIZE:
+                    self.dashboard.display_info(f"Showing the {OVERDUE_PAGE_SIZE} oldest of {total} overdue tasks.")
         else:
             self.dashboard.display_success("No overdue tasks! Great job! 🎉")
         self.menu.console.input("\n[dim]Press Enter to continue...[/dim]")
@@ -181,14 +205,14 @@ class PhantomThievesApp:
     def view_active_palaces(self):
         """View active palaces."""
         from core.palace_engine import PalaceEngine
-        active_palaces = PalaceEngine.get_active_palaces(self.db, self.game_state.current_user.id)
+        active_palaces = PalaceEngine.get_active_palaces(self.db, self.game_state.current_user.id, projection=True)
         self.dashboard.display_palaces(active_palaces, "🏯 Active Palaces")
         self.menu.console.input("\n[dim]Press Enter to continue...[/dim]")
     
     def view_completed_palaces(self):
         """View completed palaces."""
         from core.palace_engine import PalaceEngine
-        completed_palaces = PalaceEngine.get_completed_palaces(self.db, self.game_state.current_user.id)
+        completed_palaces = PalaceEngine.get_completed_palaces(self.db, self.game_state.current_user.id, projection=True)
         self.dashboard.display_palaces(completed_palaces, "🏆 Completed Palaces")
         self.menu.console.input("\n[dim]Press Enter to continue...[/dim]")
     
@@ -217,9 +241,16 @@ class PhantomThievesApp:
             bar_path = self.chart_gen.plot_stats_bar(stats, user.username)
             self.dashboard.display_success(f"Bar chart saved: {bar_path}")
             
+            # Generate EXP progress chart
+            from analytics.exp_history import get_exp_history
+            exp_history = get_exp_history(self.db, user.id)
+            if exp_history:
+                exp_path = self.chart_gen.plot_exp_progress(exp_history, user.username)
+                self.dashboard.display_success(f"EXP chart saved: {exp_path}")
+            
             # Generate palace progress chart
             from core.palace_engine import PalaceEngine
-            active_palaces = PalaceEngine.get_active_palaces(self.db, user.id)
+            active_palaces = PalaceEngine.get_active_palaces(self.db, user.id, projection=True)
             if active_palaces:
                 palace_data = [{
                     "name": p.name,
@@ -230,6 +261,11 @@ class PhantomThievesApp:
             
             self.console.print("\n[bold green]✅ All charts generated successfully![/bold green]")
             self.console.print("[dim]Check the 'charts' directory for saved images.[/dim]")
+            cache = self.chart_gen.cache.info()
+            self.console.print(
+                f"[dim]Chart cache: {cache['hits']} hits, {cache['misses']} renders, "
+                f"{cache['entries']} cached ({cache['bytes'] / 1024 / 1024:.1f} MiB)[/dim]"
+            )
             
         except Exception as e:
             self.dashboard.display_error(f"Error generating charts: {e}")
@@ -269,6 +305,8 @@ class PhantomThievesApp:
                 self.dashboard.display_error(f"Unexpected error: {e}")
                 self.menu.console.input("\n[dim]Press Enter to continue...[/dim]")
         
+        if self.backup_scheduler:
+            self.backup_scheduler.stop()
         self.db.close()
     
     def __del__(self):
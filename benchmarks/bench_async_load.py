@@ -0,0 +1,103 @@
+"""Load test AsyncGameState with many concurrent simulated users.
+
+Each simulated user creates a profile, a palace and some tasks, completes
+them one by one and reads its dashboard data. Final EXP, levels and stats
+are checked against the expected totals.
+
+Usage: python -m benchmarks.bench_async_load [--users N] [--tasks M]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from core.async_game_loop import AsyncGameState
+from core.stats_engine import StatsEngine
+from db.database import create_async_db_engine, create_async_session_factory
+from models.task import Task
+from benchmarks.common import (
+    CATEGORIES, DIFFICULTIES, console, create_temp_database, drop_temp_database, print_results
+)
+
+
+async def simulate_user(game: AsyncGameState, index: int, tasks: int, latencies: list[float]) -> tuple:
+    """Play one user's session; return (user_id, expected_exp, expected_stats)."""
+    
+    async def timed(coro):
+        start = time.perf_counter()
+        result = await coro
+        latencies.append((time.perf_counter() - start) * 1000)
+        return result
+    
+    user = await timed(game.create_user(f"thief{index}"))
+    await timed(game.create_palace(user.id, f"Palace {index}"))
+    
+    expected_exp = 0
+    expected_stats = 0
+    for i in range(tasks):
+        difficulty = DIFFICULTIES[(index + i) % len(DIFFICULTIES)]
+        task = await timed(game.create_task(user.id, f"Mission {i}", CATEGORIES[i % len(CATEGORIES)], difficulty))
+        await timed(game.complete_task(user.id, task.id))
+        expected_exp += Task.EXP_REWARD_MAP[difficulty]
+        expected_stats += StatsEngine.DIFFICULTY_BOOST_MAP[difficulty]
+    
+    await timed(game.get_user_stats(user.id))
+    await timed(game.get_active_palaces(user.id))
+    return user.id, expected_exp, expected_stats
+
+
+async def run(async_url: str, users: int, tasks: int) -> tuple:
+    async_engine = create_async_db_engine(async_url)
+    game = AsyncGameState(create_async_session_factory(async_engine))
+    latencies = []
+    
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*[simulate_user(game, i, tasks, latencies) for i in range(users)])
+    elapsed = time.perf_counter() - start
+    
+    mismatches = 0
+    for user_id, expected_exp, expected_stats in outcomes:
+        user = await game.get_user_by_id(user_id)
+        stats = await game.get_user_stats(user_id)
+        if (
+            user.total_exp != expected_exp
+            or user.level != expected_exp // 100 + 1
+            or user.completed_tasks != tasks
+            or stats["Total"] != expected_stats
+        ):
+            mismatches += 1
+    
+    await async_engine.dispose()
+    return elapsed, latencies, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--tasks", type=int, default=5, help="Tasks completed per user")
+    args = parser.parse_args()
+    
+    engine, _, path = create_temp_database()
+    try:
+        elapsed, latencies, mismatches = asyncio.run(run(f"sqlite+aiosqlite:///{path}", args.users, args.tasks))
+    finally:
+        drop_temp_database(engine, path)
+    
+    latencies.sort()
+    print_results(
+        f"AsyncGameState load test ({args.users} concurrent users, {args.tasks} tasks each)",
+        ["Operations", "Ops/sec", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Inconsistent users"],
+        [[
+            f"{len(latencies):,}",
+            f"{len(latencies) / elapsed:,.0f}",
+            f"{statistics.median(latencies):.1f}",
+            f"{latencies[int(len(latencies) * 0.95)]:.1f}",
+            f"{latencies[int(len(latencies) * 0.99)]:.1f}",
+            mismatches
+        ]]
+    )
+    if mismatches:
+        console.print("[bold red]❌ Final state does not match the completed tasks[/bold red]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark online backups against a writer committing tasks.
+
+Fills a database up to --size-mb, then measures commit latency of a writer
+thread alone, during a stepped backup and during a single-step backup.
+Stall is the time commits spent above the baseline p99 latency.
+
+Usage: python -m benchmarks.bench_backup [--size-mb MB] [--profile NAME]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+from sqlalchemy import insert
+from core.game_loop import GameState
+from db.backup import BACKUP_PAGES, backup_database
+from db.database import PERFORMANCE_PROFILES
+from models.task import Task
+from models.user import User
+from benchmarks.common import (
+    console, create_temp_database, drop_temp_database, seed_user, Timer, print_results
+)
+
+ROW_BYTES = 4096
+BATCH_ROWS = 5_000
+
+
+def fill_database(engine, user_id: int, size_mb: int):
+    """Insert tasks with large descriptions until the file reaches size_mb."""
+    rows = size_mb * 1024 * 1024 // ROW_BYTES
+    for start in range(0, rows, BATCH_ROWS):
+        batch = [
+            {
+                "user_id": user_id,
+                "title": f"Filler {i}",
+                "description": os.urandom(ROW_BYTES // 2).hex(),
+                "category": "Knowledge",
+                "difficulty": "Easy"
+            }
+            for i in range(start, min(rows, start + BATCH_ROWS))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(Task), batch)
+
+
+def measure_writes(session_factory, user_id: int, work=None, seconds: float = 2.0) -> list[float]:
+    """Commit tasks from a thread while work runs (or for seconds). Returns latencies in ms."""
+    stop = threading.Event()
+    latencies = []
+    
+    def writer():
+        db = session_factory()
+        game_state = GameState(db)
+        game_state.current_user = db.get(User, user_id)
+        while not stop.is_set():
+            with Timer() as timer:
+                game_state.create_task("Background write", "Guts", "Medium")
+            latencies.append(timer.elapsed * 1000)
+        db.close()
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    if work:
+        work()
+    else:
+        stop.wait(seconds)
+    stop.set()
+    thread.join()
+    return latencies
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--profile", choices=PERFORMANCE_PROFILES, default="balanced")
+    parser.add_argument("--pages", type=int, default=BACKUP_PAGES)
+    args = parser.parse_args()
+    
+    engine, session_factory, path = create_temp_database(profile=args.profile)
+    try:
+        db = session_factory()
+        user_id = seed_user(db, "bench").id
+        db.close()
+        with console.status(f"Filling the database to {args.size_mb} MiB..."):
+            fill_database(engine, user_id, args.size_mb)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        
+        baseline = measure_writes(session_factory, user_id)
+        threshold = percentile(baseline, 0.99)
+        rows = [["Writer alone", "-", "-", len(baseline),
+                 f"{statistics.median(baseline):.2f}", f"{threshold:.2f}", f"{max(baseline):.1f}", "-"]]
+        
+        with tempfile.TemporaryDirectory() as directory:
+            for label, pages in [(f"Stepped backup ({args.pages} pages)", args.pages), ("Single-step backup", -1)]:
+                report = {}
+                
+                def work():
+                    report.update(backup_database(engine, directory, keep=1, pages=pages))
+                
+                with console.status(f"{label}..."):
+                    latencies = measure_writes(session_factory, user_id, work)
+                stall = sum(latency - threshold for latency in latencies if latency > threshold)
+                rows.append([
+                    label,
+                    f"{report['copy_seconds']:.2f} / {report['seconds']:.2f}",
+                    f"{report['steps']} / {report['restarts']}{' (fell back)' if report['single_step'] else ''}",
+                    len(latencies),
+                    f"{statistics.median(latencies):.2f}",
+                    f"{percentile(latencies, 0.99):.2f}",
+                    f"{max(latencies):.1f}",
+                    f"{stall:.0f}"
+                ])
+        
+        print_results(
+            f"Online backup, {size_mb:.0f} MiB database, '{args.profile}' profile",
+            ["Run", "Copy / total s", "Steps / restarts", "Commits",
+             "p50 ms", "p99 ms", "Max ms", "Stall ms"],
+            rows
+        )
+    finally:
+        drop_temp_database(engine, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark batch chart rendering in a process pool.
+
+Renders the radar, bar, palace and EXP charts of --users synthetic users
+serially in-process, then with ChartGenerator.render_batch at several
+pool sizes. The render cache is off, so every chart is drawn.
+
+Usage: python -m benchmarks.bench_chart_batch [--users N] [--workers 1 2 4]
+"""
+import argparse
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+from analytics.charts import CHART_KINDS, ChartGenerator, ChartJob, STAT_NAMES
+from benchmarks.common import console, Timer, print_results
+
+
+def make_jobs(users: int) -> list[ChartJob]:
+    rng = random.Random(7)
+    start = datetime(2025, 1, 1)
+    jobs = []
+    for i in range(users):
+        username = f"thief{i}"
+        stats = {name: rng.randint(0, 100) for name in STAT_NAMES}
+        jobs.append(ChartJob("radar", username, stats))
+        jobs.append(ChartJob("bar", username, stats))
+        jobs.append(ChartJob("palaces", username, [
+            {"name": f"Palace {j}", "infiltration": rng.uniform(0, 100)} for j in range(3)
+        ]))
+        jobs.append(ChartJob("exp", username, [
+            {"date": (start + timedelta(days=day)).isoformat(), "exp": day * 40 + rng.randint(0, 30)}
+            for day in range(14)
+        ]))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+    
+    jobs = make_jobs(args.users)
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        chart_gen = ChartGenerator(directory, cache=False)
+        with console.status(f"Rendering {len(jobs)} charts serially..."):
+            with Timer() as serial_timer:
+                for job in jobs:
+                    getattr(chart_gen, CHART_KINDS[job.kind])(job.data, job.username)
+        rows.append(["Serial", f"{serial_timer.elapsed:.2f}", f"{len(jobs) / serial_timer.elapsed:.1f}", "1.00x"])
+        
+        for workers in args.workers:
+            with console.status(f"Rendering {len(jobs)} charts with {workers} worker(s)..."):
+                with Timer() as timer:
+                    rendered = sum(1 for _, path in chart_gen.render_batch(jobs, workers) if path)
+            if rendered != len(jobs):
+                console.print(f"[bold red]❌ {workers} worker(s) rendered {rendered} of {len(jobs)} charts[/bold red]")
+            rows.append([
+                f"Pool, {workers} worker(s)",
+                f"{timer.elapsed:.2f}",
+                f"{len(jobs) / timer.elapsed:.1f}",
+                f"{serial_timer.elapsed / timer.elapsed:.2f}x"
+            ])
+    
+    print_results(
+        f"Batch chart rendering ({args.users} users, {len(jobs)} charts, {os.cpu_count()} CPUs)",
+        ["Run", "Seconds", "Charts / s", "Speedup"],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark the chart render cache.
+
+Renders the analytics charts (radar, bar, palaces) for a set of users
+without the cache, then twice with it: once cold, once with every chart
+already cached.
+
+Usage: python -m benchmarks.bench_chart_cache [--users N]
+"""
+import argparse
+import random
+import tempfile
+from analytics.charts import ChartGenerator, STAT_NAMES
+from benchmarks.common import console, Timer, print_results
+
+
+def make_inputs(users: int) -> list[tuple]:
+    rng = random.Random(7)
+    return [
+        (
+            f"thief{i}",
+            {name: rng.randint(0, 100) for name in STAT_NAMES},
+            [{"name": f"Palace {j}", "infiltration": rng.uniform(0, 100)} for j in range(3)]
+        )
+        for i in range(users)
+    ]
+
+
+def render_all(chart_gen: ChartGenerator, inputs: list[tuple]):
+    for username, stats, palaces in inputs:
+        chart_gen.plot_stats_radar(stats, username)
+        chart_gen.plot_stats_bar(stats, username)
+        chart_gen.plot_palace_progress(palaces, username)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args()
+    
+    inputs = make_inputs(args.users)
+    charts = args.users * 3
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        with console.status("Rendering without cache..."):
+            with Timer() as timer:
+                render_all(ChartGenerator(directory, cache=False), inputs)
+        rows.append(["No cache", f"{timer.elapsed:.2f}", f"{timer.elapsed / charts * 1000:.1f}"])
+        
+        chart_gen = ChartGenerator(directory)
+        for label in ("Cache, cold", "Cache, warm"):
+            with console.status(f"Rendering ({label.lower()})..."):
+                with Timer() as timer:
+                    render_all(chart_gen, inputs)
+            rows.append([label, f"{timer.elapsed:.2f}", f"{timer.elapsed / charts * 1000:.1f}"])
+        info = chart_gen.cache.info()
+    
+    print_results(f"Chart rendering ({args.users} users, {charts} charts)", ["Run", "Seconds", "ms / chart"], rows)
+    console.print(
+        f"Cache: {info['hits']} hits, {info['misses']} misses, {info['entries']} entries, "
+        f"{info['bytes'] / 1024 / 1024:.1f} MiB, ~{info['saved_seconds']:.2f}s of rendering saved"
+    )
+
+
+if __name__ == "__main__":
+    main()
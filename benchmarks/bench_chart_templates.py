@@ -0,0 +1,62 @@
+"""Benchmark template rendering against building every figure from scratch.
+
+Renders the radar, bar and palace charts of --users synthetic users both
+ways, with the render cache off, and reports the time per chart.
+
+Usage: python -m benchmarks.bench_chart_templates [--users N]
+"""
+import argparse
+import tempfile
+from analytics.charts import CHART_KINDS, ChartGenerator
+from benchmarks.bench_chart_batch import make_jobs
+from benchmarks.common import console, Timer, print_results
+
+TEMPLATE_KINDS = ["radar", "bar", "palaces"]
+
+
+def time_charts(chart_gen, jobs) -> dict:
+    """Return total seconds per chart kind."""
+    totals = dict.fromkeys(TEMPLATE_KINDS, 0.0)
+    for job in jobs:
+        if job.kind in totals:
+            with Timer() as timer:
+                getattr(chart_gen, CHART_KINDS[job.kind])(job.data, job.username)
+            totals[job.kind] += timer.elapsed
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+    
+    jobs = make_jobs(args.users)
+    with tempfile.TemporaryDirectory() as directory:
+        with console.status("Rendering from scratch..."):
+            scratch = time_charts(ChartGenerator(directory, cache=False), jobs)
+        chart_gen = ChartGenerator(directory, cache=False, templates=True)
+        with console.status("Rendering with templates..."):
+            with Timer() as build_timer:
+                time_charts(chart_gen, jobs[:4])
+            template = time_charts(chart_gen, jobs)
+        chart_gen.templates.close()
+    
+    rows = [
+        [
+            kind,
+            f"{scratch[kind] / args.users * 1000:.1f}",
+            f"{template[kind] / args.users * 1000:.1f}",
+            f"{scratch[kind] / template[kind]:.2f}x"
+        ]
+        for kind in TEMPLATE_KINDS
+    ]
+    print_results(
+        f"Per-chart render time ({args.users} users, cache off)",
+        ["Chart", "From scratch (ms)", "Template (ms)", "Speedup"],
+        rows
+    )
+    console.print(f"First chart of each kind, building its template: {build_timer.elapsed * 1000:.0f} ms in total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Benchmark task completion throughput with many active palaces.
+
+Compares the baseline multi-commit completion flow, reproduced inline so
+later engine changes don't leak into it, with the single-transaction
+``GameState.complete_task`` pipeline.
+
+Usage: python -m benchmarks.bench_completion [--completions N]
+"""
+import argparse
+from core.game_loop import GameState
+from models.palace import Palace, PalaceStatus
+from models.stats import Stats
+from models.task import Task, TaskStatus
+from benchmarks.common import (
+    create_temp_database, drop_temp_database, seed_user, Timer, print_results
+)
+
+
+BOOST_BY_DIFFICULTY = {"Easy": 1, "Medium": 2, "Hard": 3, "Extreme": 5}
+STAT_BY_CATEGORY = {"Knowledge": "knowledge", "Guts": "guts", "Proficiency": "proficiency",
+                    "Kindness": "kindness", "Charm": "charm"}
+
+
+def legacy_complete_task(game_state: GameState, task_id: int) -> dict:
+    """The baseline completion flow: a commit per stat, per palace and for EXP.
+    
+    Infiltration loads every completed task of the user, once per palace.
+    The only addition is keeping users.completed_tasks in step, so the
+    database stays consistent with what the current code expects.
+    """
+    db = game_state.db
+    user = game_state.current_user
+    task = db.query(Task).filter(Task.id == task_id, Task.user_id == user.id).first()
+    if task.status == TaskStatus.COMPLETED.value:
+        return {"message": "Task already completed"}
+    task.complete()
+    
+    # StatsEngine.process_task_completion
+    stats = db.query(Stats).filter(Stats.user_id == user.id).first()
+    if not stats:
+        stats = Stats(user_id=user.id)
+        db.add(stats)
+        db.commit()
+        db.refresh(stats)
+    stat_to_boost = STAT_BY_CATEGORY.get(task.category, "knowledge")
+    boost_amount = BOOST_BY_DIFFICULTY.get(task.difficulty, 1)
+    increased = stats.increase_stat(stat_to_boost, boost_amount)
+    task.stat_boost = stat_to_boost
+    db.commit()
+    db.refresh(stats)
+    
+    # User.add_exp
+    user.total_exp += task.exp_reward
+    new_level = (user.total_exp // 100) + 1
+    leveled_up = new_level > user.level
+    if leveled_up:
+        user.level = new_level
+    user.completed_tasks = (user.completed_tasks or 0) + 1
+    
+    # PalaceEngine.update_palace_progress for every active palace
+    palaces = db.query(Palace).filter(Palace.user_id == user.id, Palace.status == PalaceStatus.ACTIVE).all()
+    for palace in palaces:
+        completed = db.query(Task).filter(
+            Task.user_id == palace.user_id,
+            Task.status == TaskStatus.COMPLETED.value
+        ).all()
+        palace.update_infiltration(min(100.0, len(completed) * 0.5))
+        db.commit()
+        db.refresh(palace)
+    
+    db.commit()
+    db.refresh(user)
+    return {
+        "task": task.title,
+        "stat_boost": {"stat": stat_to_boost, "amount": boost_amount, "increased": increased},
+        "leveled_up": leveled_up
+    }
+
+
+def final_state(db, user) -> tuple:
+    """User, stats and palace values both flows must end with."""
+    stats = db.query(Stats).filter(Stats.user_id == user.id).first()
+    palaces = db.query(Palace.infiltration_percentage, Palace.status).filter(
+        Palace.user_id == user.id
+    ).order_by(Palace.id).all()
+    return (
+        user.total_exp, user.level, user.completed_tasks,
+        tuple(stats.get_stat(name) for name in Stats.STAT_NAMES),
+        tuple(tuple(palace) for palace in palaces)
+    )
+
+
+def run(palaces: int, completions: int, complete) -> tuple[float, tuple]:
+    """Return completions/sec and the final state for one configuration."""
+    engine, session_factory, path = create_temp_database()
+    try:
+        db = session_factory()
+        user = seed_user(db, "bench", palaces=palaces, pending_tasks=completions)
+        game_state = GameState(db)
+        game_state.current_user = user
+        task_ids = [task_id for (task_id,) in db.query(Task.id).filter(
+            Task.status == TaskStatus.PENDING.value
+        ).all()]
+        
+        with Timer() as timer:
+            for task_id in task_ids:
+                complete(game_state, task_id)
+        state = final_state(db, user)
+        db.close()
+        return completions / timer.elapsed, state
+    finally:
+        drop_temp_database(engine, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    # Stay below 200 completions so palaces remain active for the whole run
+    parser.add_argument("--completions", type=int, default=100)
+    args = parser.parse_args()
+    
+    rows = []
+    for palaces in (1, 10, 100):
+        before, legacy_state = run(palaces, args.completions, legacy_complete_task)
+        after, state = run(palaces, args.completions, lambda gs, task_id: gs.complete_task(task_id))
+        assert state == legacy_state, f"Completion flows disagree: {legacy_state} != {state}"
+        rows.append([palaces, f"{before:,.1f}", f"{after:,.1f}", f"{after / before:.2f}x"])
+    
+    print_results(
+        f"Task completions/sec ({args.completions} completions)",
+        ["Active palaces", "Before", "After", "Speedup"],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark loading the dashboard: uncached queries vs DashboardSnapshot.
+
+Usage: python -m benchmarks.bench_dashboard [--pending N] [--repeat R]
+"""
+import argparse
+from sqlalchemy import event
+from core.game_loop import GameState
+from core.palace_engine import PalaceEngine
+from benchmarks.common import (
+    console, create_temp_database, drop_temp_database, seed_user, Timer, print_results
+)
+
+
+def load_uncached(game_state: GameState):
+    """The queries show_dashboard used to run on every view."""
+    user = game_state.current_user
+    game_state.get_user_stats()
+    game_state.count_overdue_tasks()
+    game_state.get_pending_tasks()[:5]
+    PalaceEngine.get_active_palaces(game_state.db, user.id)
+    game_state.db.commit()  # The app commits between views, expiring the user
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pending", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    
+    engine, session_factory, path = create_temp_database()
+    statements = [0]
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(*_):
+        statements[0] += 1
+    
+    try:
+        db = session_factory()
+        user = seed_user(db, "joker", palaces=5, pending_tasks=args.pending, completed_tasks=100)
+        game_state = GameState(db)
+        game_state.current_user = user
+        
+        rows = []
+        for name, load in [
+            ("Uncached queries", lambda: load_uncached(game_state)),
+            ("DashboardSnapshot, miss", lambda: (game_state.dashboard_cache.invalidate(), game_state.get_dashboard())),
+            ("DashboardSnapshot, hit", game_state.get_dashboard),
+        ]:
+            load()
+            statements[0] = 0
+            with Timer() as timer:
+                for _ in range(args.repeat):
+                    load()
+            rows.append([
+                name,
+                f"{timer.elapsed / args.repeat * 1000:.2f}",
+                f"{statements[0] / args.repeat:.0f}"
+            ])
+        
+        print_results(
+            f"Dashboard load ({args.pending:,} pending tasks, {args.repeat} views)",
+            ["Method", "ms/view", "Queries/view"],
+            rows
+        )
+        info = game_state.dashboard_cache.info()
+        console.print(f"[dim]Cache: {info['hits']} hits, {info['misses']} misses[/dim]")
+        db.close()
+    finally:
+        drop_temp_database(engine, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark the EXP history query, downsampling and chart.
+
+Seeds users with a week and with five years of completed tasks, then
+times the SQL GROUP BY, LTTB downsampling and rendering for each. The
+five-year history is also rendered with every daily point, and as the
+chart used to draw it: markers on every point and one tick per day.
+
+Usage: python -m benchmarks.bench_exp_history [--tasks-per-day N]
+"""
+import argparse
+import random
+import tempfile
+from datetime import datetime, timedelta
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+from sqlalchemy import insert
+from analytics.charts import ChartGenerator
+from analytics.exp_history import daily_exp, to_history
+from models.task import Task
+from models.user import User
+from benchmarks.common import (
+    CATEGORIES, DIFFICULTIES, create_temp_database, drop_temp_database, Timer, print_results
+)
+
+EXP_BY_DIFFICULTY = {difficulty: Task.exp_reward_for(difficulty) for difficulty in DIFFICULTIES}
+
+
+def seed_history(db, username: str, days: int, tasks_per_day: int) -> int:
+    """Create a user who completed tasks_per_day tasks (on average) every day."""
+    user = User(username=username)
+    db.add(user)
+    db.commit()
+    
+    rng = random.Random(days)
+    end = datetime.now()
+    rows = []
+    for day in range(days):
+        completed_day = end - timedelta(days=days - day)
+        for _ in range(rng.randint(0, 2 * tasks_per_day)):
+            difficulty = rng.choice(DIFFICULTIES)
+            rows.append({
+                "user_id": user.id,
+                "title": "History",
+                "category": rng.choice(CATEGORIES),
+                "difficulty": difficulty,
+                "status": "completed",
+                "exp_reward": EXP_BY_DIFFICULTY[difficulty],
+                "completed_at": completed_day + timedelta(minutes=rng.randint(0, 1439))
+            })
+    db.execute(insert(Task), rows)
+    db.commit()
+    return user.id
+
+
+def draw_previous(save_path: str, history: list[dict]):
+    """The EXP chart before downsampling and adaptive date ticks."""
+    dates = [datetime.fromisoformat(item['date']) for item in history]
+    exp_values = [item['exp'] for item in history]
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(dates, exp_values, marker='o', linewidth=2, color='#FF6B6B', markersize=8)
+    ax.fill_between(dates, exp_values, alpha=0.3, color='#FF6B6B')
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+    ax.xaxis.set_major_locator(mdates.DayLocator(interval=1))
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+    plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor='black')
+    plt.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks-per-day", type=int, default=5)
+    args = parser.parse_args()
+    
+    engine, session_factory, path = create_temp_database()
+    try:
+        db = session_factory()
+        users = {
+            "1 week": seed_history(db, "week", 7, args.tasks_per_day),
+            "5 years": seed_history(db, "years", 5 * 365, args.tasks_per_day),
+        }
+        
+        rows = []
+        with tempfile.TemporaryDirectory() as directory:
+            chart_gen = ChartGenerator(directory, cache=False)
+            for label, user_id in users.items():
+                with Timer() as query_timer:
+                    days, exp = daily_exp(db, user_id)
+                with Timer() as downsample_timer:
+                    history = to_history(days, exp)
+                with Timer() as render_timer:
+                    chart_gen.plot_exp_progress(history, label)
+                rows.append([
+                    label, len(days), len(history),
+                    f"{query_timer.elapsed * 1000:.1f}",
+                    f"{downsample_timer.elapsed * 1000:.1f}",
+                    f"{render_timer.elapsed * 1000:.0f}"
+                ])
+            
+            history = to_history(days, exp, max_points=len(days))
+            with Timer() as render_timer:
+                chart_gen._draw_exp_progress(f"{directory}/full.png", history, "full")
+            rows.append(["5 years, every point", len(days), len(history), "-", "-", f"{render_timer.elapsed * 1000:.0f}"])
+            with Timer() as render_timer:
+                draw_previous(f"{directory}/previous.png", history)
+            rows.append(["5 years, previous chart", len(days), len(history), "-", "-", f"{render_timer.elapsed * 1000:.0f}"])
+        db.close()
+        
+        print_results(
+            f"EXP history ({args.tasks_per_day} tasks/day on average)",
+            ["History", "Days", "Points plotted", "Query (ms)", "LTTB (ms)", "Render (ms)"],
+            rows
+        )
+    finally:
+        drop_temp_database(engine, path)
+
+
+if __name__ == "__main__":
+    main()
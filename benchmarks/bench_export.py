@@ -0,0 +1,61 @@
+"""Benchmark streaming export throughput and peak memory.
+
+Usage: python -m benchmarks.bench_export [--tasks 1000000 10000000]
+"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+from core.exporter import DataExporter
+from benchmarks.common import (
+    console, create_temp_database, drop_temp_database, seed_user, print_results
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--tasks-per-user", type=int, default=10_000)
+    args = parser.parse_args()
+    
+    rows = []
+    for size in args.tasks:
+        engine, session_factory, path = create_temp_database()
+        try:
+            db = session_factory()
+            users = max(1, size // args.tasks_per_user)
+            with console.status(f"Seeding {size:,} tasks..."):
+                for i in range(users):
+                    seed_user(db, f"thief{i}", palaces=2, pending_tasks=size // users)
+            
+            with tempfile.TemporaryDirectory() as out_dir:
+                exporter = DataExporter(db)
+                for file_format, target in (("jsonl", os.path.join(out_dir, "export.jsonl")),
+                                            ("csv", os.path.join(out_dir, "csv"))):
+                    export = exporter.export_csv if file_format == "csv" else exporter.export_jsonl
+                    report = export(target)
+                    # Second pass under tracemalloc, which would skew the timing
+                    tracemalloc.start()
+                    export(target)
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    rows.append([
+                        f"{size:,}", file_format,
+                        f"{sum(report['rows'].values()):,}",
+                        f"{report['seconds']:.2f}",
+                        f"{report['rows_per_sec']:,.0f}",
+                        f"{peak / 1024 / 1024:.1f}"
+                    ])
+            db.close()
+        finally:
+            drop_temp_database(engine, path)
+    
+    print_results(
+        "Streaming export",
+        ["Tasks", "Format", "Rows", "Seconds", "Rows/sec", "Peak MiB"],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    main()
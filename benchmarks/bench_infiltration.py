@@ -0,0 +1,83 @@
+"""Benchmark palace infiltration for users with many completed tasks.
+
+Compares loading every completed task (the legacy approach), a SQL COUNT and
+the users.completed_tasks counter, plus end-to-end complete_task latency.
+
+Usage: python -m benchmarks.bench_infiltration [--sizes 1000 100000]
+"""
+import argparse
+import tracemalloc
+from core.game_loop import GameState
+from core.palace_engine import PalaceEngine
+from models.palace import Palace
+from models.task import Task, TaskStatus
+from benchmarks.common import (
+    create_temp_database, drop_temp_database, seed_user, Timer, print_results
+)
+
+
+def legacy_infiltration(db, palace: Palace) -> float:
+    """Infiltration as computed before the counter existed."""
+    user_tasks = db.query(Task).filter(
+        Task.user_id == palace.user_id,
+        Task.status == TaskStatus.COMPLETED.value
+    ).all()
+    return min(100.0, len(user_tasks) * 0.5)
+
+
+def measure(func, repeat: int) -> tuple[float, float]:
+    """Return (mean ms per call, peak KiB) for func."""
+    tracemalloc.start()
+    with Timer() as timer:
+        for _ in range(repeat):
+            func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timer.elapsed / repeat * 1000, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    rows = []
+    for size in args.sizes:
+        engine, session_factory, path = create_temp_database()
+        try:
+            db = session_factory()
+            user = seed_user(db, "bench", palaces=1, pending_tasks=args.repeat, completed_tasks=size)
+            palace = db.query(Palace).first()
+            
+            variants = {
+                "load all (legacy)": lambda: legacy_infiltration(db, palace),
+                "SQL COUNT": lambda: PalaceEngine.count_completed_tasks(db, palace.user_id),
+                "counter": lambda: PalaceEngine.calculate_infiltration(db, palace),
+            }
+            for name, func in variants.items():
+                ms, kib = measure(func, args.repeat)
+                rows.append([f"{size:,}", name, f"{ms:.3f}", f"{kib:,.0f}"])
+            
+            game_state = GameState(db)
+            game_state.current_user = user
+            pending = [task_id for (task_id,) in db.query(Task.id).filter(
+                Task.status == TaskStatus.PENDING.value
+            )]
+            with Timer() as timer:
+                for task_id in pending:
+                    game_state.complete_task(task_id)
+            rows.append([f"{size:,}", "complete_task (counter)", f"{timer.elapsed / len(pending) * 1000:.3f}", "-"])
+            db.close()
+        finally:
+            drop_temp_database(engine, path)
+    
+    print_results(
+        "Palace infiltration cost",
+        ["Completed tasks", "Method", "ms/call", "Peak KiB"],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    main()
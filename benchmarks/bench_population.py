@@ -0,0 +1,135 @@
+"""Benchmark cross-user analytics: ORM loops against NumPy columns.
+
+Seeds --users users with random stats and completed tasks, then computes
+stat percentiles and distributions, the level histogram and the category
+mix per difficulty twice: by iterating ORM objects in Python, and with
+PopulationStats (two queries into arrays, vectorized aggregates). Both
+must agree.
+
+Usage: python -m benchmarks.bench_population [--users N] [--tasks-per-user N]
+"""
+import argparse
+import random
+from collections import Counter
+import numpy as np
+from sqlalchemy import insert, select
+from analytics.population import PERCENTILES, STAT_BINS, PopulationStats
+from models.stats import Stats
+from models.task import Task, TaskStatus
+from models.user import User
+from benchmarks.common import (
+    CATEGORIES, DIFFICULTIES, console, create_temp_database, drop_temp_database, Timer, print_results
+)
+
+BATCH_ROWS = 20_000
+
+
+def seed_population(engine, users: int, tasks_per_user: int):
+    """Bulk insert users with a Stats row each and completed tasks."""
+    rng = random.Random(users)
+    for start in range(0, users, BATCH_ROWS):
+        ids = range(start + 1, min(users, start + BATCH_ROWS) + 1)
+        levels = [rng.randint(1, 99) for _ in ids]
+        with engine.begin() as conn:
+            conn.execute(insert(User), [
+                {"id": user_id, "username": f"thief{user_id}", "level": level,
+                 "total_exp": level * 100 + rng.randint(0, 99), "completed_tasks": tasks_per_user}
+                for user_id, level in zip(ids, levels)
+            ])
+            conn.execute(insert(Stats), [
+                {"user_id": user_id, **{name: rng.randint(0, Stats.MAX_STAT) for name in Stats.STAT_NAMES}}
+                for user_id in ids
+            ])
+            conn.execute(insert(Task), [
+                {"user_id": user_id, "title": "Population", "category": rng.choice(CATEGORIES),
+                 "difficulty": rng.choice(DIFFICULTIES), "status": TaskStatus.COMPLETED.value}
+                for user_id in ids for _ in range(tasks_per_user)
+            ])
+
+
+def orm_aggregates(db) -> dict:
+    """The same aggregates computed over ORM objects, one user at a time."""
+    columns = {name: [] for name in Stats.STAT_NAMES}
+    levels = Counter()
+    for user, stats in db.execute(select(User, Stats).outerjoin(Stats, Stats.user_id == User.id)):
+        levels[user.level or 1] += 1
+        for name in Stats.STAT_NAMES:
+            columns[name].append(getattr(stats, name) or 0 if stats else 0)
+    
+    percentiles, distributions = {}, {}
+    for name, values in columns.items():
+        values.sort()
+        percentiles[name] = {p: float(np.percentile(values, p)) for p in PERCENTILES}
+        counts = [0] * STAT_BINS
+        for value in values:
+            counts[min(STAT_BINS - 1, value * STAT_BINS // (Stats.MAX_STAT + 1))] += 1
+        distributions[name] = counts
+    
+    mix = Counter()
+    for task in db.scalars(select(Task).where(Task.status == TaskStatus.COMPLETED.value)):
+        mix[task.difficulty, task.category] += 1
+    shares = {}
+    for difficulty in DIFFICULTIES:
+        total = sum(mix[difficulty, category] for category in CATEGORIES)
+        shares[difficulty] = {
+            category: mix[difficulty, category] / total if total else 0.0 for category in CATEGORIES
+        }
+    
+    return {
+        "percentiles": percentiles,
+        "distributions": distributions,
+        "levels": dict(sorted(levels.items())),
+        "shares": shares
+    }
+
+
+def numpy_aggregates(conn) -> tuple[dict, dict]:
+    """Aggregates from PopulationStats, with the seconds spent loading and computing."""
+    with Timer() as load:
+        population = PopulationStats.load(conn)
+    with Timer() as compute:
+        result = {
+            "percentiles": population.stat_percentiles(),
+            "distributions": population.stat_distributions(),
+            "levels": population.level_histogram(),
+            "shares": population.category_shares()
+        }
+    return result, {"load": load.elapsed, "compute": compute.elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--tasks-per-user", type=int, default=5)
+    args = parser.parse_args()
+    
+    engine, session_factory, path = create_temp_database()
+    try:
+        with console.status(f"Seeding {args.users} users..."):
+            seed_population(engine, args.users, args.tasks_per_user)
+        
+        db = session_factory()
+        with Timer() as orm_timer:
+            expected = orm_aggregates(db)
+        db.close()
+        
+        with engine.connect() as conn:
+            actual, seconds = numpy_aggregates(conn)
+        assert actual == expected, "NumPy aggregates differ from the ORM loop"
+        
+        numpy_total = seconds["load"] + seconds["compute"]
+        print_results(
+            f"Population analytics, {args.users} users, {args.users * args.tasks_per_user} completed tasks",
+            ["Method", "Load ms", "Compute ms", "Total ms", "Speedup"],
+            [
+                ["ORM loop", "-", "-", f"{orm_timer.elapsed * 1000:.0f}", "1.0x"],
+                ["NumPy (PopulationStats)", f"{seconds['load'] * 1000:.0f}", f"{seconds['compute'] * 1000:.1f}",
+                 f"{numpy_total * 1000:.0f}", f"{orm_timer.elapsed / numpy_total:.1f}x"]
+            ]
+        )
+    finally:
+        drop_temp_database(engine, path)
+
+
+if __name__ == "__main__":
+    main()
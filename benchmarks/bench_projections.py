@@ -0,0 +1,66 @@
+"""Benchmark list view loading: tracked ORM objects vs TaskRow projections.
+
+Usage: python -m benchmarks.bench_projections [--tasks N]
+"""
+import argparse
+import gc
+import tracemalloc
+from core.game_loop import GameState
+from benchmarks.common import (
+    create_temp_database, drop_temp_database, seed_user, Timer, print_results
+)
+
+
+def measure(session_factory, user, projection: bool) -> tuple[float, float]:
+    """Return (seconds, retained MiB) for loading every pending task."""
+    db = session_factory()
+    game_state = GameState(db)
+    game_state.current_user = db.merge(user)
+    gc.collect()
+    
+    with Timer() as timer:
+        tasks = game_state.get_pending_tasks(projection=projection)
+    
+    # Memory in a separate pass: tracemalloc slows allocation-heavy code
+    db.close()
+    db = session_factory()
+    game_state = GameState(db)
+    game_state.current_user = db.merge(user)
+    del tasks
+    gc.collect()
+    tracemalloc.start()
+    tasks = game_state.get_pending_tasks(projection=projection)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    return timer.elapsed, retained / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+    
+    engine, session_factory, path = create_temp_database()
+    try:
+        db = session_factory()
+        user = seed_user(db, "joker", pending_tasks=args.tasks)
+        db.close()
+        
+        orm_seconds, orm_mib = measure(session_factory, user, projection=False)
+        row_seconds, row_mib = measure(session_factory, user, projection=True)
+        print_results(
+            f"Loading {args.tasks:,} pending tasks",
+            ["Method", "Seconds", "Retained MiB"],
+            [
+                ["ORM Task objects", f"{orm_seconds:.2f}", f"{orm_mib:.1f}"],
+                ["TaskRow projections", f"{row_seconds:.2f}", f"{row_mib:.1f}"],
+                ["Ratio", f"{orm_seconds / row_seconds:.1f}x", f"{orm_mib / row_mib:.1f}x"],
+            ]
+        )
+    finally:
+        drop_temp_database(engine, path)
+
+
+if __name__ == "__main__":
+    main()
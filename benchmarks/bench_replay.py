@@ -0,0 +1,103 @@
+"""Benchmark rebuilding derived state from completed tasks.
+
+Compares a per-task ORM replay with ReplayEngine run serially, in a
+process pool, and resumed from snapshots after a few new completions.
+
+Usage: python -m benchmarks.bench_replay [--users N] [--tasks M] [--workers W]
+"""
+import argparse
+import os
+from datetime import datetime
+from sqlalchemy import update
+from core.replay import ReplayEngine, replay_all
+from core.stats_engine import StatsEngine
+from models.stats import Stats
+from models.task import Task, TaskStatus
+from models.user import User
+from benchmarks.common import (
+    console, create_temp_database, drop_temp_database, seed_user, Timer, print_results
+)
+
+
+def orm_replay(session_factory, user_ids: list[int]) -> dict:
+    """Reference replay: walk every completed task as an ORM object."""
+    db = session_factory()
+    totals = {}
+    for user_id in user_ids:
+        stats = dict.fromkeys(Stats.STAT_NAMES, 0)
+        total_exp = 0
+        for task in db.query(Task).filter(Task.user_id == user_id, Task.status == TaskStatus.COMPLETED.value):
+            stat = StatsEngine.STAT_BOOST_MAP.get(task.category, "knowledge")
+            stats[stat] = min(Stats.MAX_STAT, stats[stat] + StatsEngine.DIFFICULTY_BOOST_MAP.get(task.difficulty, 1))
+            total_exp += Task.exp_reward_for(task.difficulty)
+        totals[user_id] = total_exp
+        db.expunge_all()
+    db.close()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=50_000, help="Completed tasks per user")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    
+    engine, session_factory, path = create_temp_database()
+    try:
+        db = session_factory()
+        with console.status(f"Seeding {args.users} users x {args.tasks:,} completed tasks..."):
+            user_ids = [
+                seed_user(db, f"thief{i}", palaces=2, pending_tasks=100, completed_tasks=args.tasks).id
+                for i in range(args.users)
+            ]
+        db.close()
+        url = str(engine.url)
+        
+        with Timer() as orm_timer:
+            expected = orm_replay(session_factory, user_ids)
+        
+        db = session_factory()
+        with Timer() as serial_timer:
+            reports = [ReplayEngine.replay_user(db, user_id, resume=False) for user_id in user_ids]
+        db.close()
+        mismatches = sum(report["total_exp"] != expected[report["user_id"]] for report in reports)
+        
+        with Timer() as pool_timer:
+            replay_all(user_ids, workers=args.workers, database_url=url, resume=False)
+        
+        # Complete 1% more tasks per user, then resume from the snapshots
+        db = session_factory()
+        for user_id in user_ids:
+            pending = [task_id for (task_id,) in db.query(Task.id).filter(
+                Task.user_id == user_id, Task.status == TaskStatus.PENDING.value
+            ).limit(max(1, args.tasks // 100))]
+            db.execute(update(Task).where(Task.id.in_(pending)).values(
+                status=TaskStatus.COMPLETED.value, completed_at=datetime.now()
+            ))
+        db.commit()
+        with Timer() as resume_timer:
+            reports = [ReplayEngine.replay_user(db, user_id) for user_id in user_ids]
+        db.close()
+        
+        total = args.users * args.tasks
+        print_results(
+            f"Replay of {args.users} users x {args.tasks:,} completed tasks",
+            ["Method", "Seconds", "Tasks/sec"],
+            [
+                ["ORM, task by task", f"{orm_timer.elapsed:.2f}", f"{total / orm_timer.elapsed:,.0f}"],
+                ["ReplayEngine, serial", f"{serial_timer.elapsed:.2f}", f"{total / serial_timer.elapsed:,.0f}"],
+                [f"ReplayEngine, {args.workers} process(es)", f"{pool_timer.elapsed:.2f}", f"{total / pool_timer.elapsed:,.0f}"],
+                ["Resume from snapshots (+1%)", f"{resume_timer.elapsed:.2f}", "-"],
+            ]
+        )
+        if mismatches:
+            console.print(f"[bold red]❌ {mismatches} user(s) differ from the ORM replay[/bold red]")
+        replayed = sum(report["replayed"] for report in reports)
+        console.print(f"[dim]Resumed replays counted {replayed:,} new task(s)[/dim]")
+    finally:
+        drop_temp_database(engine, path)
+
+
+if __name__ == "__main__":
+    main()
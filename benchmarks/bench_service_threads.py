@@ -0,0 +1,96 @@
+"""Stress test GameService from a thread pool.
+
+N threads each complete M tasks for users shared between threads, then the
+final EXP, levels and stats are checked against the completed tasks.
+Throughput is reported for each thread count.
+
+Usage: python -m benchmarks.bench_service_threads [--threads 1 2 4 8] [--completions M]
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from core.service import GameService
+from core.stats_engine import StatsEngine
+from models.stats import Stats
+from models.task import Task
+from benchmarks.common import (
+    CATEGORIES, DIFFICULTIES, console, create_temp_database, drop_temp_database, Timer, print_results
+)
+
+
+def worker(service: GameService, user_id: int, task_ids: list[int]) -> int:
+    """Complete the given tasks one by one."""
+    for task_id in task_ids:
+        service.complete_task(user_id, task_id)
+    return len(task_ids)
+
+
+def run(threads: int, completions: int, users: int) -> tuple[float, int]:
+    """Return (completions/sec, inconsistent users) for one thread count."""
+    engine, _, path = create_temp_database()
+    try:
+        service = GameService(engine)
+        user_ids = [service.create_user(f"thief{i}").id for i in range(users)]
+        
+        jobs = []
+        expected = {user_id: {"exp": 0, "tasks": 0, "stats": dict.fromkeys(Stats.STAT_NAMES, 0)} for user_id in user_ids}
+        for t in range(threads):
+            user_id = user_ids[t % users]
+            task_ids = []
+            for i in range(completions):
+                difficulty = DIFFICULTIES[(t + i) % len(DIFFICULTIES)]
+                task = service.create_task(user_id, f"Mission {t}-{i}", CATEGORIES[i % len(CATEGORIES)], difficulty)
+                task_ids.append(task.id)
+                stat = StatsEngine.STAT_BOOST_MAP[CATEGORIES[i % len(CATEGORIES)]]
+                expected[user_id]["exp"] += Task.EXP_REWARD_MAP[difficulty]
+                expected[user_id]["stats"][stat] += StatsEngine.DIFFICULTY_BOOST_MAP[difficulty]
+                expected[user_id]["tasks"] += 1
+            jobs.append((user_id, task_ids))
+        
+        with Timer() as timer:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                done = sum(pool.map(lambda job: worker(service, *job), jobs))
+        
+        inconsistent = 0
+        for user_id, totals in expected.items():
+            user = service.get_user_by_id(user_id)
+            stats = service.get_user_stats(user_id)
+            if (
+                user.total_exp != totals["exp"]
+                or user.level != totals["exp"] // 100 + 1
+                or user.completed_tasks != totals["tasks"]
+                or any(
+                    stats[name.title()] != min(value, Stats.MAX_STAT)
+                    for name, value in totals["stats"].items()
+                )
+            ):
+                inconsistent += 1
+        return done / timer.elapsed, inconsistent
+    finally:
+        drop_temp_database(engine, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--completions", type=int, default=100, help="Completions per thread")
+    parser.add_argument("--users", type=int, default=4, help="Users shared by the threads")
+    args = parser.parse_args()
+    
+    rows = []
+    baseline = None
+    for threads in args.threads:
+        throughput, inconsistent = run(threads, args.completions, min(args.users, threads))
+        baseline = baseline or throughput
+        rows.append([threads, f"{throughput:,.0f}", f"{throughput / baseline:.2f}x", inconsistent])
+    
+    print_results(
+        f"GameService thread scaling ({args.completions} completions per thread)",
+        ["Threads", "Completions/sec", "Scaling", "Inconsistent users"],
+        rows
+    )
+    if any(row[3] for row in rows):
+        console.print("[bold red]❌ Final state does not match the completed tasks[/bold red]")
+
+
+if __name__ == "__main__":
+    main()
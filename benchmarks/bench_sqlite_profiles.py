@@ -0,0 +1,99 @@
+"""Benchmark SQLite performance profiles.
+
+Measures single-writer commit throughput, then read latency of a hot query
+while a writer thread keeps committing.
+
+Usage: python -m benchmarks.bench_sqlite_profiles [--writes N] [--seconds S]
+"""
+import argparse
+import statistics
+import threading
+import time
+from core.game_loop import GameState
+from db.database import PERFORMANCE_PROFILES
+from models.user import User
+from benchmarks.common import (
+    create_temp_database, drop_temp_database, seed_user, Timer, print_results
+)
+
+
+def write_throughput(session_factory, user_id: int, writes: int) -> float:
+    """Return committed task creations per second."""
+    db = session_factory()
+    game_state = GameState(db)
+    game_state.current_user = db.get(User, user_id)
+    with Timer() as timer:
+        for i in range(writes):
+            game_state.create_task(f"Write {i}", "Knowledge", "Easy")
+    db.close()
+    return writes / timer.elapsed
+
+
+def concurrent_read_latency(session_factory, user_id: int, seconds: float) -> list[float]:
+    """Return read latencies (ms) measured while another thread writes."""
+    stop = threading.Event()
+    
+    def writer():
+        db = session_factory()
+        game_state = GameState(db)
+        game_state.current_user = db.get(User, user_id)
+        while not stop.is_set():
+            game_state.create_task("Background write", "Guts", "Medium")
+        db.close()
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    
+    latencies = []
+    db = session_factory()
+    game_state = GameState(db)
+    game_state.current_user = db.get(User, user_id)
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        with Timer() as timer:
+            game_state.list_tasks(limit=20)
+            db.rollback()  # End the read transaction so the next read sees new rows
+        latencies.append(timer.elapsed * 1000)
+    db.close()
+    
+    stop.set()
+    thread.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    
+    rows = []
+    for profile in PERFORMANCE_PROFILES:
+        engine, session_factory, path = create_temp_database(profile=profile)
+        try:
+            db = session_factory()
+            user_id = seed_user(db, "bench", pending_tasks=1000).id
+            db.close()
+            
+            throughput = write_throughput(session_factory, user_id, args.writes)
+            latencies = sorted(concurrent_read_latency(session_factory, user_id, args.seconds))
+            p95 = latencies[int(len(latencies) * 0.95)]
+            rows.append([
+                profile,
+                f"{throughput:,.0f}",
+                f"{statistics.median(latencies):.2f}",
+                f"{p95:.2f}",
+                f"{latencies[-1]:.2f}"
+            ])
+        finally:
+            drop_temp_database(engine, path)
+    
+    print_results(
+        "SQLite profiles",
+        ["Profile", "Commits/sec", "Read p50 (ms)", "Read p95 (ms)", "Read max (ms)"],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Shared helpers for benchmark scripts."""
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+from rich.console import Console
+from rich.table import Table
+from db.database import Base, create_db_engine
+from models.user import User
+from models.task import Task, TaskCategory, TaskDifficulty, TaskStatus
+from models.palace import Palace, PalaceStatus
+
+console = Console()
+
+CATEGORIES = [cat.value for cat in TaskCategory]
+DIFFICULTIES = [diff.value for diff in TaskDifficulty]
+
+
+def create_temp_database(path: Optional[str] = None, profile: Optional[str] = None, migrate: bool = False):
+    """Create an on-disk SQLite database with all tables.
+    
+    Tables come from the ORM models, or from db/migrations with
+    ``migrate=True`` to get the schema real databases have.
+    Returns ``(engine, session_factory, path)``.
+    """
+    import models  # noqa: F401  registers every model on Base
+    
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="phantom_bench_", suffix=".db")
+        os.close(fd)
+    
+    engine = create_db_engine(f"sqlite:///{path}", profile)
+    if migrate:
+        from db.migrate import upgrade
+        upgrade(engine)
+    else:
+        Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return engine, session_factory, path
+
+
+def drop_temp_database(engine, path: str):
+    """Dispose the engine and delete the database files."""
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def seed_user(
+    db: Session,
+    username: str,
+    palaces: int = 0,
+    pending_tasks: int = 0,
+    completed_tasks: int = 0
+) -> User:
+    """Create a user with synthetic palaces and tasks using bulk inserts."""
+    user = User(username=username)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    
+    if palaces:
+        db.execute(insert(Palace), [{
+            "user_id": user.id,
+            "name": f"Palace {i}",
+            "status": PalaceStatus.ACTIVE.value,
+            "infiltration_percentage": 0.0
+        } for i in range(palaces)])
+    
+    rows = []
+    now = datetime.now()
+    for i in range(pending_tasks + completed_tasks):
+        completed = i >= pending_tasks
+        difficulty = DIFFICULTIES[i % len(DIFFICULTIES)]
+        rows.append({
+            "user_id": user.id,
+            "title": f"Mission {i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "difficulty": difficulty,
+            "status": TaskStatus.COMPLETED.value if completed else TaskStatus.PENDING.value,
+            "exp_reward": 10,
+            "completed_at": now if completed else None
+        })
+        if len(rows) >= 10_000:
+            db.execute(insert(Task), rows)
+            rows = []
+    if rows:
+        db.execute(insert(Task), rows)
+    
+    user.completed_tasks = completed_tasks
+    db.commit()
+    return user
+
+
+class Timer:
+    """Context manager measuring wall-clock time."""
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+        return self
+    
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        return False
+
+
+def print_results(title: str, columns: list[str], rows: list[list]):
+    """Print benchmark results as a Rich table."""
+    table = Table(title=title, show_header=True, header_style="bold cyan")
+    for column in columns:
+        table.add_column(column)
+    for row in rows:
+        table.add_row(*[str(value) for value in row])
+    console.print(table)
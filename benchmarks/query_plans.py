@@ -0,0 +1,156 @@
+"""Query-plan regression check and timings for hot queries.
+
+Runs EXPLAIN QUERY PLAN on the SQL each hot query actually emits, against a
+database built by db/migrations, and fails if any of them scans a table or
+sorts through a temporary B-tree. tests/test_query_plans.py runs the same
+check under pytest.
+
+Usage:
+    python -m benchmarks.query_plans                    # plan check, exit 1 on regression
+    python -m benchmarks.query_plans --tasks 1000000    # plus timings with/without indexes
+"""
+import argparse
+import sys
+from datetime import date
+from sqlalchemy import event
+from core.game_loop import GameState
+from core.palace_engine import PalaceEngine
+from core.event_log import EventLog
+from db.database import Base
+from benchmarks.common import (
+    console, create_temp_database, drop_temp_database, seed_user, Timer, print_results
+)
+
+HOT_QUERIES = {
+    "GameState.get_pending_tasks": lambda gs: gs.get_pending_tasks(),
+    "GameState.list_tasks": lambda gs: gs.list_tasks(after=("9999-12-31", 0)),
+    "GameState.list_tasks (previous page)": lambda gs: gs.list_tasks(before=("2000-01-01", 0)),
+    "GameState.get_overdue_tasks": lambda gs: gs.get_overdue_tasks(limit=20, after=(date(2000, 1, 1), 0)),
+    "GameState.count_overdue_tasks": lambda gs: gs.count_overdue_tasks(),
+    "PalaceEngine.get_active_palaces": lambda gs: PalaceEngine.get_active_palaces(gs.db, gs.current_user.id),
+    "PalaceEngine.get_completed_palaces": lambda gs: PalaceEngine.get_completed_palaces(gs.db, gs.current_user.id),
+    "PalaceEngine.count_completed_tasks": lambda gs: PalaceEngine.count_completed_tasks(gs.db, gs.current_user.id),
+    "EventLog.get_history": lambda gs: EventLog.get_history(gs.db, gs.current_user.id, "exp"),
+}
+
+
+def seed_game_state(db, users: int, tasks_per_user: int) -> GameState:
+    """Seed users with palaces and tasks; returns a GameState on the last one.
+    
+    Many users make the planner prefer the per-user indexes, as it would on
+    a real database.
+    """
+    for i in range(users):
+        user = seed_user(
+            db, f"thief{i}", palaces=3,
+            pending_tasks=tasks_per_user // 2, completed_tasks=tasks_per_user - tasks_per_user // 2
+        )
+    game_state = GameState(db)
+    game_state.current_user = user
+    return game_state
+
+
+def capture_statements(engine, func) -> list[tuple]:
+    """Run func and return the (sql, parameters) pairs it sent to the engine."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+    
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def explain(engine, statement: str, parameters) -> list[str]:
+    """Return the detail column of EXPLAIN QUERY PLAN."""
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in rows]
+
+
+def find_regressions(plan: list[str]) -> list[str]:
+    """Return plan steps that indicate a full scan or an unindexed sort."""
+    return [step for step in plan if step.startswith("SCAN") or "TEMP B-TREE" in step]
+
+
+def query_plans(engine, game_state: GameState, name: str) -> list[list[str]]:
+    """Return the plan of every statement a hot query sends."""
+    query = HOT_QUERIES[name]
+    return [
+        explain(engine, statement, parameters)
+        for statement, parameters in capture_statements(engine, lambda: query(game_state))
+    ]
+
+
+def check_plans(engine, game_state: GameState) -> list[list]:
+    """Return one result row per hot query statement."""
+    rows = []
+    for name in HOT_QUERIES:
+        for plan in query_plans(engine, game_state, name):
+            regressions = find_regressions(plan)
+            rows.append([name, "; ".join(plan), "FAIL" if regressions else "ok"])
+    return rows
+
+
+def time_queries(engine, game_state: GameState, repeat: int) -> dict[str, float]:
+    """Return mean milliseconds per hot query, measured on the raw SQL."""
+    timings = {}
+    for name, query in HOT_QUERIES.items():
+        statements = capture_statements(engine, lambda: query(game_state))
+        with engine.connect() as conn:
+            with Timer() as timer:
+                for _ in range(repeat):
+                    for statement, parameters in statements:
+                        conn.exec_driver_sql(statement, parameters).all()
+        timings[name] = timer.elapsed / repeat * 1000
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=0, help="Synthetic tasks for timings")
+    parser.add_argument("--tasks-per-user", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    engine, session_factory, path = create_temp_database(migrate=True)
+    try:
+        db = session_factory()
+        users = max(20, args.tasks // args.tasks_per_user)
+        per_user = args.tasks_per_user if args.tasks else 50
+        with console.status(f"Seeding {users * per_user:,} tasks..."):
+            game_state = seed_game_state(db, users, per_user)
+        
+        rows = check_plans(engine, game_state)
+        print_results("Hot query plans", ["Query", "Plan", "Result"], rows)
+        failed = [row for row in rows if row[2] == "FAIL"]
+        
+        if args.tasks:
+            indexed = time_queries(engine, game_state, args.repeat)
+            with engine.begin() as conn:
+                for table in Base.metadata.sorted_tables:
+                    for index in table.indexes:
+                        index.drop(conn)
+            unindexed = time_queries(engine, game_state, args.repeat)
+            print_results(
+                f"Hot query timings ({users * per_user:,} tasks, {users:,} users)",
+                ["Query", "No indexes (ms)", "Indexed (ms)", "Speedup"],
+                [[name, f"{unindexed[name]:.3f}", f"{indexed[name]:.3f}",
+                  f"{unindexed[name] / indexed[name]:.1f}x"] for name in HOT_QUERIES]
+            )
+        db.close()
+    finally:
+        drop_temp_database(engine, path)
+    
+    if failed:
+        console.print(f"[bold red]❌ {len(failed)} hot query plan(s) regressed to a scan[/bold red]")
+        sys.exit(1)
+    console.print("[bold green]✅ All hot queries use indexes[/bold green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Cold start check for app.py, based on ``python -X importtime``.
+
+Imports app in fresh interpreters and fails if the median import time
+exceeds the budget or if a module that should load lazily (matplotlib,
+numpy) is imported at startup. Also times init_db migrating an empty
+database and on an up-to-date one.
+
+Usage:
+    python -m benchmarks.startup                  # exit 1 on regression
+    python -m benchmarks.startup --budget-ms 600 --runs 9
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from benchmarks.common import (
+    console, drop_temp_database, Timer, print_results
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ("matplotlib", "numpy")
+DEFAULT_BUDGET_MS = 750
+
+
+def import_times(module: str = "app") -> dict[str, tuple[int, int]]:
+    """Import module in a fresh interpreter; map each import to (self, cumulative) µs."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def time_init_db() -> tuple[float, float]:
+    """Return init_db seconds on a fresh database and on an up-to-date one."""
+    from db.database import create_db_engine, init_db
+    fd, path = tempfile.mkstemp(prefix="phantom_bench_", suffix=".db")
+    os.close(fd)
+    # Start from an empty file, unlike create_temp_database
+    engine = create_db_engine(f"sqlite:///{path}")
+    try:
+        with Timer() as create_timer:
+            init_db(engine)
+        with Timer() as skip_timer:
+            init_db(engine)
+    finally:
+        drop_temp_database(engine, path)
+    return create_timer.elapsed, skip_timer.elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    
+    runs = [import_times() for _ in range(args.runs)]
+    median_ms = statistics.median(times["app"][1] for times in runs) / 1000
+    last = runs[-1]
+    
+    slowest = sorted(last.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    print_results(
+        "Slowest imports (self time, last run)",
+        ["Module", "Self (ms)", "Cumulative (ms)"],
+        [[name, f"{self_us / 1000:.1f}", f"{cumulative_us / 1000:.1f}"] for name, (self_us, cumulative_us) in slowest]
+    )
+    
+    create_seconds, skip_seconds = time_init_db()
+    print_results(
+        "Startup",
+        ["Step", "ms"],
+        [
+            [f"import app (median of {args.runs})", f"{median_ms:.1f}"],
+            ["init_db, new schema", f"{create_seconds * 1000:.1f}"],
+            ["init_db, schema up to date", f"{skip_seconds * 1000:.1f}"],
+        ]
+    )
+    
+    failures = []
+    eager = sorted({name.split(".")[0] for name in last} & set(LAZY_MODULES))
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+    if median_ms > args.budget_ms:
+        failures.append(f"import app took {median_ms:.0f} ms, budget {args.budget_ms:.0f} ms")
+    
+    if failures:
+        for failure in failures:
+            console.print(f"[bold red]❌ {failure}[/bold red]")
+        sys.exit(1)
+    console.print(f"[bold green]✅ Cold start within budget ({median_ms:.0f}/{args.budget_ms:.0f} ms)[/bold green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Asyncio game state for serving concurrent clients."""
+from functools import partial
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from models.user import User
+from models.task import Task
+from models.palace import Palace
+from core.game_loop import GameState
+from core.palace_engine import PalaceEngine
+from db.database import create_async_session_factory
+from datetime import date
+from typing import Callable, Optional
+
+
+class AsyncGameState:
+    """Async counterpart of GameState.
+    
+    Every operation takes a user_id and runs in its own AsyncSession, so any
+    number of coroutines can share one instance. The game logic is the
+    synchronous GameState, run on the session's connection via ``run_sync``.
+    """
+    
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory or create_async_session_factory()
+    
+    async def _run(self, user_id: Optional[int], operation: Callable, write: bool = True):
+        """Run operation(game_state) in a fresh session."""
+        async with self.session_factory() as session:
+            if write:
+                # Take the write lock up front: upgrading a read transaction
+                # fails immediately when another writer committed meanwhile
+                await session.execute(text("BEGIN IMMEDIATE"))
+            return await session.run_sync(partial(self._call, user_id, operation))
+    
+    @staticmethod
+    def _call(user_id: Optional[int], operation: Callable, db: Session):
+        game_state = GameState(db)
+        if user_id is not None:
+            game_state.current_user = db.get(User, user_id)
+            if not game_state.current_user:
+                raise ValueError("User not found")
+        return operation(game_state)
+    
+    async def create_user(self, username: str) -> User:
+        """Create a new user."""
+        return await self._run(None, lambda gs: gs.create_user(username))
+    
+    async def load_user(self, username: str) -> Optional[User]:
+        """Load an existing user."""
+        return await self._run(None, lambda gs: gs.load_user(username), write=False)
+    
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        """Get user by ID."""
+        return await self._run(None, lambda gs: gs.get_user_by_id(user_id), write=False)
+    
+    async def create_task(
+        self,
+        user_id: int,
+        title: str,
+        category: str,
+        difficulty: str,
+        description: str = "",
+        deadline: Optional[date] = None
+    ) -> Task:
+        """Create a new task."""
+        return await self._run(
+            user_id,
+            lambda gs: gs.create_task(title, category, difficulty, description, deadline)
+        )
+    
+    async def complete_task(self, user_id: int, task_id: int) -> dict:
+        """Complete a task and update stats/exp."""
+        return await self._run(user_id, lambda gs: gs.complete_task(task_id))
+    
+    async def complete_tasks(self, user_id: int, task_ids: list[int]) -> list[dict]:
+        """Complete many tasks in one transaction."""
+        return await self._run(user_id, lambda gs: gs.complete_tasks(task_ids))
+    
+    async def create_palace(
+        self,
+        user_id: int,
+        name: str,
+        description: str = "",
+        boss_name: str = "",
+        deadline: Optional[date] = None
+    ) -> Palace:
+        """Create a new palace."""
+        return await self._run(
+            user_id,
+            lambda gs: gs.create_palace(name, description, boss_name, deadline)
+        )
+    
+    async def get_pending_tasks(self, user_id: int, projection: bool = False) -> list[Task]:
+        """Get all pending tasks for a user."""
+        return await self._run(user_id, lambda gs: gs.get_pending_tasks(projection), write=False)
+    
+    async def get_overdue_tasks(self, user_id: int, **kwargs) -> list[Task]:
+        """Get overdue tasks; accepts the paging arguments of GameState."""
+        return await self._run(user_id, lambda gs: gs.get_overdue_tasks(**kwargs), write=False)
+    
+    async def count_overdue_tasks(self, user_id: int) -> int:
+        """Count overdue tasks without loading them."""
+        return await self._run(user_id, lambda gs: gs.count_overdue_tasks(), write=False)
+    
+    async def list_tasks(self, user_id: int, **kwargs) -> dict:
+        """Get one page of tasks; accepts the arguments of GameState.list_tasks."""
+        return await self._run(user_id, lambda gs: gs.list_tasks(**kwargs), write=False)
+    
+    async def get_active_palaces(self, user_id: int, projection: bool = False) -> list[Palace]:
+        """Get all active palaces for a user."""
+        return await self._run(
+            user_id,
+            lambda gs: PalaceEngine.get_active_palaces(gs.db, user_id, projection),
+            write=False
+        )
+    
+    async def get_completed_palaces(self, user_id: int, projection: bool = False) -> list[Palace]:
+        """Get all completed palaces for a user."""
+        return await self._run(
+            user_id,
+            lambda gs: PalaceEngine.get_completed_palaces(gs.db, user_id, projection),
+            write=False
+        )
+    
+    async def get_user_stats(self, user_id: int) -> Optional[dict]:
+        """Get a user's stats summary."""
+        return await self._run(user_id, lambda gs: gs.get_user_stats(), write=False)
@@ -0,0 +1,132 @@
+"""Cached per-user dashboard snapshots."""
+from datetime import date
+from typing import Optional
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from models.user import User
+from models.task import Task, TaskStatus
+from models.palace import Palace, PalaceStatus
+from models.stats import Stats
+from models.projections import TaskRow, PalaceRow
+from core.stats_engine import StatsEngine
+
+RECENT_PENDING_LIMIT = 5
+
+
+class DashboardSnapshot:
+    """Everything the dashboard shows for one user, detached from the session.
+    
+    Tasks and palaces are read-only projection rows, so reading a snapshot
+    never touches the database, even after the session commits.
+    """
+    
+    def __init__(
+        self,
+        user_id: int,
+        username: str,
+        level: int,
+        total_exp: int,
+        stats: dict,
+        pending_count: int,
+        overdue_count: int,
+        recent_pending: list[TaskRow],
+        active_palaces: list[PalaceRow]
+    ):
+        self.user_id = user_id
+        self.username = username
+        self.level = level
+        self.total_exp = total_exp
+        self.stats = stats
+        self.pending_count = pending_count
+        self.overdue_count = overdue_count
+        self.recent_pending = recent_pending
+        self.active_palaces = active_palaces
+        self.built_on = date.today()
+    
+    def __repr__(self):
+        return f"<DashboardSnapshot(user_id={self.user_id}, pending={self.pending_count}, palaces={len(self.active_palaces)})>"
+    
+    @classmethod
+    def build(cls, db: Session, user_id: int) -> Optional["DashboardSnapshot"]:
+        """Build a snapshot with four queries. Never inserts a Stats row."""
+        stat_columns = [getattr(Stats, name) for name in Stats.STAT_NAMES]
+        user_row = db.execute(
+            select(User.username, User.level, User.total_exp, *stat_columns)
+            .outerjoin(Stats, Stats.user_id == User.id)
+            .where(User.id == user_id)
+        ).first()
+        if user_row is None:
+            return None
+        
+        # Pending and overdue counts from one pass over the covering index
+        pending_count, overdue_count = db.execute(
+            select(
+                func.count(Task.id),
+                func.coalesce(func.sum(case((Task.deadline < date.today(), 1), else_=0)), 0)
+            ).where(Task.user_id == user_id, Task.status == TaskStatus.PENDING.value)
+        ).one()
+        
+        recent_pending = [
+            TaskRow._make(row) for row in db.execute(
+                select(*TaskRow.columns())
+                .where(Task.user_id == user_id, Task.status == TaskStatus.PENDING.value)
+                .order_by(Task.deadline.asc())
+                .limit(RECENT_PENDING_LIMIT)
+            )
+        ]
+        active_palaces = [
+            PalaceRow._make(row) for row in db.execute(
+                select(*PalaceRow.columns())
+                .where(Palace.user_id == user_id, Palace.status == PalaceStatus.ACTIVE)
+            )
+        ]
+        
+        stats = Stats(**{name: getattr(user_row, name) or 0 for name in Stats.STAT_NAMES})
+        return cls(
+            user_id=user_id,
+            username=user_row.username,
+            level=user_row.level,
+            total_exp=user_row.total_exp,
+            stats=StatsEngine.get_stats_summary(stats),
+            pending_count=pending_count,
+            overdue_count=overdue_count,
+            recent_pending=recent_pending,
+            active_palaces=active_palaces
+        )
+
+
+class DashboardCache:
+    """Per-user DashboardSnapshot cache with hit/miss counters.
+    
+    Entries live until invalidated, or until the day changes since overdue
+    counts depend on today's date. Writers must call invalidate(user_id).
+    """
+    
+    def __init__(self):
+        self._snapshots: dict[int, DashboardSnapshot] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, db: Session, user_id: int) -> Optional[DashboardSnapshot]:
+        """Get a user's snapshot, building it on a miss."""
+        snapshot = self._snapshots.get(user_id)
+        if snapshot is not None and snapshot.built_on == date.today():
+            self.hits += 1
+            return snapshot
+        
+        self.misses += 1
+        snapshot = DashboardSnapshot.build(db, user_id)
+        if snapshot is not None:
+            self._snapshots[user_id] = snapshot
+        return snapshot
+    
+    def invalidate(self, user_id: Optional[int] = None):
+        """Drop one user's snapshot, or every snapshot."""
+        if user_id is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(user_id, None)
+    
+    def info(self) -> dict:
+        """Get hit/miss counters and the number of cached snapshots."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._snapshots)}
@@ -0,0 +1,81 @@
+"""Append-only event log of progress changes, stored in progress_history."""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from models.progress_history import ProgressHistory
+
+# Session.info key holding the events of the open transaction
+BUFFER_KEY = "progress_events"
+
+
+class EventLog:
+    """Buffer progress events per session and write them in batches.
+    
+    Events are kept in memory until the session commits, then inserted
+    with one executemany inside that same transaction. A transaction that
+    ends any other way (rollback, close) drops them together with the
+    changes they describe.
+    """
+    
+    TASK_COMPLETED = "task_completed"
+    LEVEL_UP = "level_up"
+    PALACE_PROGRESS = "palace_progress"
+    
+    BATCH_SIZE = 1000  # Buffered events written early, still uncommitted
+    
+    @staticmethod
+    def record(
+        db: Session,
+        user_id: int,
+        stat_name: str,
+        old_value: Optional[int],
+        new_value: Optional[int],
+        reason: str
+    ):
+        """Buffer one change for the session's next commit."""
+        buffer = db.info.setdefault(BUFFER_KEY, [])
+        buffer.append({
+            "user_id": user_id,
+            "stat_name": stat_name,
+            "old_value": old_value,
+            "new_value": new_value,
+            "change_reason": reason,
+            "created_at": datetime.now()
+        })
+        if len(buffer) >= EventLog.BATCH_SIZE:
+            EventLog.flush(db)
+    
+    @staticmethod
+    def flush(db: Session) -> int:
+        """Insert buffered events in the current transaction. Returns the count."""
+        buffer = db.info.pop(BUFFER_KEY, None)
+        if not buffer:
+            return 0
+        db.execute(insert(ProgressHistory), buffer)
+        return len(buffer)
+    
+    @staticmethod
+    def pending(db: Session) -> int:
+        """Count events buffered but not yet written."""
+        return len(db.info.get(BUFFER_KEY, ()))
+    
+    @staticmethod
+    def get_history(db: Session, user_id: int, stat_name: str) -> list[ProgressHistory]:
+        """Get the changes of one stat for a user, oldest first."""
+        return db.query(ProgressHistory).filter(
+            ProgressHistory.user_id == user_id,
+            ProgressHistory.stat_name == stat_name
+        ).order_by(ProgressHistory.created_at, ProgressHistory.id).all()
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_before_commit(session: Session):
+    EventLog.flush(session)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_after_transaction_end(session: Session, transaction):
+    # Commits flushed the buffer already; rollback and close end here too
+    if transaction.parent is None:
+        session.info.pop(BUFFER_KEY, None)
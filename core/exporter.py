@@ -0,0 +1,135 @@
+"""Streaming export of users, tasks, palaces and stats to JSONL or CSV."""
+import csv
+import json
+import os
+import time
+from datetime import date, datetime
+from typing import Iterator, Optional
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from models.user import User
+from models.task import Task
+from models.palace import Palace
+from models.stats import Stats
+
+
+def _to_json(value):
+    """JSON encoder for date and datetime columns."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class DataExporter:
+    """Export tables as plain row tuples, streamed in chunks of yield_per rows."""
+    
+    TABLES = {
+        "users": User,
+        "tasks": Task,
+        "palaces": Palace,
+        "stats": Stats,
+    }
+    
+    def __init__(self, db: Session, yield_per: int = 5000):
+        self.db = db
+        self.yield_per = yield_per
+    
+    @staticmethod
+    def columns(table: str) -> list[str]:
+        """Get the exported column names of a table."""
+        return [column.name for column in DataExporter.TABLES[table].__table__.columns]
+    
+    def iter_rows(self, table: str, user_id: Optional[int] = None) -> Iterator[Row]:
+        """Stream a table's rows as tuples, optionally for a single user."""
+        model_table = self.TABLES[table].__table__
+        stmt = select(*model_table.columns).order_by(model_table.c.id)
+        if user_id is not None:
+            owner = model_table.c.id if table == "users" else model_table.c.user_id
+            stmt = stmt.where(owner == user_id)
+        
+        # Core rows skip ORM identity tracking; yield_per keeps a bounded buffer
+        yield from self.db.execute(stmt.execution_options(yield_per=self.yield_per))
+    
+    def _run(self, write_table, user_id: Optional[int]) -> dict:
+        """Export every table through write_table(name, rows) and time it."""
+        report = {"rows": {}, "seconds": 0.0, "rows_per_sec": 0.0}
+        start = time.perf_counter()
+        for table in self.TABLES:
+            report["rows"][table] = write_table(table, self.iter_rows(table, user_id))
+        report["seconds"] = time.perf_counter() - start
+        total = sum(report["rows"].values())
+        if report["seconds"]:
+            report["rows_per_sec"] = total / report["seconds"]
+        return report
+    
+    def export_jsonl(self, path: str, user_id: Optional[int] = None) -> dict:
+        """Export all tables to one JSONL file, one {"table": ..., ...} object per row."""
+        with open(path, "w", encoding="utf-8") as handle:
+            encode = json.JSONEncoder(default=_to_json, ensure_ascii=False).encode
+            
+            def write_table(table: str, rows: Iterator[Row]) -> int:
+                count = 0
+                keys = ["table", *self.columns(table)]
+                for row in rows:
+                    handle.write(encode(dict(zip(keys, (table, *row)))))
+                    handle.write("\n")
+                    count += 1
+                return count
+            
+            return self._run(write_table, user_id)
+    
+    def export_csv(self, directory: str, user_id: Optional[int] = None) -> dict:
+        """Export each table to <directory>/<table>.csv."""
+        os.makedirs(directory, exist_ok=True)
+        
+        def write_table(table: str, rows: Iterator[Row]) -> int:
+            count = 0
+            with open(os.path.join(directory, f"{table}.csv"), "w", newline="", encoding="utf-8") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(self.columns(table))
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+            return count
+        
+        return self._run(write_table, user_id)
+
+
+def main():
+    """Command line entry point for exports."""
+    import argparse
+    from db.database import SessionLocal, init_db
+    
+    parser = argparse.ArgumentParser(description="Export users, tasks, palaces and stats.")
+    parser.add_argument("output", help="JSONL file, or directory for CSV files")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--user", help="Only export this username")
+    parser.add_argument("--yield-per", type=int, default=5000)
+    args = parser.parse_args()
+    
+    init_db()
+    db = SessionLocal()
+    try:
+        user_id = None
+        if args.user:
+            user = db.query(User).filter(User.username == args.user).first()
+            if not user:
+                parser.error(f"User '{args.user}' not found")
+            user_id = user.id
+        
+        exporter = DataExporter(db, args.yield_per)
+        if args.format == "csv":
+            report = exporter.export_csv(args.output, user_id)
+        else:
+            report = exporter.export_jsonl(args.output, user_id)
+    finally:
+        db.close()
+    
+    rows = ", ".join(f"{count} {table}" for table, count in report["rows"].items())
+    print(f"✅ Exported {rows} to {args.output} in {report['seconds']:.2f}s "
+          f"({report['rows_per_sec']:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,20 @@
 """Main game loop and state management."""
+from sqlalchemy import String, update, case, or_, func, tuple_, type_coerce
 from sqlalchemy.orm import Session
 from models.user import User
 from models.task import Task, TaskStatus, TaskCategory, TaskDifficulty
 from models.palace import Palace
+from models.stats import Stats
+from models.projections import TaskRow
 from core.stats_engine import StatsEngine
 from core.palace_engine import PalaceEngine
+from core.dashboard_cache import DashboardCache, DashboardSnapshot
 from datetime import date, datetime
 from typing import Optional
 
+# Keeps IN (...) lists well below SQLite's bound-parameter limit
+ID_CHUNK_SIZE = 500
+
 
 class GameState:
     """Main game state manager."""
@@ -15,6 +22,7 @@ class GameState:
     def __init__(self, db: Session):
         self.db = db
         self.current_user: Optional[User] = None
+        self.dashboard_cache = DashboardCache()
     
     def create_user(self, username: str) -> User:
         """Create a new user."""
@@ -64,6 +72,7 @@ class GameState:
         task.calculate_exp_reward()
         self.db.add(task)
         self.db.commit()
+        self.dashboard_cache.invalidate(self.current_user.id)
         self.db.refresh(task)
         
         return task
@@ -84,30 +93,128 @@ class GameState:
         if task.status == TaskStatus.COMPLETED.value:
             return {"message": "Task already completed"}
         
-        # Complete task
-        task.complete()
+        # All stat, EXP and palace updates share one transaction and one commit
+        try:
+            task.complete()
+            stats_result = StatsEngine.process_task_completion(self.db, task, commit=False)
+            leveled_up = self.current_user.add_exp(task.exp_reward)
+            self.current_user.add_completed_tasks()
+            PalaceEngine.update_active_palaces(self.db, self.current_user.id, commit=False)
+            
+            # Build the result before committing so nothing needs reloading
+            result = {
+                "task": task.title,
+                "exp_gained": task.exp_reward,
+                "stat_boost": stats_result,
+                "leveled_up": leveled_up,
+                "new_level": self.current_user.level if leveled_up else None
+            }
+            self.db.commit()
+            self.dashboard_cache.invalidate(self.current_user.id)
+        except Exception:
+            self.db.rollback()
+            raise
         
-        # Process stats
-        stats_result = StatsEngine.process_task_completion(self.db, task)
+        return result
+    
+    def complete_tasks(self, task_ids: list[int]) -> list[dict]:
+        """Complete many tasks in one transaction with set-based updates.
         
-        # Add EXP to user
-        leveled_up = self.current_user.add_exp(task.exp_reward)
+        Returns one result per requested ID, in order, shaped like the
+        result of complete_task plus the task_id.
+        """
+        if not self.current_user:
+            raise ValueError("No user loaded")
         
-        # Update palace progress
-        palaces = PalaceEngine.get_active_palaces(self.db, self.current_user.id)
-        for palace in palaces:
-            PalaceEngine.update_palace_progress(self.db, palace)
+        user = self.current_user
+        unique_ids = list(dict.fromkeys(task_ids))
+        rows = {}
+        for start in range(0, len(unique_ids), ID_CHUNK_SIZE):
+            chunk = unique_ids[start:start + ID_CHUNK_SIZE]
+            for row in self.db.query(
+                Task.id, Task.title, Task.category, Task.difficulty, Task.status, Task.exp_reward
+            ).filter(Task.user_id == user.id, Task.id.in_(chunk)):
+                rows[row.id] = row
         
-        self.db.commit()
-        self.db.refresh(self.current_user)
+        missing = [task_id for task_id in unique_ids if task_id not in rows]
+        if missing:
+            raise ValueError(f"Tasks not found: {missing}")
+        
+        try:
+            stats = StatsEngine.get_or_create_stats(self.db, user.id, commit=False)
+            results = []
+            to_complete = []
+            seen = set()  # IDs in to_complete, for O(1) duplicate checks
+            
+            # Apply boosts and EXP in memory, task by task, so clamping and
+            # level-ups match complete_task; the rows are written once on commit
+            for task_id in task_ids:
+                row = rows[task_id]
+                if row.status == TaskStatus.COMPLETED.value or task_id in seen:
+                    results.append({"task_id": task_id, "message": "Task already completed"})
+                    continue
+                to_complete.append(task_id)
+                seen.add(task_id)
+                
+                stat_to_boost = StatsEngine.STAT_BOOST_MAP.get(row.category, "knowledge")
+                boost_amount = StatsEngine.DIFFICULTY_BOOST_MAP.get(row.difficulty, 1)
+                increased = StatsEngine.apply_boost(self.db, stats, stat_to_boost, boost_amount)
+                exp_reward = row.exp_reward or Task.exp_reward_for(row.difficulty)
+                leveled_up = user.add_exp(exp_reward)
+                
+                results.append({
+                    "task_id": task_id,
+                    "task": row.title,
+                    "exp_gained": exp_reward,
+                    "stat_boost": {
+                        "stat": stat_to_boost,
+                        "amount": boost_amount,
+                        "new_value": stats.get_stat(stat_to_boost),
+                        "increased": increased
+                    },
+                    "leveled_up": leveled_up,
+                    "new_level": user.level if leveled_up else None
+                })
+            
+            if to_complete:
+                self._mark_tasks_completed(to_complete)
+                user.add_completed_tasks(len(to_complete))
+                PalaceEngine.update_active_palaces(self.db, user.id, commit=False)
+            
+            self.db.commit()
+            self.dashboard_cache.invalidate(user.id)
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return results
+    
+    def _mark_tasks_completed(self, task_ids: list[int]):
+        """Mark tasks completed with set-based UPDATEs mirroring Task.complete."""
+        stat_boost = case(StatsEngine.STAT_BOOST_MAP, value=Task.category, else_="knowledge")
+        exp_reward = case(
+            (
+                or_(Task.exp_reward.is_(None), Task.exp_reward == 0),
+                case(Task.EXP_REWARD_MAP, value=Task.difficulty, else_=Task.DEFAULT_EXP_REWARD)
+            ),
+            else_=Task.exp_reward
+        )
+        completed_at = datetime.now()
         
-        return {
-            "task": task.title,
-            "exp_gained": task.exp_reward,
-            "stat_boost": stats_result,
-            "leveled_up": leveled_up,
-            "new_level": self.current_user.level if leveled_up else None
-        }
+        for start in range(0, len(task_ids), ID_CHUNK_SIZE):
+            chunk = task_ids[start:start + ID_CHUNK_SIZE]
+            # The session is committed right after, which expires stale objects
+            self.db.execute(
+                update(Task)
+                .where(Task.id.in_(chunk), Task.status != TaskStatus.COMPLETED.value)
+                .values(
+                    status=TaskStatus.COMPLETED.value,
+                    completed_at=completed_at,
+                    stat_boost=stat_boost,
+                    exp_reward=exp_reward
+                )
+                .execution_options(synchronize_session=False)
+            )
     
     def create_palace(
         self,
@@ -130,33 +237,144 @@ class GameState:
         
         self.db.add(palace)
         self.db.commit()
+        self.dashboard_cache.invalidate(self.current_user.id)
         self.db.refresh(palace)
         
         return palace
     
-    def get_pending_tasks(self) -> list[Task]:
-        """Get all pending tasks for current user."""
+    def get_dashboard(self) -> Optional[DashboardSnapshot]:
+        """Get the current user's dashboard, cached until the next write."""
+        if not self.current_user:
+            return None
+        return self.dashboard_cache.get(self.db, self.current_user.id)
+    
+    def get_pending_tasks(self, projection: bool = False) -> list[Task]:
+        """Get all pending tasks for current user.
+        
+        With ``projection=True`` returns read-only TaskRow tuples instead.
+        """
         if not self.current_user:
             return []
         
-        return self.db.query(Task).filter(
+        entities = TaskRow.columns() if projection else [Task]
+        rows = self.db.query(*entities).filter(
             Task.user_id == self.current_user.id,
             Task.status == TaskStatus.PENDING.value
         ).order_by(Task.deadline.asc()).all()
+        return [TaskRow._make(row) for row in rows] if projection else rows
+    
+    def list_tasks(
+        self,
+        limit: int = 20,
+        after: Optional[tuple[str, int]] = None,
+        before: Optional[tuple[str, int]] = None,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        projection: bool = False
+    ) -> dict:
+        """Get one page of the current user's tasks, newest first.
+        
+        Pages are keyed on (created_at, id): pass a page's ``next_cursor`` as
+        ``after`` for the following page or its ``prev_cursor`` as ``before``
+        for the preceding one. Cursors are opaque. With ``projection=True``
+        the page holds read-only TaskRow tuples.
+        """
+        page = {"tasks": [], "next_cursor": None, "prev_cursor": None, "has_next": False, "has_prev": False}
+        if not self.current_user:
+            return page
+        
+        # Key on the stored created_at text: rows written with CURRENT_TIMESTAMP
+        # and with Python datetimes use different formats, which only compare
+        # consistently as raw strings
+        created_key = type_coerce(Task.created_at, String)
+        entities = TaskRow.columns() if projection else [Task]
+        query = self.db.query(*entities, created_key).filter(Task.user_id == self.current_user.id)
+        if status:
+            query = query.filter(Task.status == status)
+        if category:
+            query = query.filter(Task.category == category)
+        if difficulty:
+            query = query.filter(Task.difficulty == difficulty)
+        
+        key = tuple_(created_key, Task.id)
+        if before is not None:
+            # Walk backwards from the cursor, then restore newest-first order
+            rows = query.filter(key > tuple_(*before)).order_by(
+                Task.created_at.asc(), Task.id.asc()
+            ).limit(limit + 1).all()
+            page["has_prev"] = len(rows) > limit
+            page["has_next"] = True
+            tasks = rows[:limit][::-1]
+        else:
+            if after is not None:
+                query = query.filter(key < tuple_(*after))
+            rows = query.order_by(
+                Task.created_at.desc(), Task.id.desc()
+            ).limit(limit + 1).all()
+            page["has_next"] = len(rows) > limit
+            page["has_prev"] = after is not None
+            tasks = rows[:limit]
+        
+        if projection:
+            tasks = [(TaskRow._make(row[:-1]), row[-1]) for row in tasks]
+        page["tasks"] = [task for task, _ in tasks]
+        if tasks:
+            first_task, first_key = tasks[0]
+            last_task, last_key = tasks[-1]
+            page["prev_cursor"] = (first_key, first_task.id)
+            page["next_cursor"] = (last_key, last_task.id)
+        return page
+    
+    def _overdue_query(self, *columns):
+        """Query pending tasks of the current user whose deadline has passed."""
+        return self.db.query(*columns).filter(
+            Task.user_id == self.current_user.id,
+            Task.status == TaskStatus.PENDING.value,
+            Task.deadline < date.today()
+        )
     
-    def get_overdue_tasks(self) -> list[Task]:
-        """Get all overdue tasks."""
+    def get_overdue_tasks(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[tuple[date, int]] = None,
+        projection: bool = False
+    ) -> list[Task]:
+        """Get overdue tasks, oldest deadline first.
+        
+        Page with limit/offset, or with keyset pagination by passing the
+        (deadline, id) of the last task of the previous page as ``after``.
+        With ``projection=True`` returns read-only TaskRow tuples.
+        """
         if not self.current_user:
             return []
         
-        tasks = self.get_pending_tasks()
-        return [task for task in tasks if task.is_overdue()]
+        query = self._overdue_query(*(TaskRow.columns() if projection else [Task]))
+        if after is not None:
+            query = query.filter(tuple_(Task.deadline, Task.id) > tuple_(*after))
+        query = query.order_by(Task.deadline.asc(), Task.id.asc())
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        rows = query.all()
+        return [TaskRow._make(row) for row in rows] if projection else rows
+    
+    def count_overdue_tasks(self) -> int:
+        """Count overdue tasks without loading them."""
+        if not self.current_user:
+            return 0
+        
+        return self._overdue_query(func.count(Task.id)).scalar()
     
     def get_user_stats(self):
-        """Get current user stats."""
+        """Get current user stats. Read-only: a missing row reads as all zeros."""
         if not self.current_user:
             return None
         
-        stats = StatsEngine.get_or_create_stats(self.db, self.current_user.id)
+        stats = StatsEngine.get_stats(self.db, self.current_user.id)
+        if stats is None:
+            stats = Stats(**dict.fromkeys(Stats.STAT_NAMES, 0))
         return StatsEngine.get_stats_summary(stats)
 
@@ -0,0 +1,165 @@
+"""Streaming bulk import of tasks from CSV or JSONL files."""
+import csv
+import json
+import os
+import time
+from datetime import date
+from typing import Iterator, Optional
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from models.task import Task, TaskCategory, TaskDifficulty, TaskStatus
+
+MAX_REPORTED_ERRORS = 20
+
+
+class TaskImportRow(BaseModel):
+    """One task row of an import file."""
+    
+    title: str = Field(min_length=1)
+    description: str = ""
+    category: TaskCategory
+    difficulty: TaskDifficulty
+    deadline: Optional[date] = None
+    
+    @field_validator("description", mode="before")
+    @classmethod
+    def blank_description(cls, value):
+        """Treat a missing description as empty."""
+        return value or ""
+    
+    @field_validator("deadline", mode="before")
+    @classmethod
+    def blank_deadline(cls, value):
+        """Treat an empty CSV cell as no deadline."""
+        return value or None
+
+
+class TaskImporter:
+    """Import tasks for one user in batches, one transaction per batch."""
+    
+    def __init__(self, db: Session, user_id: int, batch_size: int = 1000):
+        self.db = db
+        self.user_id = user_id
+        self.batch_size = batch_size
+    
+    @staticmethod
+    def iter_records(path: str, file_format: Optional[str] = None) -> Iterator[tuple[int, dict]]:
+        """Lazily yield (line_number, record) pairs from a CSV or JSONL file."""
+        file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower()
+        # utf-8-sig drops the BOM Excel writes, which would end up in the first header
+        with open(path, newline="", encoding="utf-8-sig") as handle:
+            if file_format == "csv":
+                reader = csv.DictReader(handle)
+                for record in reader:
+                    yield reader.line_num, record
+            elif file_format in ("jsonl", "ndjson"):
+                for line_number, line in enumerate(handle, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield line_number, json.loads(line)
+                    except json.JSONDecodeError:
+                        # Passed on as-is so validation reports it as a bad row
+                        yield line_number, line
+            else:
+                raise ValueError(f"Unsupported import format: '{file_format}'")
+    
+    def to_values(self, row: TaskImportRow) -> dict:
+        """Build insert values for a validated row, as Task.calculate_exp_reward would."""
+        return {
+            "user_id": self.user_id,
+            "title": row.title,
+            "description": row.description,
+            "category": row.category.value,
+            "difficulty": row.difficulty.value,
+            "status": TaskStatus.PENDING.value,
+            "exp_reward": Task.exp_reward_for(row.difficulty.value),
+            "deadline": row.deadline
+        }
+    
+    def _insert_batch(self, batch: list[dict]):
+        """Insert one batch with executemany and commit it."""
+        try:
+            self.db.execute(insert(Task), batch)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+    
+    def import_file(self, path: str, file_format: Optional[str] = None) -> dict:
+        """Import a file and return a report of the run.
+        
+        Invalid rows are skipped; the first MAX_REPORTED_ERRORS are reported.
+        Memory use is bounded by the batch size, not the file size.
+        """
+        report = {"imported": 0, "skipped": 0, "errors": [], "seconds": 0.0, "rows_per_sec": 0.0}
+        batch = []
+        start = time.perf_counter()
+        
+        try:
+            records = self.iter_records(path, file_format)
+            for line_number, record in records:
+                try:
+                    row = TaskImportRow.model_validate(record)
+                except ValidationError as e:
+                    report["skipped"] += 1
+                    if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                        report["errors"].append(f"line {line_number}: {e.errors()[0]['msg']}")
+                    continue
+                
+                batch.append(self.to_values(row))
+                if len(batch) >= self.batch_size:
+                    self._insert_batch(batch)
+                    report["imported"] += len(batch)
+                    batch = []
+            
+            if batch:
+                self._insert_batch(batch)
+                report["imported"] += len(batch)
+        finally:
+            report["seconds"] = time.perf_counter() - start
+            if report["seconds"]:
+                report["rows_per_sec"] = report["imported"] / report["seconds"]
+        
+        return report
+
+
+def main():
+    """Command line entry point for task imports."""
+    import argparse
+    from db.database import SessionLocal, init_db
+    from core.game_loop import GameState
+    
+    parser = argparse.ArgumentParser(description="Import tasks from a CSV or JSONL file.")
+    parser.add_argument("path", help="File with title, category, difficulty[, description, deadline]")
+    parser.add_argument("--user", required=True, help="Username that owns the tasks")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--create-user", action="store_true", help="Create the user if missing")
+    args = parser.parse_args()
+    
+    init_db()
+    db = SessionLocal()
+    try:
+        game_state = GameState(db)
+        user = game_state.load_user(args.user)
+        if not user:
+            if not args.create_user:
+                parser.error(f"User '{args.user}' not found (use --create-user)")
+            user = game_state.create_user(args.user)
+        
+        report = TaskImporter(db, user.id, args.batch_size).import_file(args.path, args.format)
+    finally:
+        db.close()
+    
+    print(f"✅ Imported {report['imported']} task(s) in {report['seconds']:.2f}s "
+          f"({report['rows_per_sec']:,.0f} rows/sec)")
+    if report["skipped"]:
+        print(f"⚠️ Skipped {report['skipped']} invalid row(s):")
+        for error in report["errors"]:
+            print(f"   {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,32 @@
 """Palace engine for managing major goals."""
 from models.palace import Palace, PalaceStatus
 from models.task import Task, TaskStatus
+from models.user import User
+from models.projections import PalaceRow
+from core.event_log import EventLog
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, update
+from typing import Optional
 
 
 class PalaceEngine:
     """Engine for managing Palace progression."""
     
+    INFILTRATION_PER_TASK = 0.5  # % per completed task
+    
     @staticmethod
     def calculate_infiltration(db: Session, palace: Palace) -> float:
         """Calculate infiltration percentage based on related tasks."""
-        # Get all tasks for the user
-        user_tasks = db.query(Task).filter(
-            Task.user_id == palace.user_id,
-            Task.status == TaskStatus.COMPLETED.value
-        ).all()
+        # The user's completed task counter avoids loading every completed task
+        user = db.get(User, palace.user_id)
+        if user is not None and user.completed_tasks is not None:
+            completed = user.completed_tasks
+        else:
+            completed = PalaceEngine.count_completed_tasks(db, palace.user_id)
         
         # Simple calculation: each completed task adds a small percentage
         # This can be customized based on task difficulty or category
-        base_infiltration = len(user_tasks) * 0.5  # 0.5% per completed task
+        base_infiltration = completed * PalaceEngine.INFILTRATION_PER_TASK
         
         # Cap at 100%
         infiltration = min(100.0, base_infiltration)
@@ -27,12 +34,78 @@ class PalaceEngine:
         return infiltration
     
     @staticmethod
-    def update_palace_progress(db: Session, palace: Palace):
+    def count_completed_tasks(db: Session, user_id: int) -> int:
+        """Count completed tasks of a user in SQL."""
+        return db.query(func.count(Task.id)).filter(
+            Task.user_id == user_id,
+            Task.status == TaskStatus.COMPLETED.value
+        ).scalar()
+    
+    @staticmethod
+    def rebuild_completed_counters(db: Session, user_id: Optional[int] = None) -> int:
+        """Recount completed tasks into users.completed_tasks and refresh palaces.
+        
+        Repairs the counter after manual edits or imports. Returns the number
+        of users rebuilt.
+        """
+        completed_count = (
+            select(func.count(Task.id))
+            .where(Task.user_id == User.id, Task.status == TaskStatus.COMPLETED.value)
+            .scalar_subquery()
+        )
+        stmt = update(User).values(completed_tasks=completed_count)
+        if user_id is not None:
+            stmt = stmt.where(User.id == user_id)
+        rebuilt = db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+        db.expire_all()
+        
+        user_ids = [user_id] if user_id is not None else [
+            uid for (uid,) in db.query(Palace.user_id).filter(
+                Palace.status == PalaceStatus.ACTIVE
+            ).distinct()
+        ]
+        for uid in user_ids:
+            PalaceEngine.update_active_palaces(db, uid, commit=False)
+        
+        db.commit()
+        return rebuilt
+    
+    @staticmethod
+    def set_infiltration(db: Session, palace: Palace, infiltration: float):
+        """Update a palace's infiltration and log it when the whole percentage moves."""
+        old_value = int(palace.infiltration_percentage or 0)
+        palace.update_infiltration(infiltration)
+        new_value = int(palace.infiltration_percentage)
+        if new_value != old_value:
+            EventLog.record(
+                db, palace.user_id, f"palace:{palace.id}", old_value, new_value,
+                EventLog.PALACE_PROGRESS
+            )
+    
+    @staticmethod
+    def update_palace_progress(db: Session, palace: Palace, commit: bool = True):
         """Update palace infiltration percentage."""
         infiltration = PalaceEngine.calculate_infiltration(db, palace)
-        palace.update_infiltration(infiltration)
-        db.commit()
-        db.refresh(palace)
+        PalaceEngine.set_infiltration(db, palace, infiltration)
+        if commit:
+            db.commit()
+            db.refresh(palace)
+    
+    @staticmethod
+    def update_active_palaces(db: Session, user_id: int, commit: bool = True) -> list[Palace]:
+        """Update infiltration of every active palace of a user in one pass."""
+        palaces = PalaceEngine.get_active_palaces(db, user_id)
+        if not palaces:
+            return palaces
+        
+        # Infiltration only depends on the user, so compute it once
+        infiltration = PalaceEngine.calculate_infiltration(db, palaces[0])
+        for palace in palaces:
+            PalaceEngine.set_infiltration(db, palace, infiltration)
+        
+        if commit:
+            db.commit()
+        return palaces
     
     @staticmethod
     def get_palace_status(palace: Palace) -> dict:
@@ -54,18 +127,48 @@ class PalaceEngine:
         return status_info
     
     @staticmethod
-    def get_active_palaces(db: Session, user_id: int) -> list[Palace]:
-        """Get all active palaces for a user."""
-        return db.query(Palace).filter(
+    def get_active_palaces(db: Session, user_id: int, projection: bool = False) -> list[Palace]:
+        """Get all active palaces for a user, as read-only PalaceRow tuples with ``projection=True``."""
+        rows = db.query(*(PalaceRow.columns() if projection else [Palace])).filter(
             Palace.user_id == user_id,
             Palace.status == PalaceStatus.ACTIVE
         ).all()
+        return [PalaceRow._make(row) for row in rows] if projection else rows
     
     @staticmethod
-    def get_completed_palaces(db: Session, user_id: int) -> list[Palace]:
-        """Get all completed palaces for a user."""
-        return db.query(Palace).filter(
+    def get_completed_palaces(db: Session, user_id: int, projection: bool = False) -> list[Palace]:
+        """Get all completed palaces for a user, as read-only PalaceRow tuples with ``projection=True``."""
+        rows = db.query(*(PalaceRow.columns() if projection else [Palace])).filter(
             Palace.user_id == user_id,
             Palace.status == PalaceStatus.COMPLETED
         ).all()
+        return [PalaceRow._make(row) for row in rows] if projection else rows
+
+
+def main():
+    """Command line entry point for palace maintenance."""
+    import argparse
+    from db.database import SessionLocal, init_db
+    
+    parser = argparse.ArgumentParser(description="Palace maintenance commands.")
+    parser.add_argument("command", choices=["rebuild-counters"])
+    parser.add_argument("--user", help="Only rebuild this username")
+    args = parser.parse_args()
+    
+    init_db()
+    db = SessionLocal()
+    try:
+        user_id = None
+        if args.user:
+            user = db.query(User).filter(User.username == args.user).first()
+            if not user:
+                parser.error(f"User '{args.user}' not found")
+            user_id = user.id
+        rebuilt = PalaceEngine.rebuild_completed_counters(db, user_id)
+        print(f"✅ Rebuilt completed task counters for {rebuilt} user(s)")
+    finally:
+        db.close()
+
 
+if __name__ == "__main__":
+    main()
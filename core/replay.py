@@ -0,0 +1,310 @@
+"""Replay engine rebuilding stats, EXP and palaces from completed tasks."""
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+import numpy as np
+from sqlalchemy import String, delete, select, text, tuple_, type_coerce
+from sqlalchemy.orm import Session, sessionmaker
+from models.user import User
+from models.task import Task, TaskStatus
+from models.stats import Stats
+from models.replay_snapshot import ReplaySnapshot
+from core.stats_engine import StatsEngine
+from core.palace_engine import PalaceEngine
+from core.event_log import EventLog
+
+# Process-local session factory of pool workers
+_worker_session_factory = None
+
+
+class ReplayEngine:
+    """Rebuild a user's derived state from their completed tasks.
+    
+    Derived state only depends on how many tasks were completed per
+    (category, difficulty), so a replay streams completed tasks in
+    completion order, counts each chunk with NumPy and applies the
+    current reward tables to the totals. Counts are checkpointed as
+    ReplaySnapshot rows; the next replay resumes after the latest one.
+    
+    A resumed replay only reads tasks after the snapshot cursor, so tasks
+    un-completed or deleted before it stay counted. Replay with
+    ``resume=False`` (``--from-scratch``) after such edits.
+    """
+    
+    REPLAY = "replay"  # progress_history change_reason
+    KEEP_SNAPSHOTS = 3  # Per user
+    
+    @staticmethod
+    def iter_chunks(
+        db: Session,
+        user_id: int,
+        after: Optional[tuple] = None,
+        chunk_size: int = 50_000,
+        commit: bool = True
+    ) -> Iterator[list]:
+        """Yield chunks of (completed_at, id, category, difficulty) rows after a cursor.
+        
+        Tasks without a completed_at come first, ordered by id, then the
+        rest by (completed_at, id). Each chunk is its own keyset query and,
+        with ``commit=True``, its own read transaction, so neither the WAL
+        nor other writers are held up between chunks.
+        """
+        completed_at = type_coerce(Task.completed_at, String)
+        base = select(completed_at, Task.id, Task.category, Task.difficulty).where(
+            Task.user_id == user_id,
+            Task.status == TaskStatus.COMPLETED.value
+        )
+        
+        if after is None or after[0] is None:
+            last_id = after[1] if after else 0
+            while True:
+                rows = db.execute(
+                    base.where(Task.completed_at.is_(None), Task.id > last_id)
+                    .order_by(Task.id).limit(chunk_size)
+                ).all()
+                if commit:
+                    db.commit()
+                if not rows:
+                    break
+                yield rows
+                last_id = rows[-1][1]
+            stmt = base.where(Task.completed_at.is_not(None))
+        else:
+            stmt = base.where(tuple_(completed_at, Task.id) > tuple_(*after))
+        
+        while True:
+            rows = db.execute(stmt.order_by(completed_at, Task.id).limit(chunk_size)).all()
+            if commit:
+                db.commit()
+            if not rows:
+                break
+            yield rows
+            last = rows[-1]
+            stmt = base.where(tuple_(completed_at, Task.id) > tuple_(last[0], last[1]))
+    
+    @staticmethod
+    def count_chunk(rows: list) -> Counter:
+        """Count a chunk's tasks per (category, difficulty)."""
+        keys = np.array([f"{row[2]}\x1f{row[3]}" for row in rows])
+        unique, counts = np.unique(keys, return_counts=True)
+        return Counter({
+            tuple(key.split("\x1f", 1)): int(count) for key, count in zip(unique, counts)
+        })
+    
+    @staticmethod
+    def derive(counts: Counter) -> dict:
+        """Apply the current reward tables to task counts."""
+        stats = dict.fromkeys(Stats.STAT_NAMES, 0)
+        total_exp = 0
+        for (category, difficulty), count in counts.items():
+            stat = StatsEngine.STAT_BOOST_MAP.get(category, "knowledge")
+            stats[stat] += count * StatsEngine.DIFFICULTY_BOOST_MAP.get(difficulty, 1)
+            total_exp += count * Task.exp_reward_for(difficulty)
+        
+        # Boosts are positive, so clamping the sum equals clamping each step
+        return {
+            "stats": {name: min(Stats.MAX_STAT, value) for name, value in stats.items()},
+            "total_exp": total_exp,
+            "level": total_exp // 100 + 1,
+            "completed_tasks": sum(counts.values())
+        }
+    
+    @staticmethod
+    def latest_snapshot(db: Session, user_id: int) -> Optional[ReplaySnapshot]:
+        """Get the most recent snapshot of a user."""
+        return db.query(ReplaySnapshot).filter(
+            ReplaySnapshot.user_id == user_id
+        ).order_by(ReplaySnapshot.id.desc()).first()
+    
+    @staticmethod
+    def save_snapshot(db: Session, user_id: int, cursor: tuple, counts: Counter):
+        """Add a snapshot and drop all but the newest KEEP_SNAPSHOTS. Does not commit."""
+        db.add(ReplaySnapshot(
+            user_id=user_id,
+            last_completed_at=cursor[0],
+            last_task_id=cursor[1],
+            task_count=sum(counts.values()),
+            counts=[[category, difficulty, count] for (category, difficulty), count in counts.items()]
+        ))
+        db.flush()
+        stale = (
+            select(ReplaySnapshot.id)
+            .where(ReplaySnapshot.user_id == user_id)
+            .order_by(ReplaySnapshot.id.desc())
+            .offset(ReplayEngine.KEEP_SNAPSHOTS)
+        )
+        db.execute(
+            delete(ReplaySnapshot).where(ReplaySnapshot.id.in_(stale))
+            .execution_options(synchronize_session=False)
+        )
+    
+    @staticmethod
+    def replay_user(
+        db: Session,
+        user_id: int,
+        resume: bool = True,
+        chunk_size: int = 50_000,
+        snapshot_every: int = 100_000
+    ) -> dict:
+        """Rebuild one user's stats, EXP, level and palaces and return a report.
+        
+        Tasks are counted without holding the write lock; a snapshot is
+        committed every snapshot_every tasks. The tasks completed meanwhile
+        are then caught up and the results written in one write transaction.
+        """
+        start = time.perf_counter()
+        counts, cursor = Counter(), None
+        if resume:
+            snapshot = ReplayEngine.latest_snapshot(db, user_id)
+            if snapshot:
+                counts = Counter({(category, difficulty): count for category, difficulty, count in snapshot.counts})
+                cursor = (snapshot.last_completed_at, snapshot.last_task_id)
+        resumed_from = sum(counts.values())
+        
+        since_snapshot = 0
+        for rows in ReplayEngine.iter_chunks(db, user_id, cursor, chunk_size):
+            counts.update(ReplayEngine.count_chunk(rows))
+            cursor = (rows[-1][0], rows[-1][1])
+            since_snapshot += len(rows)
+            if since_snapshot >= snapshot_every:
+                ReplayEngine.save_snapshot(db, user_id, cursor, counts)
+                db.commit()
+                since_snapshot = 0
+        
+        try:
+            # Serialize with writers, then count what they completed meanwhile
+            db.execute(text("BEGIN IMMEDIATE"))
+            for rows in ReplayEngine.iter_chunks(db, user_id, cursor, chunk_size, commit=False):
+                counts.update(ReplayEngine.count_chunk(rows))
+                cursor = (rows[-1][0], rows[-1][1])
+            
+            derived = ReplayEngine.derive(counts)
+            ReplayEngine._apply(db, user_id, derived)
+            if cursor is not None:
+                ReplayEngine.save_snapshot(db, user_id, cursor, counts)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        derived.update({
+            "user_id": user_id,
+            "resumed_from": resumed_from,
+            "replayed": derived["completed_tasks"] - resumed_from,
+            "seconds": time.perf_counter() - start
+        })
+        return derived
+    
+    @staticmethod
+    def _apply(db: Session, user_id: int, derived: dict):
+        """Write derived values, logging every change."""
+        user = db.get(User, user_id)
+        stats = StatsEngine.get_or_create_stats(db, user_id, commit=False)
+        
+        for name, value in derived["stats"].items():
+            old_value = stats.get_stat(name)
+            if value != old_value:
+                setattr(stats, name, value)
+                EventLog.record(db, user_id, name, old_value, value, ReplayEngine.REPLAY)
+        for name in ("total_exp", "level"):
+            old_value = getattr(user, name)
+            if derived[name] != old_value:
+                setattr(user, name, derived[name])
+                stat_name = "exp" if name == "total_exp" else name
+                EventLog.record(db, user_id, stat_name, old_value, derived[name], ReplayEngine.REPLAY)
+        
+        user.completed_tasks = derived["completed_tasks"]
+        PalaceEngine.update_active_palaces(db, user_id, commit=False)
+
+
+def _init_worker(database_url: str, profile: Optional[str]):
+    """Give each pool worker its own engine and connection pool."""
+    global _worker_session_factory
+    from db.database import create_db_engine
+    _worker_session_factory = sessionmaker(bind=create_db_engine(database_url, profile), autoflush=False)
+
+
+def _replay_worker(user_id: int, resume: bool, chunk_size: int, snapshot_every: int) -> dict:
+    db = _worker_session_factory()
+    try:
+        return ReplayEngine.replay_user(db, user_id, resume, chunk_size, snapshot_every)
+    finally:
+        db.close()
+
+
+def replay_all(
+    user_ids: Optional[list[int]] = None,
+    workers: Optional[int] = None,
+    database_url: Optional[str] = None,
+    profile: Optional[str] = None,
+    resume: bool = True,
+    chunk_size: int = 50_000,
+    snapshot_every: int = 100_000
+) -> list[dict]:
+    """Replay many users (default: all) in a process pool, one user per task.
+    
+    Counting runs in parallel; the short write transactions at the end of
+    each replay are serialized by SQLite.
+    """
+    from db.database import DATABASE_URL, create_db_engine
+    database_url = database_url or DATABASE_URL
+    
+    if user_ids is None:
+        engine = create_db_engine(database_url, profile)
+        with engine.connect() as conn:
+            user_ids = list(conn.execute(select(User.id).order_by(User.id)).scalars())
+        engine.dispose()
+    
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(database_url, profile)
+    ) as pool:
+        futures = [
+            pool.submit(_replay_worker, user_id, resume, chunk_size, snapshot_every)
+            for user_id in user_ids
+        ]
+        return [future.result() for future in futures]
+
+
+def main():
+    """Command line entry point for replays."""
+    import argparse
+    from db.database import SessionLocal, init_db
+    
+    parser = argparse.ArgumentParser(description="Rebuild stats, EXP and palaces from completed tasks.")
+    parser.add_argument("--user", help="Only replay this username")
+    parser.add_argument("--workers", type=int, help="Pool size (defaults to the CPU count)")
+    parser.add_argument("--from-scratch", action="store_true", help="Ignore existing snapshots")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--snapshot-every", type=int, default=100_000)
+    args = parser.parse_args()
+    
+    init_db()
+    start = time.perf_counter()
+    if args.user:
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.username == args.user).first()
+            if not user:
+                parser.error(f"User '{args.user}' not found")
+            reports = [ReplayEngine.replay_user(
+                db, user.id, not args.from_scratch, args.chunk_size, args.snapshot_every
+            )]
+        finally:
+            db.close()
+    else:
+        reports = replay_all(
+            workers=args.workers,
+            resume=not args.from_scratch,
+            chunk_size=args.chunk_size,
+            snapshot_every=args.snapshot_every
+        )
+    
+    replayed = sum(report["replayed"] for report in reports)
+    print(f"✅ Replayed {len(reports)} user(s), {replayed} task(s) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Thread-safe multi-user service layer."""
+from contextlib import contextmanager
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker, scoped_session
+from models.user import User
+from models.task import Task
+from models.palace import Palace
+from core.game_loop import GameState
+from core.palace_engine import PalaceEngine
+from db.database import engine
+from datetime import date
+from typing import Optional
+
+
+class GameService:
+    """Multi-user facade over GameState, safe to call from a thread pool.
+    
+    Every operation takes a user_id and runs in a session scoped to the
+    calling thread, drawn from the pooled engine and removed when the call
+    returns. Objects are not expired on commit, so results stay readable
+    after their session is gone.
+    """
+    
+    def __init__(self, bind=None):
+        self.Session = scoped_session(sessionmaker(
+            bind=bind or engine,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False
+        ))
+    
+    @contextmanager
+    def game_state(self, user_id: Optional[int] = None, write: bool = True):
+        """Yield a GameState for user_id inside a per-call session."""
+        db = self.Session()
+        try:
+            if write:
+                # Serialize writers from the start so read-modify-write updates
+                # of EXP and stats cannot interleave between threads
+                db.execute(text("BEGIN IMMEDIATE"))
+            game_state = GameState(db)
+            if user_id is not None:
+                game_state.current_user = db.get(User, user_id)
+                if not game_state.current_user:
+                    raise ValueError("User not found")
+            yield game_state
+        finally:
+            self.Session.remove()
+    
+    def create_user(self, username: str) -> User:
+        """Create a new user."""
+        with self.game_state() as game_state:
+            return game_state.create_user(username)
+    
+    def load_user(self, username: str) -> Optional[User]:
+        """Load an existing user."""
+        with self.game_state(write=False) as game_state:
+            return game_state.load_user(username)
+    
+    def get_user_by_id(self, user_id: int) -> Optional[User]:
+        """Get user by ID."""
+        with self.game_state(write=False) as game_state:
+            return game_state.get_user_by_id(user_id)
+    
+    def create_task(
+        self,
+        user_id: int,
+        title: str,
+        category: str,
+        difficulty: str,
+        description: str = "",
+        deadline: Optional[date] = None
+    ) -> Task:
+        """Create a new task."""
+        with self.game_state(user_id) as game_state:
+            return game_state.create_task(title, category, difficulty, description, deadline)
+    
+    def complete_task(self, user_id: int, task_id: int) -> dict:
+        """Complete a task and update stats/exp."""
+        with self.game_state(user_id) as game_state:
+            return game_state.complete_task(task_id)
+    
+    def complete_tasks(self, user_id: int, task_ids: list[int]) -> list[dict]:
+        """Complete many tasks in one transaction."""
+        with self.game_state(user_id) as game_state:
+            return game_state.complete_tasks(task_ids)
+    
+    def create_palace(
+        self,
+        user_id: int,
+        name: str,
+        description: str = "",
+        boss_name: str = "",
+        deadline: Optional[date] = None
+    ) -> Palace:
+        """Create a new palace."""
+        with self.game_state(user_id) as game_state:
+            return game_state.create_palace(name, description, boss_name, deadline)
+    
+    def get_pending_tasks(self, user_id: int, projection: bool = False) -> list[Task]:
+        """Get all pending tasks for a user."""
+        with self.game_state(user_id, write=False) as game_state:
+            return game_state.get_pending_tasks(projection)
+    
+    def get_overdue_tasks(self, user_id: int, **kwargs) -> list[Task]:
+        """Get overdue tasks; accepts the paging arguments of GameState."""
+        with self.game_state(user_id, write=False) as game_state:
+            return game_state.get_overdue_tasks(**kwargs)
+    
+    def count_overdue_tasks(self, user_id: int) -> int:
+        """Count overdue tasks without loading them."""
+        with self.game_state(user_id, write=False) as game_state:
+            return game_state.count_overdue_tasks()
+    
+    def list_tasks(self, user_id: int, **kwargs) -> dict:
+        """Get one page of tasks; accepts the arguments of GameState.list_tasks."""
+        with self.game_state(user_id, write=False) as game_state:
+            return game_state.list_tasks(**kwargs)
+    
+    def get_active_palaces(self, user_id: int, projection: bool = False) -> list[Palace]:
+        """Get all active palaces for a user."""
+        with self.game_state(user_id, write=False) as game_state:
+            return PalaceEngine.get_active_palaces(game_state.db, user_id, projection)
+    
+    def get_completed_palaces(self, user_id: int, projection: bool = False) -> list[Palace]:
+        """Get all completed palaces for a user."""
+        with self.game_state(user_id, write=False) as game_state:
+            return PalaceEngine.get_completed_palaces(game_state.db, user_id, projection)
+    
+    def get_user_stats(self, user_id: int) -> Optional[dict]:
+        """Get a user's stats summary."""
+        with self.game_state(user_id, write=False) as game_state:
+            return game_state.get_user_stats()
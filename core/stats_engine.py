@@ -1,7 +1,13 @@
 """Stats engine for managing user statistics."""
 from models.stats import Stats
-from models.task import Task, TaskCategory
+from models.task import Task, TaskCategory, TaskDifficulty
+from core.event_log import EventLog
+from sqlalchemy import event
 from sqlalchemy.orm import Session
+from typing import Optional
+
+# Session.info key of the per-session {user_id: Stats} cache
+CACHE_KEY = "stats_cache"
 
 
 class StatsEngine:
@@ -15,41 +21,83 @@ class StatsEngine:
         TaskCategory.CHARM.value: "charm"
     }
     
+    DIFFICULTY_BOOST_MAP = {
+        TaskDifficulty.EASY.value: 1,
+        TaskDifficulty.MEDIUM.value: 2,
+        TaskDifficulty.HARD.value: 3,
+        TaskDifficulty.EXTREME.value: 5
+    }
+    
     @staticmethod
-    def get_or_create_stats(db: Session, user_id: int) -> Stats:
-        """Get or create stats for a user."""
-        stats = db.query(Stats).filter(Stats.user_id == user_id).first()
+    def _cache(db: Session) -> dict:
+        return db.info.setdefault(CACHE_KEY, {})
+    
+    @staticmethod
+    def get_stats(db: Session, user_id: int) -> Optional[Stats]:
+        """Get a user's stats without ever inserting a row.
+        
+        Served from the session's cache when possible. The cached object is
+        the session's own instance, so stat increases on it are written
+        through to the database on the next commit.
+        """
+        cache = StatsEngine._cache(db)
+        stats = cache.get(user_id)
+        if stats is None:
+            stats = db.query(Stats).filter(Stats.user_id == user_id).first()
+            if stats is not None:
+                cache[user_id] = stats
+        return stats
+    
+    @staticmethod
+    def get_or_create_stats(db: Session, user_id: int, commit: bool = True) -> Stats:
+        """Get or create stats for a user.
+
+        With ``commit=False`` a new row is only flushed, leaving the caller's
+        transaction open.
+        """
+        stats = StatsEngine.get_stats(db, user_id)
         if not stats:
             stats = Stats(user_id=user_id)
             db.add(stats)
-            db.commit()
-            db.refresh(stats)
+            if commit:
+                db.commit()
+                db.refresh(stats)
+            else:
+                db.flush()
+            StatsEngine._cache(db)[user_id] = stats
         return stats
     
     @staticmethod
-    def process_task_completion(db: Session, task: Task) -> dict:
-        """Process task completion and update stats."""
-        stats = StatsEngine.get_or_create_stats(db, task.user_id)
+    def evict_stats(db: Session, user_id: Optional[int] = None):
+        """Drop one user's cached stats, or the whole session cache."""
+        if user_id is None:
+            db.info.pop(CACHE_KEY, None)
+        else:
+            StatsEngine._cache(db).pop(user_id, None)
+    
+    @staticmethod
+    def process_task_completion(db: Session, task: Task, commit: bool = True) -> dict:
+        """Process task completion and update stats.
+
+        With ``commit=False`` the changes stay in the caller's open transaction.
+        """
+        stats = StatsEngine.get_or_create_stats(db, task.user_id, commit=commit)
         
         # Determine which stat to boost
         stat_to_boost = StatsEngine.STAT_BOOST_MAP.get(task.category, "knowledge")
         
         # Calculate boost amount based on difficulty
-        boost_amount = {
-            "Easy": 1,
-            "Medium": 2,
-            "Hard": 3,
-            "Extreme": 5
-        }.get(task.difficulty, 1)
+        boost_amount = StatsEngine.DIFFICULTY_BOOST_MAP.get(task.difficulty, 1)
         
         # Increase stat
-        increased = stats.increase_stat(stat_to_boost, boost_amount)
+        increased = StatsEngine.apply_boost(db, stats, stat_to_boost, boost_amount)
         
         # Update task stat_boost field
         task.stat_boost = stat_to_boost
         
-        db.commit()
-        db.refresh(stats)
+        if commit:
+            db.commit()
+            db.refresh(stats)
         
         return {
             "stat": stat_to_boost,
@@ -58,6 +106,18 @@ class StatsEngine:
             "increased": increased
         }
     
+    @staticmethod
+    def apply_boost(db: Session, stats: Stats, stat_name: str, amount: int) -> bool:
+        """Increase a stat and log the change. Returns True if it increased."""
+        old_value = stats.get_stat(stat_name)
+        increased = stats.increase_stat(stat_name, amount)
+        if increased:
+            EventLog.record(
+                db, stats.user_id, stat_name, old_value, stats.get_stat(stat_name),
+                EventLog.TASK_COMPLETED
+            )
+        return increased
+    
     @staticmethod
     def get_stats_summary(stats: Stats) -> dict:
         """Get formatted stats summary."""
@@ -86,3 +146,16 @@ class StatsEngine:
         else:
             return "Novice"
 
+
+@event.listens_for(Session, "persistent_to_detached")
+@event.listens_for(Session, "persistent_to_transient")
+@event.listens_for(Session, "pending_to_transient")
+@event.listens_for(Session, "persistent_to_deleted")
+def _evict_detached_stats(session: Session, instance):
+    # Fires on close(), expunge, rollback of a new row and delete
+    # Match by identity: a detached instance may have no loaded attributes
+    cache = session.info.get(CACHE_KEY)
+    if cache and isinstance(instance, Stats):
+        for user_id, stats in list(cache.items()):
+            if stats is instance:
+                del cache[user_id]
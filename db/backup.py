@@ -0,0 +1,294 @@
+"""Online backups through SQLite's backup API.
+
+A backup copies the live database a few pages at a time, pausing between
+steps, so the app keeps writing while it runs. Each copy is written to a
+temporary file, checked with ``PRAGMA integrity_check`` and only then
+renamed into the backup directory. The newest backup stays a plain
+database file, ready to be restored; older ones are gzipped and the
+oldest beyond the rotation limit deleted.
+"""
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.engine import Engine
+
+BACKUP_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "backups")
+BACKUP_PAGES = 1024  # Pages per step, 4 MiB with the default page size
+BACKUP_STEP_SLEEP = 0.005  # Seconds between steps, leaving the lock to writers
+MAX_RESTARTS = 5  # Restarts caused by concurrent writes before copying in one step
+KEEP_BACKUPS = 7
+DEFAULT_INTERVAL = 24 * 3600  # Seconds between scheduled backups
+STOP_TIMEOUT = 5.0  # Seconds stop() waits for a backup in progress
+BACKUP_FILE = re.compile(r"-(\d{8}-\d{6})\.db(\.gz)?$")
+
+
+class BackupRestarted(Exception):
+    """Raised from the progress callback to abort a backup that keeps restarting."""
+
+
+class BackupError(Exception):
+    """A backup failed its integrity check."""
+
+
+def _database_path(engine: Engine) -> str:
+    path = engine.url.database
+    if not path or path == ":memory:":
+        raise ValueError("Only file databases can be backed up")
+    return path
+
+
+def _timestamp(filename: str) -> Optional[datetime]:
+    """Parse the timestamp out of a backup file name."""
+    match = BACKUP_FILE.search(filename)
+    return datetime.strptime(match.group(1), "%Y%m%d-%H%M%S") if match else None
+
+
+def list_backups(directory: str = BACKUP_DIR) -> list[str]:
+    """List backup files, newest first."""
+    if not os.path.isdir(directory):
+        return []
+    backups = [filename for filename in os.listdir(directory) if _timestamp(filename)]
+    return [
+        os.path.join(directory, filename)
+        for filename in sorted(backups, key=_timestamp, reverse=True)
+    ]
+
+
+def copy_database(
+    source_path: str,
+    target_path: str,
+    pages: int = BACKUP_PAGES,
+    step_sleep: float = BACKUP_STEP_SLEEP,
+    max_restarts: int = MAX_RESTARTS
+) -> dict:
+    """Copy a live database with the backup API and return step statistics.
+    
+    In WAL mode the copy reads one snapshot and never blocks writers. In
+    rollback journal modes the source is only locked during each step, but
+    a write from another connection restarts the copy at its next step;
+    after max_restarts restarts the copy is redone in a single step, which
+    blocks writers for the whole copy but always finishes.
+    """
+    stats = {"steps": 0, "restarts": 0, "pages": 0, "single_step": False}
+    last_remaining = None
+    
+    def progress(status, remaining, total):
+        nonlocal last_remaining
+        stats["steps"] += 1
+        stats["pages"] = total
+        if last_remaining is not None and remaining > last_remaining:
+            stats["restarts"] += 1
+            if stats["restarts"] > max_restarts:
+                raise BackupRestarted()
+        last_remaining = remaining
+        # The source lock is released between steps; the backup API itself
+        # only sleeps when the source is busy
+        if remaining and step_sleep:
+            time.sleep(step_sleep)
+    
+    source = sqlite3.connect(source_path, timeout=30, isolation_level=None)
+    try:
+        if source.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+            # Pin one read snapshot for the whole copy: WAL writers are never
+            # blocked by it and their commits no longer restart the copy
+            source.execute("BEGIN")
+            source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        target = sqlite3.connect(target_path)
+        try:
+            try:
+                source.backup(target, pages=pages, progress=progress)
+            except BackupRestarted:
+                stats["single_step"] = True
+                source.backup(target, pages=-1)
+        finally:
+            target.close()
+    finally:
+        source.close()
+    return stats
+
+
+def verify_backup(path: str) -> None:
+    """Run an integrity check on a backup, raising BackupError on failure."""
+    conn = sqlite3.connect(path)
+    try:
+        result = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    finally:
+        conn.close()
+    if result != ["ok"]:
+        raise BackupError(f"Integrity check failed for {path}: {'; '.join(result[:5])}")
+
+
+def compress_backup(path: str) -> str:
+    """Gzip a backup file in place and return the new path."""
+    compressed = f"{path}.gz"
+    with open(path, "rb") as source, gzip.open(f"{compressed}.tmp", "wb", compresslevel=6) as target:
+        shutil.copyfileobj(source, target, 1024 * 1024)
+    os.replace(f"{compressed}.tmp", compressed)
+    os.remove(path)
+    return compressed
+
+
+def rotate_backups(directory: str = BACKUP_DIR, keep: int = KEEP_BACKUPS) -> list[str]:
+    """Gzip every backup but the newest and delete those beyond keep. Returns deleted paths."""
+    backups = list_backups(directory)
+    for path in backups[1:keep]:
+        if path.endswith(".db"):
+            compress_backup(path)
+    for path in backups[keep:]:
+        os.remove(path)
+    return backups[keep:]
+
+
+def backup_database(
+    engine: Engine,
+    directory: str = BACKUP_DIR,
+    keep: int = KEEP_BACKUPS,
+    pages: int = BACKUP_PAGES,
+    step_sleep: float = BACKUP_STEP_SLEEP
+) -> dict:
+    """Back up the engine's database into directory and return a report.
+    
+    The report holds the backup path, its size, the copy and total
+    durations and the step statistics of copy_database.
+    """
+    source_path = _database_path(engine)
+    os.makedirs(directory, exist_ok=True)
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    path = os.path.join(directory, f"{name}-{datetime.now():%Y%m%d-%H%M%S}.db")
+    temp_path = f"{path}.tmp"
+    
+    start = time.perf_counter()
+    try:
+        report = copy_database(source_path, temp_path, pages, step_sleep)
+        copy_seconds = time.perf_counter() - start
+        verify_backup(temp_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, path)
+    deleted = rotate_backups(directory, keep)
+    
+    report.update({
+        "path": path,
+        "bytes": os.path.getsize(path),
+        "copy_seconds": copy_seconds,
+        "seconds": time.perf_counter() - start,
+        "deleted": len(deleted)
+    })
+    return report
+
+
+class BackupScheduler:
+    """Back up a database periodically from a daemon thread.
+    
+    A backup is due when the newest one in the directory is older than
+    the interval, so short app sessions still get one per interval.
+    """
+    
+    def __init__(
+        self,
+        engine: Engine,
+        interval: float = DEFAULT_INTERVAL,
+        directory: str = BACKUP_DIR,
+        keep: int = KEEP_BACKUPS
+    ):
+        self.engine = engine
+        self.interval = interval
+        self.directory = directory
+        self.keep = keep
+        self.last_report: Optional[dict] = None
+        self.last_error: Optional[Exception] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def seconds_until_due(self) -> float:
+        """Seconds until the next backup is due, 0 if it already is."""
+        backups = list_backups(self.directory)
+        if not backups:
+            return 0.0
+        age = (datetime.now() - _timestamp(os.path.basename(backups[0]))).total_seconds()
+        return max(0.0, self.interval - age)
+    
+    def start(self):
+        """Start the background thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="db-backup", daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = STOP_TIMEOUT):
+        """Ask the thread to stop and wait up to timeout for a backup in progress.
+        
+        The thread is a daemon, so a backup still running when the process
+        exits is dropped with its ``.tmp`` file and never listed as a backup.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def _run(self):
+        while not self._stop.wait(self.seconds_until_due()):
+            try:
+                self.last_report = backup_database(self.engine, self.directory, self.keep)
+                self.last_error = None
+            except Exception as e:
+                # Try again after a full interval rather than in a tight loop
+                self.last_error = e
+                if self._stop.wait(self.interval):
+                    break
+
+
+def start_scheduler(engine: Engine) -> Optional[BackupScheduler]:
+    """Start scheduled backups if enabled by environment variables.
+    
+    Scheduling is opt-in: ``PHANTOM_BACKUP_INTERVAL`` sets the seconds
+    between backups, and unset or 0 leaves them off. ``PHANTOM_BACKUP_DIR``
+    and ``PHANTOM_BACKUP_KEEP`` set the directory and the number of
+    backups kept.
+    """
+    interval = float(os.environ.get("PHANTOM_BACKUP_INTERVAL") or 0)
+    if interval <= 0:
+        return None
+    scheduler = BackupScheduler(
+        engine,
+        interval,
+        os.environ.get("PHANTOM_BACKUP_DIR", BACKUP_DIR),
+        int(os.environ.get("PHANTOM_BACKUP_KEEP", KEEP_BACKUPS))
+    )
+    scheduler.start()
+    return scheduler
+
+
+def main():
+    """Command line entry point for backups."""
+    import argparse
+    from db.database import engine
+    
+    parser = argparse.ArgumentParser(description="Back up the database while the app is running.")
+    parser.add_argument("--dir", default=BACKUP_DIR, help="Backup directory")
+    parser.add_argument("--keep", type=int, default=KEEP_BACKUPS, help="Backups kept after rotation")
+    parser.add_argument("--pages", type=int, default=BACKUP_PAGES, help="Pages copied per step")
+    parser.add_argument("--list", action="store_true", help="List existing backups and exit")
+    args = parser.parse_args()
+    
+    if args.list:
+        for path in list_backups(args.dir):
+            print(f"   {os.path.basename(path)} ({os.path.getsize(path) / 1024 / 1024:.1f} MiB)")
+        return
+    
+    report = backup_database(engine, args.dir, args.keep, args.pages)
+    print(
+        f"✅ Backup written to {report['path']} in {report['seconds']:.2f}s "
+        f"({report['steps']} steps, {report['restarts']} restarts, integrity ok)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Database configuration and session management."""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from typing import Optional
 import os
 
 # Base per i modelli
@@ -9,9 +10,144 @@ Base = declarative_base()
 # Path del database
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "phantom_thieves.db")
 DATABASE_URL = f"sqlite:///{DB_PATH}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
+
+# SQLite pragma profiles applied to every new connection
+PERFORMANCE_PROFILES = {
+    # SQLite defaults: rollback journal and an fsync on every commit
+    "safe": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,  # KiB when negative
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,  # ms
+    },
+    # WAL lets readers run alongside the writer; NORMAL only fsyncs on checkpoint
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 128 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # No fsync at all: the last commits may be lost on power failure
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+DEFAULT_PROFILE = "balanced"
+
+# Accepted values per pragma: a set of keywords, or int for numeric pragmas
+PRAGMA_VALUES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA", "0", "1", "2", "3"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY", "0", "1", "2"},
+    "cache_size": int,
+    "mmap_size": int,
+    "busy_timeout": int,
+}
+NON_NEGATIVE_PRAGMAS = {"mmap_size", "busy_timeout"}
+
+
+def validate_pragma(pragma: str, value):
+    """Check a pragma value against PRAGMA_VALUES and return it normalized.
+    
+    Values end up in the PRAGMA statement text, so anything else is
+    rejected with a ValueError instead of being run as SQL.
+    """
+    allowed = PRAGMA_VALUES.get(pragma)
+    if allowed is None:
+        raise ValueError(f"Unsupported pragma '{pragma}'. Choose from: {', '.join(PRAGMA_VALUES)}")
+    if allowed is int:
+        try:
+            number = int(str(value).strip())
+        except ValueError:
+            raise ValueError(f"PRAGMA {pragma} needs an integer, got {value!r}") from None
+        if number < 0 and pragma in NON_NEGATIVE_PRAGMAS:
+            raise ValueError(f"PRAGMA {pragma} cannot be negative, got {value!r}")
+        return number
+    keyword = str(value).strip().upper()
+    if keyword not in allowed:
+        raise ValueError(f"Invalid PRAGMA {pragma} value {value!r}. Choose from: {', '.join(sorted(allowed))}")
+    return keyword
+
+
+def get_profile_settings(profile: Optional[str] = None, **overrides) -> dict:
+    """Resolve pragma settings for a profile.
+    
+    The profile defaults to ``PHANTOM_DB_PROFILE``; single pragmas can be
+    overridden with ``PHANTOM_DB_<PRAGMA>`` variables or keyword arguments,
+    validated by validate_pragma.
+    """
+    profile = profile or os.environ.get("PHANTOM_DB_PROFILE", DEFAULT_PROFILE)
+    if profile not in PERFORMANCE_PROFILES:
+        raise ValueError(f"Unknown database profile '{profile}'. Choose from: {', '.join(PERFORMANCE_PROFILES)}")
+    
+    settings = dict(PERFORMANCE_PROFILES[profile])
+    for pragma in settings:
+        env_value = os.environ.get(f"PHANTOM_DB_{pragma.upper()}")
+        if env_value is not None:
+            settings[pragma] = env_value
+    settings.update(overrides)
+    return {pragma: validate_pragma(pragma, value) for pragma, value in settings.items()}
+
+
+def apply_performance_profile(engine, profile: Optional[str] = None, **overrides):
+    """Apply a pragma profile to every connection the engine opens."""
+    settings = get_profile_settings(profile, **overrides)
+    
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in settings.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+    
+    return settings
+
+
+def create_db_engine(url: str = DATABASE_URL, profile: Optional[str] = None, **overrides):
+    """Create a SQLite engine with a performance profile applied."""
+    db_engine = create_engine(url, echo=False, connect_args={"check_same_thread": False})
+    apply_performance_profile(db_engine, profile, **overrides)
+    return db_engine
+
+
+def create_async_db_engine(url: str = ASYNC_DATABASE_URL, profile: Optional[str] = None, **overrides):
+    """Create an aiosqlite-backed async engine with a performance profile applied."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    async_engine = create_async_engine(url, echo=False)
+    apply_performance_profile(async_engine.sync_engine, profile, **overrides)
+    return async_engine
+
+
+def create_async_session_factory(async_engine=None):
+    """Create an async session factory.
+    
+    Objects stay loaded after commit so results can be used once the session
+    has closed.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    
+    return async_sessionmaker(
+        async_engine or create_async_db_engine(),
+        autoflush=False,
+        expire_on_commit=False
+    )
+
 
 # Engine e session factory
-engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -24,16 +160,26 @@ def get_db():
         db.close()
 
 
-def init_db():
-    """Initialize database with all tables."""
-    from models.user import User
-    from models.task import Task
-    from models.palace import Palace
+def init_db(bind=None):
+    """Initialize database with all tables.
+    
+    Applies pending migrations from db/migrations; a database that is
+    already up to date costs one query on schema_version, plus one on
+    users' columns.
+    """
+    from db.migrate import column_exists, current_version, latest_version, upgrade
     
-    Base.metadata.create_all(bind=engine)
-    print(f"✅ Database initialized at: {DB_PATH}")
+    bind = bind or engine
+    if current_version(bind) < latest_version():
+        upgrade(bind)
+    if not column_exists(bind, "users", "completed_tasks"):
+        # Recorded as migrated but without the counter (e.g. a schema_version
+        # table copied over an older file): add and backfill it regardless,
+        # since palace infiltration reads it
+        from db.migrations import v002_users_completed_tasks
+        v002_users_completed_tasks.upgrade(bind)
+    print(f"✅ Database initialized at: {bind.url.database}")
 
 
 if __name__ == "__main__":
     init_db()
-
@@ -0,0 +1,242 @@
+"""Versioned schema migrations recorded in a schema_version table."""
+import importlib
+import os
+import re
+import time
+from typing import Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+MIGRATION_FILE = re.compile(r"^v(\d{3})_(\w+)\.py$")
+BACKFILL_BATCH_SIZE = 5000  # Rows per backfill transaction
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "schema.sql")
+
+
+def discover() -> list[tuple[int, str]]:
+    """List (version, module name) of every migration, in order.
+    
+    Only reads file names, so checking for pending migrations is cheap.
+    """
+    migrations = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), filename[:-3]))
+    return sorted(migrations)
+
+
+def latest_version() -> int:
+    """Get the version the newest migration brings a database to."""
+    migrations = discover()
+    return migrations[-1][0] if migrations else 0
+
+
+def current_version(engine: Engine) -> int:
+    """Get the highest applied version, 0 for an unversioned database."""
+    with engine.connect() as conn:
+        try:
+            return conn.exec_driver_sql("SELECT MAX(version) FROM schema_version").scalar() or 0
+        except OperationalError:
+            return 0
+
+
+def upgrade(engine: Engine, target: Optional[int] = None, verbose: bool = False) -> list[int]:
+    """Apply pending migrations in order, up to target. Returns the versions applied."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER NOT NULL PRIMARY KEY,
+                name VARCHAR NOT NULL,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+    
+    applied = []
+    current = current_version(engine)
+    for version, name in discover():
+        if version <= current:
+            continue
+        if target is not None and version > target:
+            break
+        
+        start = time.perf_counter()
+        module = importlib.import_module(f"db.migrations.{name}")
+        module.upgrade(engine)
+        with engine.begin() as conn:
+            # Ignore a concurrent process having recorded it first
+            conn.exec_driver_sql(
+                "INSERT OR IGNORE INTO schema_version (version, name) VALUES (?, ?)",
+                (version, name)
+            )
+        applied.append(version)
+        if verbose:
+            print(f"   {name} ({time.perf_counter() - start:.2f}s)")
+    return applied
+
+
+def column_exists(engine: Engine, table: str, column: str) -> bool:
+    """Check whether a table has a column."""
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"PRAGMA table_info({table})").all()
+    return any(row[1] == column for row in rows)
+
+
+def batched_update(
+    engine: Engine,
+    table: str,
+    set_clause: str,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    pause: float = 0.0
+) -> int:
+    """Run ``UPDATE table SET set_clause`` over id ranges, one transaction each.
+    
+    The write lock is held for one batch at a time, so the app keeps
+    working during a backfill of a large table. Returns rows updated.
+    """
+    with engine.connect() as conn:
+        low, high = conn.exec_driver_sql(f"SELECT MIN(id), MAX(id) FROM {table}").one()
+    if low is None:
+        return 0
+    
+    updated = 0
+    for start in range(low, high + 1, batch_size):
+        with engine.begin() as conn:
+            updated += conn.exec_driver_sql(
+                f"UPDATE {table} SET {set_clause} WHERE id >= ? AND id < ?",
+                (start, start + batch_size)
+            ).rowcount
+        if pause:
+            time.sleep(pause)
+    return updated
+
+
+def schema_drift(engine: Engine) -> list[str]:
+    """Compare a migrated database with the ORM models.
+    
+    Returns one message per table, column or index that only one side has.
+    """
+    from sqlalchemy import inspect
+    import models  # noqa: F401  registers every model on Base
+    from db.database import Base
+    
+    inspector = inspect(engine)
+    differences = []
+    actual_tables = set(inspector.get_table_names()) - {"schema_version"}
+    for table in sorted(actual_tables - set(Base.metadata.tables)):
+        differences.append(f"table {table}: only in migrations")
+    for name, table in sorted(Base.metadata.tables.items()):
+        if name not in actual_tables:
+            differences.append(f"table {name}: only in models")
+            continue
+        columns = {column["name"] for column in inspector.get_columns(name)}
+        for column in sorted(columns ^ set(table.columns.keys())):
+            side = "migrations" if column in columns else "models"
+            differences.append(f"column {name}.{column}: only in {side}")
+        indexes = {index["name"] for index in inspector.get_indexes(name)}
+        for index in sorted(indexes ^ {index.name for index in table.indexes}):
+            side = "migrations" if index in indexes else "models"
+            differences.append(f"index {index}: only in {side}")
+    return differences
+
+
+SCHEMA_HEADER = """\
+-- Phantom Thieves HQ Database Schema
+-- SQLite Database
+-- Generated by `python -m db.migrate dump` from db/migrations; edit those instead.
+-- Safe to run against an existing database: every statement is IF NOT EXISTS.
+"""
+
+
+def _split_definitions(body: str) -> list[str]:
+    """Split a CREATE TABLE body on the commas outside parentheses."""
+    parts, depth, current = [], 0, []
+    for char in body:
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        current.append(char)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def format_statement(sql: str) -> str:
+    """Normalize a sqlite_master statement: IF NOT EXISTS and one column per line.
+    
+    SQLite keeps DDL as it was typed, so migration indentation and columns
+    appended by ALTER TABLE end up in it verbatim.
+    """
+    sql = re.sub(r"^CREATE (UNIQUE INDEX|INDEX|TABLE) (?!IF NOT EXISTS)", r"CREATE \1 IF NOT EXISTS ", sql.strip())
+    if not sql.startswith("CREATE TABLE"):
+        return " ".join(sql.split()) + ";"
+    head, body = sql[:sql.index("(")], sql[sql.index("(") + 1:sql.rindex(")")]
+    definitions = [" ".join(part.split()) for part in _split_definitions(body)]
+    return " ".join(head.split()) + " (\n" + ",\n".join(f"    {part}" for part in definitions) + "\n);"
+
+
+def dump_schema(engine: Engine) -> str:
+    """Render the DDL of a migrated database, as written to schema.sql.
+    
+    Tables come in creation order, each with its indexes, under a section
+    comment; schema_version comes last.
+    """
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(
+            "SELECT type, tbl_name, sql FROM sqlite_master WHERE sql IS NOT NULL "
+            "ORDER BY tbl_name = 'schema_version', rowid"
+        ).all()
+    tables: dict[str, str] = {}
+    indexes: dict[str, list[str]] = {}
+    for kind, table, sql in rows:
+        if kind == "table":
+            tables[table] = format_statement(sql)
+        else:
+            indexes.setdefault(table, []).append(format_statement(sql))
+    
+    blocks = [
+        "\n".join([f"-- {table.replace('_', ' ').capitalize()} table", statement, *indexes.get(table, [])])
+        for table, statement in tables.items()
+    ]
+    return SCHEMA_HEADER + "\n" + "\n\n".join(blocks) + "\n"
+
+
+def main():
+    """Command line entry point for migrations."""
+    import argparse
+    import sys
+    from sqlalchemy import create_engine
+    from db.database import engine
+    
+    parser = argparse.ArgumentParser(description="Manage the database schema version.")
+    parser.add_argument("command", choices=["status", "upgrade", "check", "dump"])
+    parser.add_argument("--target", type=int, help="Upgrade up to this version")
+    args = parser.parse_args()
+    
+    if args.command == "status":
+        current, latest = current_version(engine), latest_version()
+        print(f"Schema version {current}, latest {latest}")
+        for version, name in discover():
+            print(f"   {'✅' if version <= current else '⏳'} {name}")
+    elif args.command == "upgrade":
+        applied = upgrade(engine, args.target, verbose=True)
+        print(f"✅ Applied {len(applied)} migration(s), now at version {current_version(engine)}")
+    else:
+        scratch = create_engine("sqlite://")
+        upgrade(scratch)
+        if args.command == "dump":
+            with open(SCHEMA_PATH, "w", encoding="utf-8") as handle:
+                handle.write(dump_schema(scratch))
+            print(f"✅ Schema written to {SCHEMA_PATH}")
+        else:
+            differences = schema_drift(scratch)
+            for difference in differences:
+                print(f"❌ {difference}")
+            if differences:
+                sys.exit(1)
+            print("✅ Migrations match the models")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Ordered schema migrations, applied by db.migrate.
+
+Each ``vNNN_name.py`` module defines ``upgrade(engine)``. Migrations must
+be idempotent: they use IF NOT EXISTS and check before altering, so they
+can be re-run after an interruption and on databases created before
+versioning existed.
+"""
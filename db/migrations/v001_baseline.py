@@ -0,0 +1,72 @@
+"""Baseline tables: users, tasks, palaces and stats."""
+
+
+def upgrade(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER NOT NULL,
+                username VARCHAR NOT NULL,
+                created_at DATETIME,
+                total_exp INTEGER,
+                level INTEGER,
+                PRIMARY KEY (id)
+            )
+        """)
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_users_id ON users (id)")
+        conn.exec_driver_sql("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username)")
+        
+        conn.exec_driver_sql("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                title VARCHAR NOT NULL,
+                description VARCHAR,
+                category VARCHAR NOT NULL,
+                difficulty VARCHAR NOT NULL,
+                status VARCHAR,
+                exp_reward INTEGER,
+                stat_boost VARCHAR,
+                deadline DATE,
+                completed_at DATETIME,
+                created_at DATETIME,
+                PRIMARY KEY (id),
+                FOREIGN KEY(user_id) REFERENCES users (id)
+            )
+        """)
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tasks_id ON tasks (id)")
+        
+        conn.exec_driver_sql("""
+            CREATE TABLE IF NOT EXISTS palaces (
+                id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                name VARCHAR NOT NULL,
+                description VARCHAR,
+                infiltration_percentage FLOAT,
+                boss_name VARCHAR,
+                deadline DATE,
+                status VARCHAR,
+                created_at DATETIME,
+                completed_at DATETIME,
+                PRIMARY KEY (id),
+                FOREIGN KEY(user_id) REFERENCES users (id)
+            )
+        """)
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_palaces_id ON palaces (id)")
+        
+        conn.exec_driver_sql("""
+            CREATE TABLE IF NOT EXISTS stats (
+                id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                knowledge INTEGER,
+                guts INTEGER,
+                proficiency INTEGER,
+                kindness INTEGER,
+                charm INTEGER,
+                updated_at DATETIME,
+                PRIMARY KEY (id),
+                UNIQUE (user_id),
+                FOREIGN KEY(user_id) REFERENCES users (id)
+            )
+        """)
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_stats_id ON stats (id)")
@@ -0,0 +1,33 @@
+"""Completed task counter on users, backfilled in batches."""
+from db.migrate import batched_update, column_exists
+
+INFILTRATION_PER_TASK = 0.5  # PalaceEngine.INFILTRATION_PER_TASK when this was written
+
+
+def upgrade(engine):
+    # Adding a nullable column only rewrites the table definition
+    if not column_exists(engine, "users", "completed_tasks"):
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ALTER TABLE users ADD COLUMN completed_tasks INTEGER DEFAULT 0")
+    
+    # Rows completed while this runs are counted: each batch recounts at commit
+    batched_update(engine, "users", """
+        completed_tasks = (
+            SELECT COUNT(tasks.id) FROM tasks
+            WHERE tasks.user_id = users.id AND tasks.status = 'completed'
+        )
+    """)
+    
+    # Columns added by hand default to 0, and palaces updated since then
+    # lost infiltration; recompute active ones from the backfilled counter
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"""
+            UPDATE palaces SET infiltration_percentage = MIN(100.0, (
+                SELECT users.completed_tasks * {INFILTRATION_PER_TASK} FROM users WHERE users.id = palaces.user_id
+            ))
+            WHERE status = 'active'
+        """)
+        conn.exec_driver_sql("""
+            UPDATE palaces SET status = 'completed', completed_at = datetime('now', 'localtime')
+            WHERE status = 'active' AND infiltration_percentage >= 100.0
+        """)
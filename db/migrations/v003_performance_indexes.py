@@ -0,0 +1,13 @@
+"""Composite indexes for the pending/overdue lists, task history and palaces."""
+
+
+def upgrade(engine):
+    # SQLite builds each index under the write lock; one transaction per index
+    # keeps every lock as short as that index's build
+    for statement in [
+        "CREATE INDEX IF NOT EXISTS ix_tasks_user_status_deadline ON tasks (user_id, status, deadline)",
+        "CREATE INDEX IF NOT EXISTS ix_tasks_user_created ON tasks (user_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_palaces_user_status ON palaces (user_id, status)",
+    ]:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(statement)
@@ -0,0 +1,24 @@
+"""Progress history event log."""
+
+
+def upgrade(engine):
+    # Databases created from the old schema.sql may already have the table
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE IF NOT EXISTS progress_history (
+                id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                stat_name VARCHAR NOT NULL,
+                old_value INTEGER,
+                new_value INTEGER,
+                change_reason VARCHAR,
+                created_at DATETIME,
+                PRIMARY KEY (id),
+                FOREIGN KEY(user_id) REFERENCES users (id)
+            )
+        """)
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_progress_history_id ON progress_history (id)")
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_progress_history_user_stat_created "
+            "ON progress_history (user_id, stat_name, created_at)"
+        )
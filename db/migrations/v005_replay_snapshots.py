@@ -0,0 +1,25 @@
+"""Replay snapshots and the completion-order index replays read."""
+
+
+def upgrade(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE IF NOT EXISTS replay_snapshots (
+                id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                last_completed_at VARCHAR,
+                last_task_id INTEGER NOT NULL,
+                task_count INTEGER NOT NULL,
+                counts JSON NOT NULL,
+                created_at DATETIME,
+                PRIMARY KEY (id),
+                FOREIGN KEY(user_id) REFERENCES users (id)
+            )
+        """)
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_replay_snapshots_id ON replay_snapshots (id)")
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_replay_snapshots_user_id ON replay_snapshots (user_id, id)")
+    
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_user_status_completed ON tasks (user_id, status, completed_at)"
+        )
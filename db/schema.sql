@@ -1,79 +1,110 @@
 -- Phantom Thieves HQ Database Schema
 -- SQLite Database
+-- Generated by `python -m db.migrate dump` from db/migrations; edit those instead.
+-- Safe to run against an existing database: every statement is IF NOT EXISTS.
 
 -- Users table
 CREATE TABLE IF NOT EXISTS users (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    username TEXT UNIQUE NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    total_exp INTEGER DEFAULT 0,
-    level INTEGER DEFAULT 1
+    id INTEGER NOT NULL,
+    username VARCHAR NOT NULL,
+    created_at DATETIME,
+    total_exp INTEGER,
+    level INTEGER,
+    completed_tasks INTEGER DEFAULT 0,
+    PRIMARY KEY (id)
 );
+CREATE INDEX IF NOT EXISTS ix_users_id ON users (id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username);
 
 -- Tasks table
 CREATE TABLE IF NOT EXISTS tasks (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id INTEGER NOT NULL,
     user_id INTEGER NOT NULL,
-    title TEXT NOT NULL,
-    description TEXT,
-    category TEXT NOT NULL,
-    difficulty TEXT NOT NULL,
-    status TEXT DEFAULT 'pending',
-    exp_reward INTEGER DEFAULT 0,
-    stat_boost TEXT,
+    title VARCHAR NOT NULL,
+    description VARCHAR,
+    category VARCHAR NOT NULL,
+    difficulty VARCHAR NOT NULL,
+    status VARCHAR,
+    exp_reward INTEGER,
+    stat_boost VARCHAR,
     deadline DATE,
-    completed_at TIMESTAMP,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id)
+    completed_at DATETIME,
+    created_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
 );
+CREATE INDEX IF NOT EXISTS ix_tasks_id ON tasks (id);
+CREATE INDEX IF NOT EXISTS ix_tasks_user_status_deadline ON tasks (user_id, status, deadline);
+CREATE INDEX IF NOT EXISTS ix_tasks_user_created ON tasks (user_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_tasks_user_status_completed ON tasks (user_id, status, completed_at);
 
 -- Palaces table
 CREATE TABLE IF NOT EXISTS palaces (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id INTEGER NOT NULL,
     user_id INTEGER NOT NULL,
-    name TEXT NOT NULL,
-    description TEXT,
-    infiltration_percentage REAL DEFAULT 0.0,
-    boss_name TEXT,
+    name VARCHAR NOT NULL,
+    description VARCHAR,
+    infiltration_percentage FLOAT,
+    boss_name VARCHAR,
     deadline DATE,
-    status TEXT DEFAULT 'active',
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    completed_at TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id)
+    status VARCHAR,
+    created_at DATETIME,
+    completed_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
 );
+CREATE INDEX IF NOT EXISTS ix_palaces_id ON palaces (id);
+CREATE INDEX IF NOT EXISTS ix_palaces_user_status ON palaces (user_id, status);
 
 -- Stats table
 CREATE TABLE IF NOT EXISTS stats (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id INTEGER NOT NULL UNIQUE,
-    knowledge INTEGER DEFAULT 0,
-    guts INTEGER DEFAULT 0,
-    proficiency INTEGER DEFAULT 0,
-    kindness INTEGER DEFAULT 0,
-    charm INTEGER DEFAULT 0,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id)
-);
-
--- Achievements table
-CREATE TABLE IF NOT EXISTS achievements (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id INTEGER NOT NULL,
     user_id INTEGER NOT NULL,
-    name TEXT NOT NULL,
-    description TEXT,
-    unlocked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id)
+    knowledge INTEGER,
+    guts INTEGER,
+    proficiency INTEGER,
+    kindness INTEGER,
+    charm INTEGER,
+    updated_at DATETIME,
+    PRIMARY KEY (id),
+    UNIQUE (user_id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
 );
+CREATE INDEX IF NOT EXISTS ix_stats_id ON stats (id);
 
 -- Progress history table
 CREATE TABLE IF NOT EXISTS progress_history (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id INTEGER NOT NULL,
     user_id INTEGER NOT NULL,
-    stat_name TEXT NOT NULL,
+    stat_name VARCHAR NOT NULL,
     old_value INTEGER,
     new_value INTEGER,
-    change_reason TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id)
+    change_reason VARCHAR,
+    created_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE INDEX IF NOT EXISTS ix_progress_history_id ON progress_history (id);
+CREATE INDEX IF NOT EXISTS ix_progress_history_user_stat_created ON progress_history (user_id, stat_name, created_at);
+
+-- Replay snapshots table
+CREATE TABLE IF NOT EXISTS replay_snapshots (
+    id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    last_completed_at VARCHAR,
+    last_task_id INTEGER NOT NULL,
+    task_count INTEGER NOT NULL,
+    counts JSON NOT NULL,
+    created_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
 );
+CREATE INDEX IF NOT EXISTS ix_replay_snapshots_id ON replay_snapshots (id);
+CREATE INDEX IF NOT EXISTS ix_replay_snapshots_user_id ON replay_snapshots (user_id, id);
 
+-- Schema version table
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER NOT NULL PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
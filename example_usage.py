@@ -87,11 +87,8 @@ def example_usage():
     
     # Show stats
     console.print("\n[bold green]5. Current Statistics:[/bold green]")
-    stats = game_state.get_user_stats()
     from core.stats_engine import StatsEngine
-    stats_summary = StatsEngine.get_stats_summary(
-        StatsEngine.get_or_create_stats(db, user.id)
-    )
+    stats_summary = game_state.get_user_stats()
     
     for stat_name, value in stats_summary.items():
         if stat_name != "Total":
@@ -3,6 +3,9 @@ from models.user import User
 from models.task import Task
 from models.palace import Palace
 from models.stats import Stats
+from models.progress_history import ProgressHistory
+from models.replay_snapshot import ReplaySnapshot
+from models.projections import TaskRow, PalaceRow
 
-__all__ = ["User", "Task", "Palace", "Stats"]
+__all__ = ["User", "Task", "Palace", "Stats", "ProgressHistory", "ReplaySnapshot", "TaskRow", "PalaceRow"]
 
@@ -1,5 +1,5 @@
 """Palace model."""
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from db.database import Base
 from datetime import date
@@ -17,6 +17,9 @@ class Palace(Base):
     """Palace model representing a major goal."""
     
     __tablename__ = "palaces"
+    __table_args__ = (
+        Index("ix_palaces_user_status", "user_id", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,24 @@
+"""Progress history model."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, func
+from db.database import Base
+
+
+class ProgressHistory(Base):
+    """Append-only log of stat, EXP, level and palace changes."""
+    
+    __tablename__ = "progress_history"
+    __table_args__ = (
+        # History of one stat per user over time
+        Index("ix_progress_history_user_stat_created", "user_id", "stat_name", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    stat_name = Column(String, nullable=False)  # A Stats name, "exp", "level" or "palace:<id>"
+    old_value = Column(Integer)
+    new_value = Column(Integer)
+    change_reason = Column(String)
+    created_at = Column(DateTime, default=func.now())
+    
+    def __repr__(self):
+        return f"<ProgressHistory(user_id={self.user_id}, {self.stat_name}: {self.old_value} -> {self.new_value})>"
@@ -0,0 +1,45 @@
+"""Read-only row projections for list views."""
+from datetime import date
+from typing import NamedTuple, Optional
+from models.task import Task
+from models.palace import Palace
+
+
+class TaskRow(NamedTuple):
+    """The columns of a Task that list views show, as a plain tuple.
+    
+    Rows are not tracked by any session, so loading them skips the identity
+    map and change tracking, and they never lazy-load after a commit.
+    """
+    id: int
+    title: str
+    category: str
+    difficulty: str
+    status: str
+    deadline: Optional[date]
+    exp_reward: int
+    
+    is_overdue = Task.is_overdue
+    
+    @classmethod
+    def columns(cls) -> list:
+        """Get the Task columns to select, in field order."""
+        return [getattr(Task, name) for name in cls._fields]
+
+
+class PalaceRow(NamedTuple):
+    """The columns of a Palace that list views show, as a plain tuple."""
+    id: int
+    name: str
+    infiltration_percentage: float
+    boss_name: Optional[str]
+    deadline: Optional[date]
+    status: str
+    
+    days_remaining = Palace.days_remaining
+    is_overdue = Palace.is_overdue
+    
+    @classmethod
+    def columns(cls) -> list:
+        """Get the Palace columns to select, in field order."""
+        return [getattr(Palace, name) for name in cls._fields]
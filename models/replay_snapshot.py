@@ -0,0 +1,27 @@
+"""Replay snapshot model."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, JSON, func
+from db.database import Base
+
+
+class ReplaySnapshot(Base):
+    """Checkpoint of a replay: completed task counts up to a cursor.
+    
+    Counts are kept per (category, difficulty) rather than as derived
+    values, so a snapshot stays valid when the reward tables change.
+    """
+    
+    __tablename__ = "replay_snapshots"
+    __table_args__ = (
+        Index("ix_replay_snapshots_user_id", "user_id", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    last_completed_at = Column(String)  # Raw completed_at of the cursor task
+    last_task_id = Column(Integer, nullable=False)
+    task_count = Column(Integer, nullable=False)
+    counts = Column(JSON, nullable=False)  # [[category, difficulty, count], ...]
+    created_at = Column(DateTime, default=func.now())
+    
+    def __repr__(self):
+        return f"<ReplaySnapshot(user_id={self.user_id}, tasks={self.task_count}, last_task_id={self.last_task_id})>"
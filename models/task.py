@@ -1,5 +1,5 @@
 """Task model."""
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from db.database import Base
 from datetime import date
@@ -35,6 +35,14 @@ class Task(Base):
     """Task model representing a mission."""
     
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Pending/overdue lists and completed counts per user
+        Index("ix_tasks_user_status_deadline", "user_id", "status", "deadline"),
+        # Task history per user, newest first
+        Index("ix_tasks_user_created", "user_id", "created_at"),
+        # Completed tasks per user in completion order, for replays
+        Index("ix_tasks_user_status_completed", "user_id", "status", "completed_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -52,18 +60,25 @@ class Task(Base):
     # Relationships
     user = relationship("User", back_populates="tasks")
     
+    EXP_REWARD_MAP = {
+        TaskDifficulty.EASY.value: 10,
+        TaskDifficulty.MEDIUM.value: 25,
+        TaskDifficulty.HARD.value: 50,
+        TaskDifficulty.EXTREME.value: 100
+    }
+    DEFAULT_EXP_REWARD = 10
+    
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status}')>"
     
+    @classmethod
+    def exp_reward_for(cls, difficulty: str) -> int:
+        """Get the EXP reward for a difficulty."""
+        return cls.EXP_REWARD_MAP.get(difficulty, cls.DEFAULT_EXP_REWARD)
+    
     def calculate_exp_reward(self):
         """Calculate EXP reward based on difficulty."""
-        exp_map = {
-            TaskDifficulty.EASY.value: 10,
-            TaskDifficulty.MEDIUM.value: 25,
-            TaskDifficulty.HARD.value: 50,
-            TaskDifficulty.EXTREME.value: 100
-        }
-        self.exp_reward = exp_map.get(self.difficulty, 10)
+        self.exp_reward = self.exp_reward_for(self.difficulty)
         return self.exp_reward
     
     def is_overdue(self) -> bool:
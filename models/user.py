@@ -1,6 +1,6 @@
 """User model."""
 from sqlalchemy import Column, Integer, String, DateTime, func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, object_session
 from db.database import Base
 
 
@@ -14,6 +14,7 @@ class User(Base):
     created_at = Column(DateTime, default=func.now())
     total_exp = Column(Integer, default=0)
     level = Column(Integer, default=1)
+    completed_tasks = Column(Integer, default=0)  # Maintained by the completion path
     
     # Relationships
     tasks = relationship("Task", back_populates="user", cascade="all, delete-orphan")
@@ -23,13 +24,25 @@ class User(Base):
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', level={self.level})>"
     
-    def add_exp(self, amount: int):
+    def add_exp(self, amount: int, reason: str = "task_completed"):
         """Add experience points and level up if needed."""
+        from core.event_log import EventLog
+        db = object_session(self)
+        old_exp, old_level = self.total_exp, self.level
+        
         self.total_exp += amount
+        if db is not None:
+            EventLog.record(db, self.id, "exp", old_exp, self.total_exp, reason)
         # Level up every 100 EXP
         new_level = (self.total_exp // 100) + 1
         if new_level > self.level:
             self.level = new_level
+            if db is not None:
+                EventLog.record(db, self.id, "level", old_level, new_level, EventLog.LEVEL_UP)
             return True  # Leveled up
         return False
+    
+    def add_completed_tasks(self, count: int = 1):
+        """Increment the completed task counter."""
+        self.completed_tasks = (self.completed_tasks or 0) + count
 
@@ -0,0 +1,23 @@
+"""Shared fixtures: throwaway databases built by db/migrations."""
+import pytest
+from benchmarks.common import create_temp_database, drop_temp_database
+
+
+@pytest.fixture
+def database():
+    """(engine, session_factory) of a fresh migrated database."""
+    engine, session_factory, path = create_temp_database(migrate=True)
+    try:
+        yield engine, session_factory
+    finally:
+        drop_temp_database(engine, path)
+
+
+@pytest.fixture
+def db(database):
+    """A session on a fresh migrated database."""
+    session = database[1]()
+    try:
+        yield session
+    finally:
+        session.close()
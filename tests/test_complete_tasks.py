@@ -0,0 +1,99 @@
+"""GameState.complete_tasks must match one complete_task call per task."""
+import itertools
+import pytest
+from core.game_loop import GameState
+from core.palace_engine import PalaceEngine
+from models.palace import Palace
+from models.stats import Stats
+from models.task import Task, TaskStatus
+from benchmarks.common import CATEGORIES, DIFFICULTIES
+
+# Enough tasks to level up, cap a stat at MAX_STAT and complete palaces (0.5% each)
+TASK_COUNT = 210
+
+
+def create_player(db, username: str, tasks: int = TASK_COUNT, palaces: int = 2) -> tuple[GameState, list[int]]:
+    game_state = GameState(db)
+    game_state.create_user(username)
+    kinds = itertools.cycle(itertools.product(CATEGORIES, DIFFICULTIES))
+    task_ids = [game_state.create_task(f"Task {i}", *next(kinds)).id for i in range(tasks)]
+    for i in range(palaces):
+        game_state.create_palace(f"Palace {i}")
+    return game_state, task_ids
+
+
+def player_state(db, game_state: GameState) -> dict:
+    user = game_state.current_user
+    db.refresh(user)
+    stats = db.query(Stats).filter(Stats.user_id == user.id).one()
+    return {
+        "exp": user.total_exp,
+        "level": user.level,
+        "completed_tasks": user.completed_tasks,
+        "stats": {name: stats.get_stat(name) for name in Stats.STAT_NAMES},
+        "palaces": db.query(Palace.infiltration_percentage, Palace.status).filter(
+            Palace.user_id == user.id
+        ).order_by(Palace.id).all(),
+        "tasks": db.query(Task.status, Task.stat_boost, Task.exp_reward).filter(
+            Task.user_id == user.id
+        ).order_by(Task.id).all()
+    }
+
+
+def test_matches_sequential_complete_task(db):
+    sequential, sequential_ids = create_player(db, "sequential")
+    bulk, bulk_ids = create_player(db, "bulk")
+    
+    for task_id in sequential_ids:
+        sequential.complete_task(task_id)
+    results = bulk.complete_tasks(bulk_ids)
+    
+    expected = player_state(db, sequential)
+    assert player_state(db, bulk) == expected
+    assert expected["completed_tasks"] == TASK_COUNT
+    assert max(expected["stats"].values()) == Stats.MAX_STAT
+    assert all(status == "completed" for _, status in expected["palaces"])
+    assert [result["task_id"] for result in results] == bulk_ids
+    assert sum(result["exp_gained"] for result in results) == expected["exp"]
+
+
+def test_duplicates_and_completed_ids_count_once(db):
+    game_state, task_ids = create_player(db, "joker", tasks=4)
+    game_state.complete_task(task_ids[0])
+    
+    requested = [task_ids[0], task_ids[1], task_ids[2], task_ids[1], task_ids[2]]
+    results = game_state.complete_tasks(requested)
+    
+    assert [result["task_id"] for result in results] == requested
+    assert [result.get("message") for result in results] == [
+        "Task already completed", None, None, "Task already completed", "Task already completed"
+    ]
+    state = player_state(db, game_state)
+    assert state["completed_tasks"] == 3
+    assert [status for status, _, _ in state["tasks"]] == ["completed"] * 3 + ["pending"]
+
+
+def test_foreign_user_tasks_are_rejected(db):
+    owner, owner_ids = create_player(db, "owner", tasks=2)
+    intruder, intruder_ids = create_player(db, "intruder", tasks=2)
+    before = player_state(db, intruder)
+    
+    with pytest.raises(ValueError, match="Tasks not found"):
+        intruder.complete_tasks([intruder_ids[0], owner_ids[0]])
+    
+    assert player_state(db, intruder) == before
+    assert db.get(Task, owner_ids[0]).status == TaskStatus.PENDING.value
+
+
+def test_failure_mid_batch_rolls_back(db, monkeypatch):
+    game_state, task_ids = create_player(db, "joker", tasks=5)
+    before = player_state(db, game_state)
+    
+    def fail(*args, **kwargs):
+        raise RuntimeError("palace update failed")
+    
+    monkeypatch.setattr(PalaceEngine, "update_active_palaces", fail)
+    with pytest.raises(RuntimeError):
+        game_state.complete_tasks(task_ids)
+    
+    assert player_state(db, game_state) == before
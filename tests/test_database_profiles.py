@@ -0,0 +1,42 @@
+"""PHANTOM_DB_* values are validated before they reach a PRAGMA statement."""
+import pytest
+from db.database import PERFORMANCE_PROFILES, create_db_engine, get_profile_settings
+
+
+@pytest.mark.parametrize("profile", list(PERFORMANCE_PROFILES))
+def test_builtin_profiles_are_valid(profile):
+    assert get_profile_settings(profile).keys() == PERFORMANCE_PROFILES[profile].keys()
+
+
+def test_environment_overrides_are_normalized(monkeypatch):
+    monkeypatch.setenv("PHANTOM_DB_SYNCHRONOUS", " full ")
+    monkeypatch.setenv("PHANTOM_DB_CACHE_SIZE", "-8000")
+    settings = get_profile_settings("balanced")
+    assert settings["synchronous"] == "FULL"
+    assert settings["cache_size"] == -8000
+
+
+@pytest.mark.parametrize("variable, value", [
+    ("PHANTOM_DB_JOURNAL_MODE", "wal; DROP TABLE users"),
+    ("PHANTOM_DB_SYNCHRONOUS", "sometimes"),
+    ("PHANTOM_DB_CACHE_SIZE", "1; PRAGMA foreign_keys=OFF"),
+    ("PHANTOM_DB_MMAP_SIZE", "-1"),
+    ("PHANTOM_DB_BUSY_TIMEOUT", "5s"),
+])
+def test_invalid_environment_values_raise(monkeypatch, variable, value):
+    monkeypatch.setenv(variable, value)
+    with pytest.raises(ValueError, match="PRAGMA"):
+        get_profile_settings("balanced")
+
+
+def test_unknown_override_raises():
+    with pytest.raises(ValueError, match="Unsupported pragma"):
+        get_profile_settings("safe", foreign_keys="ON")
+
+
+def test_engine_applies_validated_pragmas(tmp_path, monkeypatch):
+    monkeypatch.setenv("PHANTOM_DB_BUSY_TIMEOUT", "1234")
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'profile.db'}", "safe")
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 1234
+    engine.dispose()
@@ -0,0 +1,72 @@
+"""Buffered progress events must follow the fate of their transaction."""
+from core.event_log import EventLog
+from core.game_loop import GameState
+from models.progress_history import ProgressHistory
+from models.user import User
+
+
+def history(db) -> list[tuple]:
+    return db.query(
+        ProgressHistory.stat_name, ProgressHistory.old_value, ProgressHistory.new_value
+    ).order_by(ProgressHistory.id).all()
+
+
+def create_user(db) -> User:
+    user = GameState(db).create_user("haru")
+    db.commit()
+    return user
+
+
+def test_commit_writes_buffered_events(db):
+    user = create_user(db)
+    user.add_exp(500)
+    assert EventLog.pending(db) == 2
+    db.commit()
+    
+    assert EventLog.pending(db) == 0
+    assert history(db) == [("exp", 0, 500), ("level", 1, 6)]
+
+
+def test_rollback_discards_buffered_events(db):
+    user = create_user(db)
+    user.add_exp(500)
+    db.rollback()
+    
+    assert EventLog.pending(db) == 0
+    db.commit()
+    assert history(db) == []
+    assert db.get(User, user.id).total_exp == 0
+
+
+def test_close_without_commit_discards_buffered_events(db):
+    user_id = create_user(db).id
+    db.get(User, user_id).add_exp(500)
+    db.close()
+    
+    # The session is reusable after close; its next commit must not write stale events
+    assert EventLog.pending(db) == 0
+    db.commit()
+    assert history(db) == []
+    assert db.get(User, user_id).total_exp == 0
+
+
+def test_events_recorded_outside_a_transaction_are_discarded_on_close(database):
+    db = database[1](expire_on_commit=False)
+    user = create_user(db)
+    assert not db.in_transaction()
+    user.add_exp(500)
+    db.close()
+    
+    db.commit()
+    assert history(db) == []
+    db.close()
+
+
+def test_savepoint_rollback_keeps_outer_events(db):
+    user = create_user(db)
+    user.add_exp(50)
+    with db.begin_nested() as savepoint:
+        savepoint.rollback()
+    db.commit()
+    
+    assert history(db) == [("exp", 0, 50)]
@@ -0,0 +1,142 @@
+"""Upgrading databases created before db/migrations existed."""
+import sqlite3
+import pytest
+from sqlalchemy import create_engine
+from db.database import init_db
+from db.migrate import current_version, latest_version, schema_drift, upgrade
+
+# db/schema.sql before completed_tasks and the migrations
+BASELINE_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    total_exp INTEGER DEFAULT 0,
+    level INTEGER DEFAULT 1
+);
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    category TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    status TEXT DEFAULT 'pending',
+    exp_reward INTEGER DEFAULT 0,
+    stat_boost TEXT,
+    deadline DATE,
+    completed_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+CREATE TABLE palaces (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    infiltration_percentage REAL DEFAULT 0.0,
+    boss_name TEXT,
+    deadline DATE,
+    status TEXT DEFAULT 'active',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+CREATE TABLE stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL UNIQUE,
+    knowledge INTEGER DEFAULT 0,
+    guts INTEGER DEFAULT 0,
+    proficiency INTEGER DEFAULT 0,
+    kindness INTEGER DEFAULT 0,
+    charm INTEGER DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+"""
+COMPLETED_BY_USER = {"ann": 30, "makoto": 0, "ryuji": 250}
+
+
+@pytest.fixture
+def baseline_path(tmp_path):
+    """A baseline-schema database with completed and pending tasks and one palace per user."""
+    path = str(tmp_path / "baseline.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    for username, completed in COMPLETED_BY_USER.items():
+        user_id = conn.execute("INSERT INTO users (username) VALUES (?)", (username,)).lastrowid
+        conn.executemany(
+            "INSERT INTO tasks (user_id, title, category, difficulty, status) VALUES (?, 'Task', 'Guts', 'Easy', ?)",
+            [(user_id, "completed")] * completed + [(user_id, "pending")] * 3
+        )
+        conn.execute("INSERT INTO palaces (user_id, name) VALUES (?, 'Palace')", (user_id,))
+    conn.commit()
+    conn.close()
+    return path
+
+
+def counters(engine) -> dict:
+    with engine.connect() as conn:
+        return dict(conn.exec_driver_sql("SELECT username, completed_tasks FROM users").all())
+
+
+def palaces(engine) -> dict:
+    with engine.connect() as conn:
+        return {
+            username: (infiltration, status)
+            for username, infiltration, status in conn.exec_driver_sql(
+                "SELECT username, infiltration_percentage, palaces.status "
+                "FROM palaces JOIN users ON users.id = palaces.user_id"
+            )
+        }
+
+
+def test_init_db_adds_counter_missing_despite_schema_version(baseline_path):
+    conn = sqlite3.connect(baseline_path)
+    conn.executescript("""
+        CREATE TABLE schema_version (version INTEGER PRIMARY KEY, name VARCHAR, applied_at DATETIME);
+        INSERT INTO schema_version VALUES (999, 'future', NULL);
+    """)
+    conn.close()
+    engine = create_engine(f"sqlite:///{baseline_path}")
+    
+    init_db(engine)
+    
+    assert counters(engine) == COMPLETED_BY_USER
+    assert palaces(engine) == {
+        "ann": (15.0, "active"), "makoto": (0.0, "active"), "ryuji": (100.0, "completed")
+    }
+    engine.dispose()
+
+
+def test_upgrade_recovers_counter_added_by_hand(baseline_path):
+    conn = sqlite3.connect(baseline_path)
+    conn.execute("ALTER TABLE users ADD COLUMN completed_tasks INTEGER DEFAULT 0")
+    conn.commit()
+    conn.close()
+    engine = create_engine(f"sqlite:///{baseline_path}")
+    
+    init_db(engine)
+    
+    assert counters(engine) == COMPLETED_BY_USER
+    assert palaces(engine)["ann"] == (15.0, "active")
+    engine.dispose()
+
+
+def test_upgrade_backfills_baseline_database(baseline_path):
+    engine = create_engine(f"sqlite:///{baseline_path}")
+    assert current_version(engine) == 0
+    
+    assert upgrade(engine) == list(range(1, latest_version() + 1))
+    
+    with engine.connect() as conn:
+        completed = dict(conn.exec_driver_sql("""
+            SELECT users.username, COUNT(tasks.id) FROM users
+            LEFT JOIN tasks ON tasks.user_id = users.id AND tasks.status = 'completed'
+            GROUP BY users.id
+        """).all())
+    assert counters(engine) == completed == COMPLETED_BY_USER
+    assert palaces(engine)["ryuji"] == (100.0, "completed")
+    assert schema_drift(engine) == []
+    assert upgrade(engine) == []
+    engine.dispose()
@@ -0,0 +1,24 @@
+"""Hot queries must use indexes on a database built by db/migrations."""
+import pytest
+from benchmarks.common import create_temp_database, drop_temp_database
+from benchmarks.query_plans import HOT_QUERIES, find_regressions, query_plans, seed_game_state
+
+
+@pytest.fixture(scope="module")
+def migrated_game_state():
+    engine, session_factory, path = create_temp_database(migrate=True)
+    db = session_factory()
+    try:
+        yield engine, seed_game_state(db, users=20, tasks_per_user=50)
+    finally:
+        db.close()
+        drop_temp_database(engine, path)
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_indexes(migrated_game_state, name):
+    engine, game_state = migrated_game_state
+    plans = query_plans(engine, game_state, name)
+    assert plans, f"{name} sent no SQL"
+    for plan in plans:
+        assert not find_regressions(plan), f"{name}: {'; '.join(plan)}"
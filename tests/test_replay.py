@@ -0,0 +1,136 @@
+"""ReplayEngine must rebuild the state that task completion produced."""
+from sqlalchemy import func, select
+from core.game_loop import GameState
+from core.replay import ReplayEngine
+from models.palace import Palace
+from models.progress_history import ProgressHistory
+from models.replay_snapshot import ReplaySnapshot
+from models.stats import Stats
+from models.task import Task
+from tests.test_complete_tasks import create_player, player_state
+
+# Small chunks and snapshots so every test crosses several keyset pages
+CHUNK_SIZE = 4
+
+
+def replay(db, game_state: GameState, resume: bool = True) -> dict:
+    return ReplayEngine.replay_user(db, game_state.current_user.id, resume, CHUNK_SIZE, CHUNK_SIZE)
+
+
+def reset_derived_state(db, game_state: GameState):
+    """Zero everything a replay rebuilds."""
+    user = game_state.current_user
+    user.total_exp, user.level, user.completed_tasks = 0, 1, 0
+    stats = db.query(Stats).filter(Stats.user_id == user.id).one()
+    for name in Stats.STAT_NAMES:
+        setattr(stats, name, 0)
+    db.query(Palace).filter(Palace.user_id == user.id).update({"infiltration_percentage": 0.0})
+    db.commit()
+
+
+def clear_completed_at(db, task_ids: list[int]):
+    """Make tasks look completed before completed_at was recorded."""
+    db.query(Task).filter(Task.id.in_(task_ids)).update({"completed_at": None})
+    db.commit()
+
+
+def replay_events(db) -> int:
+    return db.query(func.count(ProgressHistory.id)).filter(
+        ProgressHistory.change_reason == ReplayEngine.REPLAY
+    ).scalar()
+
+
+def test_from_scratch_and_resumed_match_incremental_state(db):
+    game_state, task_ids = create_player(db, "joker", tasks=60)
+    game_state.complete_tasks(task_ids[:20])
+    for task_id in task_ids[20:40]:
+        game_state.complete_task(task_id)
+    expected = player_state(db, game_state)
+    reset_derived_state(db, game_state)
+    
+    report = replay(db, game_state, resume=False)
+    assert report["replayed"] == 40
+    assert player_state(db, game_state) == expected
+    
+    for task_id in task_ids[40:]:
+        game_state.complete_task(task_id)
+    expected = player_state(db, game_state)
+    
+    report = replay(db, game_state)
+    assert (report["resumed_from"], report["replayed"]) == (40, 20)
+    assert player_state(db, game_state) == expected
+    
+    from_scratch = replay(db, game_state, resume=False)
+    assert from_scratch["replayed"] == 60
+    assert from_scratch["stats"] == report["stats"]
+    assert from_scratch["total_exp"] == report["total_exp"] == expected["exp"]
+
+
+def test_resume_from_cursor_without_completed_at(db):
+    game_state, task_ids = create_player(db, "skull", tasks=30)
+    game_state.complete_tasks(task_ids[:10])
+    clear_completed_at(db, task_ids[:10])
+    replay(db, game_state, resume=False)
+    
+    snapshot = ReplayEngine.latest_snapshot(db, game_state.current_user.id)
+    assert (snapshot.last_completed_at, snapshot.last_task_id) == (None, task_ids[9])
+    
+    # Completed after the snapshot: dated tasks, and one more without a date
+    game_state.complete_tasks(task_ids[10:20])
+    game_state.complete_task(task_ids[20])
+    clear_completed_at(db, [task_ids[20]])
+    expected = player_state(db, game_state)
+    
+    report = replay(db, game_state)
+    assert (report["resumed_from"], report["replayed"]) == (10, 11)
+    assert player_state(db, game_state) == expected
+    assert replay_events(db) == 0
+
+
+def test_tasks_completed_between_snapshot_and_catch_up(database, db, monkeypatch):
+    game_state, task_ids = create_player(db, "panther", tasks=30)
+    game_state.complete_tasks(task_ids[:10])
+    iter_chunks = ReplayEngine.iter_chunks
+    
+    def complete_after_counting(db, user_id, after=None, chunk_size=50_000, commit=True):
+        yield from iter_chunks(db, user_id, after, chunk_size, commit)
+        if commit:
+            # Counting is done and snapshots are committed; another session completes more
+            other = database[1]()
+            try:
+                writer = GameState(other)
+                writer.load_user("panther")
+                writer.complete_tasks(task_ids[10:15])
+            finally:
+                other.close()
+    
+    monkeypatch.setattr(ReplayEngine, "iter_chunks", staticmethod(complete_after_counting))
+    report = replay(db, game_state)
+    
+    assert report["completed_tasks"] == 15
+    assert report["replayed"] == 15
+    assert ReplayEngine.latest_snapshot(db, game_state.current_user.id).task_count == 15
+    # The writer's rewards were already right: the replay changed nothing
+    assert replay_events(db) == 0
+    assert player_state(db, game_state)["completed_tasks"] == 15
+
+
+def test_old_snapshots_are_pruned_per_user(db):
+    others, other_ids = create_player(db, "oracle", tasks=12)
+    others.complete_tasks(other_ids)
+    replay(db, others)
+    game_state, task_ids = create_player(db, "fox", tasks=12)
+    game_state.complete_tasks(task_ids)
+    replay(db, game_state)
+    
+    def task_counts(user_id: int) -> list[int]:
+        return db.scalars(
+            select(ReplaySnapshot.task_count)
+            .where(ReplaySnapshot.user_id == user_id)
+            .order_by(ReplaySnapshot.id.desc())
+        ).all()
+    
+    # One snapshot every CHUNK_SIZE tasks, then the final one
+    assert ReplayEngine.KEEP_SNAPSHOTS == 3
+    assert task_counts(game_state.current_user.id) == [12, 12, 8]
+    assert len(task_counts(others.current_user.id)) == ReplayEngine.KEEP_SNAPSHOTS
@@ -0,0 +1,50 @@
+"""Snapshots must hold exactly the rows that were streamed."""
+import numpy as np
+from sqlalchemy import event
+from analytics.snapshot import ColumnarSnapshot, write_snapshot
+from core.game_loop import GameState
+from benchmarks.common import CATEGORIES, DIFFICULTIES
+
+KEPT_TASKS = 4
+
+
+def seed_tasks(db, count: int = 10):
+    game_state = GameState(db)
+    game_state.create_user("futaba")
+    for i in range(count):
+        game_state.create_task(f"Task {i}", CATEGORIES[i % len(CATEGORIES)], DIFFICULTIES[i % len(DIFFICULTIES)])
+
+
+def test_snapshot_matches_database(database, db, tmp_path):
+    seed_tasks(db)
+    manifest = write_snapshot(database[0], str(tmp_path), ["tasks"], chunk_size=3)
+    
+    snapshot = ColumnarSnapshot(str(tmp_path))
+    assert manifest["tables"]["tasks"]["rows"] == snapshot.rows("tasks") == 10
+    tasks = snapshot.read_table("tasks")
+    assert tasks["id"].tolist() == list(range(1, 11))
+    assert [tasks["title"][i] for i in range(10)] == [f"Task {i}" for i in range(10)]
+
+
+def test_rows_deleted_after_count_are_not_zero_filled(database, db, tmp_path):
+    seed_tasks(db)
+    engine = database[0]
+    
+    def delete_before_stream(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT TASKS.ID"):
+            cursor.execute(f"DELETE FROM tasks WHERE id > {KEPT_TASKS}")
+    
+    event.listen(engine, "before_cursor_execute", delete_before_stream)
+    try:
+        manifest = write_snapshot(engine, str(tmp_path), ["tasks"], chunk_size=3)
+    finally:
+        event.remove(engine, "before_cursor_execute", delete_before_stream)
+    
+    snapshot = ColumnarSnapshot(str(tmp_path))
+    assert manifest["tables"]["tasks"]["rows"] == snapshot.rows("tasks") == KEPT_TASKS
+    tasks = snapshot.read_table("tasks")
+    for name, column in tasks.items():
+        assert len(column) == KEPT_TASKS, name
+    assert tasks["id"].tolist() == list(range(1, KEPT_TASKS + 1))
+    assert not np.any(tasks["category"].codes < 0)
+    assert [tasks["title"][i] for i in range(KEPT_TASKS)] == [f"Task {i}" for i in range(KEPT_TASKS)]
@@ -6,10 +6,12 @@ from rich.progress import Progress, BarColumn, TextColumn
 from rich.layout import Layout
 from rich.text import Text
 from assets.ascii_art import SOCIAL_STATS
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 from models.user import User
 from models.task import Task
 from models.palace import Palace
+from models.projections import TaskRow, PalaceRow
+from core.dashboard_cache import DashboardSnapshot
 
 
 class Dashboard:
@@ -28,7 +30,12 @@ class Dashboard:
             title="[bold red]PHANTOM THIEVES HQ[/bold red]"
         ))
     
-    def display_user_profile(self, user: User, stats: Optional[Dict] = None):
+    def display_user_profile(
+        self,
+        user: Union[User, DashboardSnapshot],
+        stats: Optional[Dict] = None,
+        overdue_count: Optional[int] = None
+    ):
         """Display user profile information."""
         profile_table = Table(title="👤 Profile", show_header=True, header_style="bold magenta")
         profile_table.add_column("Attribute", style="cyan")
@@ -43,6 +50,9 @@ class Dashboard:
         if stats:
             profile_table.add_row("Total Stats", str(stats.get("Total", 0)))
         
+        if overdue_count:
+            profile_table.add_row("Overdue Tasks", f"[red]{overdue_count} ⚠️[/red]")
+        
         self.console.print(profile_table)
     
     def display_stats(self, stats: Dict):
@@ -85,8 +95,8 @@ class Dashboard:
         bar = "█" * filled + "░" * (bar_length - filled)
         return f"{bar} {percentage:.1f}%"
     
-    def display_tasks(self, tasks: List[Task], title: str = "📋 Tasks"):
-        """Display list of tasks."""
+    def display_tasks(self, tasks: List[Union[Task, TaskRow]], title: str = "📋 Tasks"):
+        """Display list of tasks, as ORM objects or TaskRow projections."""
         if not tasks:
             self.console.print(f"[yellow]No {title.lower()} found.[/yellow]")
             return
@@ -125,8 +135,8 @@ class Dashboard:
         
         self.console.print(tasks_table)
     
-    def display_palaces(self, palaces: List[Palace], title: str = "🏯 Palaces"):
-        """Display list of palaces."""
+    def display_palaces(self, palaces: List[Union[Palace, PalaceRow]], title: str = "🏯 Palaces"):
+        """Display list of palaces, as ORM objects or PalaceRow projections."""
         if not palaces:
             self.console.print(f"[yellow]No {title.lower()} found.[/yellow]")
             return
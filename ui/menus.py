@@ -172,6 +172,26 @@ class MenuSystem:
             self.console.print("[red]Invalid task ID.[/red]")
             return None
     
+    def page_navigation(self, has_prev: bool, has_next: bool) -> str:
+        """Ask for paging direction: 'n' next, 'p' previous, 'q' back."""
+        choices = []
+        hints = []
+        if has_next:
+            choices.append("n")
+            hints.append("[cyan]n[/cyan] next")
+        if has_prev:
+            choices.append("p")
+            hints.append("[cyan]p[/cyan] previous")
+        choices.append("q")
+        hints.append("[cyan]q[/cyan] back")
+        
+        return Prompt.ask(
+            f"\n{' · '.join(hints)}",
+            choices=choices,
+            default="n" if has_next else "q",
+            show_choices=False
+        )
+    
     def confirm_action(self, message: str) -> bool:
         """Get confirmation from user."""
         return Confirm.ask(f"[yellow]{message}[/yellow]")